@@ -0,0 +1,365 @@
+import argparse
+import json
+import os
+from pathlib import Path
+import platform
+import random
+import resource
+import subprocess
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import yaml
+
+from horus_audit.controls import config_files
+from horus_audit.core.engine import run_policy
+from horus_audit.core.executor import ExecutionResult, Executor
+from horus_audit.core.report import build_report, render_report
+from horus_audit.core.rootfs import RootFS
+from horus_audit.core.yaml_loader import load_policy
+
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "horus_audit" / "templates"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+LATENCIES = ("none", "fixed", "uniform", "exponential", "lognormal")
+
+
+class FakeExecutor(Executor):
+    def __init__(self, *, latency: str = "lognormal", mean: float = 0.0005, seed: int = 0) -> None:
+        if latency not in LATENCIES:
+            raise ValueError(f"Unknown latency distribution: {latency}")
+
+        self.latency = latency
+        self.mean = mean
+        self.calls = 0
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def run(self, argv: list[str], *, timeout: int = 10) -> ExecutionResult:
+        with self._lock:
+            self.calls += 1
+            delay = self._delay()
+
+        if delay:
+            time.sleep(min(delay, timeout))
+
+        if argv[0] == "find":
+            # Every other synthetic module exists on disk
+            module = argv[-1].split("*")[0]
+            exists = int(module.rsplit("_", 1)[-1]) % 2 == 0
+            return ExecutionResult(stdout=f"/lib/modules/{module}.ko" if exists else "", stderr="", code=0)
+
+        return ExecutionResult(stdout="", stderr="", code=0)
+
+    def _delay(self) -> float:
+        if self.latency == "none":
+            return 0.0
+        if self.latency == "fixed":
+            return self.mean
+        if self.latency == "uniform":
+            return self._random.uniform(0, 2 * self.mean)
+        if self.latency == "exponential":
+            return self._random.expovariate(1 / self.mean)
+
+        # Long tail, scaled so that the mean is kept (e ** 0.5 for sigma 1)
+        return self._random.lognormvariate(0, 1) * self.mean / 1.6487
+
+
+def build_tree(root: Path, *, parameters: int = 2000, services: int = 200, modules: int = 50) -> None:
+    """
+    Build a synthetic /proc and /etc tree read by the native controls.
+
+    Args:
+        root (Path): Tree root.
+        parameters (int, optional): Kernel parameters under /proc/sys. Defaults to 2000.
+        services (int, optional): Service units. Defaults to 200.
+        modules (int, optional): Kernel modules with modprobe rules. Defaults to 50.
+    """
+
+    sysctl_d = root / "etc" / "sysctl.d"
+    sysctl_d.mkdir(parents=True, exist_ok=True)
+    configured = []
+
+    for i in range(parameters):
+        directory = root / "proc" / "sys" / "net" / f"group_{i // 100:03d}"
+
+        if i % 100 == 0:
+            directory.mkdir(parents=True, exist_ok=True)
+
+        (directory / f"param_{i:05d}").write_text(f"{i % 3}\n")
+
+        # Two thirds are persisted, one in ten with a drifted value
+        if i % 3:
+            value = i % 3 if i % 10 else 9
+            configured.append(f"net.group_{i // 100:03d}.param_{i:05d} = {value}")
+
+    for i in range(0, len(configured), 100):
+        (sysctl_d / f"{i // 100:02d}-bench.conf").write_text("\n".join(configured[i:i + 100]) + "\n")
+
+    ssh = root / "etc" / "ssh"
+    ssh.mkdir(parents=True, exist_ok=True)
+    (ssh / "sshd_config").write_text(
+        "PermitRootLogin no\nPasswordAuthentication no\nMaxAuthTries 4\n"
+        "ClientAliveInterval 300\nX11Forwarding yes\n"
+    )
+    (root / "etc" / "login.defs").write_text("PASS_MAX_DAYS\t365\nPASS_MIN_DAYS\t1\nUMASK\t022\n")
+
+    modprobe_d = root / "etc" / "modprobe.d"
+    modprobe_d.mkdir(parents=True, exist_ok=True)
+    (modprobe_d / "bench.conf").write_text("".join(
+        f"install module_{i:03d} /bin/false\nblacklist module_{i:03d}\n"
+        for i in range(0, modules, 3)
+    ))
+
+    units = root / "usr" / "lib" / "systemd" / "system"
+    wants = root / "etc" / "systemd" / "system" / "multi-user.target.wants"
+    units.mkdir(parents=True, exist_ok=True)
+    wants.mkdir(parents=True, exist_ok=True)
+
+    for i in range(services):
+        name = f"bench_{i:04d}.service"
+        (units / name).write_text("[Service]\nExecStart=/bin/true\n\n[Install]\nWantedBy=multi-user.target\n")
+
+        if i % 2:
+            os.symlink(f"/usr/lib/systemd/system/{name}", wants / name)
+
+
+def build_policy(
+    path: Path,
+    rules: int,
+    *,
+    parameters: int = 2000,
+    services: int = 200,
+    modules: int = 50
+) -> None:
+    """
+    Write a synthetic policy cycling through the native controls.
+
+    Args:
+        path (Path): Policy file.
+        rules (int): Number of rules.
+        parameters (int, optional): Kernel parameters of the tree. Defaults to 2000.
+        services (int, optional): Service units of the tree. Defaults to 200.
+        modules (int, optional): Kernel modules of the tree. Defaults to 50.
+    """
+
+    keys = ("PermitRootLogin", "PasswordAuthentication", "MaxAuthTries", "X11Forwarding")
+    factories = (
+        lambda i: ("sysctl.value", {
+            "key": f"net.group_{i % parameters // 100:03d}.param_{i % parameters:05d}",
+            "value": (i % parameters) % 3
+        }),
+        lambda i: ("config.value", {
+            "path": "/etc/ssh/sshd_config",
+            "dialect": "sshd",
+            "key": keys[i % len(keys)],
+            "value": "no"
+        }),
+        lambda i: ("config.value", {"path": "/etc/login.defs", "key": "PASS_MAX_DAYS", "max": 365}),
+        lambda i: ("file.contains", {"path": "/etc/login.defs", "patterns": [f"^UMASK\\s+0{i % 8}7"]}),
+        lambda i: ("service.enabled", {"service": f"bench_{i % services:04d}"}),
+        lambda i: ("filesystem.module_disabled", {"module": f"module_{i % modules:03d}"})
+    )
+
+    policy = {"category": "benchmark", "rules": []}
+
+    for i in range(rules):
+        control, params = factories[i % len(factories)](i)
+        policy["rules"].append({"rule_id": f"BENCH-{i:06d}", "control": control, "params": params})
+
+    path.write_text(yaml.safe_dump(policy, sort_keys=False), encoding="utf-8")
+
+
+def measure(rules: int, tree: Path, workers: list[int], executor_options: dict, repeat: int) -> dict:
+    """
+    Measure loading, execution and rendering of one synthetic policy.
+
+    Every timing is the best of repeat runs, peak memory is traced in a
+    separate pass so tracing does not skew the timings.
+
+    Args:
+        rules (int): Number of rules.
+        tree (Path): Synthetic tree.
+        workers (list[int]): Thread counts, 1 being sequential.
+        executor_options (dict): FakeExecutor options.
+        repeat (int): Runs per measure.
+
+    Returns:
+        dict: Measures of the policy.
+    """
+
+    root = RootFS(tree)
+    policy_path = tree / f"policy-{rules}.yaml"
+    build_policy(policy_path, rules)
+
+    def run(n: int) -> tuple[list, FakeExecutor]:
+        # Cold caches, as for a new audit, cleared in place as other modules hold the instance
+        config_files.config_cache.clear()
+        executor = FakeExecutor(**executor_options)
+        results = run_policy(policy, executor=executor, workers=n, root=root)
+        return results, executor
+
+    def best(fn) -> float:
+        elapsed = []
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            elapsed.append(time.perf_counter() - start)
+
+        return round(min(elapsed), 4)
+
+    policy = load_policy(policy_path)
+    entry = {
+        "rules": rules,
+        "policy_bytes": policy_path.stat().st_size,
+        "load_policy": best(lambda: load_policy(policy_path)),
+        "run_policy": []
+    }
+
+    for n in workers:
+        seconds = best(lambda: run(n))
+        results, executor = run(n)
+
+        entry["run_policy"].append({
+            "workers": n,
+            "seconds": seconds,
+            "rules_per_second": round(rules / seconds),
+            "commands": executor.calls,
+            "statuses": {status: sum(r.status == status for r in results) for status in ("PASSED", "FAILED", "ERROR")}
+        })
+
+    report = build_report(policy=policy, results=results)
+    entry["build_report"] = best(lambda: build_report(policy=policy, results=results))
+    entry["render_report"] = best(lambda: render_report(report, template_dir=str(TEMPLATE_DIR)))
+
+    tracemalloc.start()
+
+    try:
+        for phase, fn in (
+            ("load_policy", lambda: load_policy(policy_path)),
+            ("run_policy", lambda: run(1)),
+            ("render_report", lambda: render_report(report, template_dir=str(TEMPLATE_DIR)))
+        ):
+            tracemalloc.reset_peak()
+            fn()
+            entry.setdefault("peak_memory_bytes", {})[phase] = tracemalloc.get_traced_memory()[1]
+
+    finally:
+        tracemalloc.stop()
+
+    return entry
+
+
+def compare(current: dict, baseline: dict, *, threshold: float) -> list[str]:
+    """
+    List the timings slower than a baseline by more than a threshold.
+
+    Args:
+        current (dict): Benchmark output.
+        baseline (dict): Benchmark output of a previous commit.
+        threshold (float): Tolerated slowdown ratio.
+
+    Returns:
+        list[str]: Regressions.
+    """
+
+    previous = {entry["rules"]: entry for entry in baseline["policies"]}
+    regressions = []
+
+    for entry in current["policies"]:
+        old = previous.get(entry["rules"])
+
+        if old is None:
+            continue
+
+        timings = [(name, entry[name], old.get(name)) for name in ("load_policy", "build_report", "render_report")]
+        old_runs = {run["workers"]: run["seconds"] for run in old["run_policy"]}
+        timings += [
+            (f"run_policy[workers={run['workers']}]", run["seconds"], old_runs.get(run["workers"]))
+            for run in entry["run_policy"]
+        ]
+
+        for name, seconds, old_seconds in timings:
+            if old_seconds and seconds > old_seconds * threshold:
+                regressions.append(
+                    f"{entry['rules']} rules, {name}: {old_seconds:.4f}s -> {seconds:.4f}s "
+                    f"(x{seconds / old_seconds:.2f})"
+                )
+
+    return regressions
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark policy loading, execution and rendering.")
+    parser.add_argument("--rules", type=int, nargs="+", default=[100, 1000, 10_000, 50_000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--latency", choices=LATENCIES, default="lognormal")
+    parser.add_argument("--mean", type=float, default=0.0005, help="Mean command latency in seconds")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Defaults to results/engine-<commit>.json")
+    parser.add_argument("--compare", type=Path, help="Previous output to compare with")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Tolerated slowdown ratio")
+    args = parser.parse_args()
+
+    commit = _commit()
+    executor_options = {"latency": args.latency, "mean": args.mean, "seed": args.seed}
+    output = {
+        "benchmark": "engine",
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "executor": executor_options,
+        "policies": []
+    }
+
+    with tempfile.TemporaryDirectory(prefix="horus-bench-") as tmp:
+        tree = Path(tmp)
+        build_tree(tree)
+
+        for rules in args.rules:
+            entry = measure(rules, tree, args.workers, executor_options, args.repeat)
+            output["policies"].append(entry)
+
+            runs = ", ".join(f"{run['workers']}w={run['seconds']:.3f}s" for run in entry["run_policy"])
+            print(f"{rules} rules: load={entry['load_policy']:.3f}s, run {runs}, render={entry['render_report']:.3f}s")
+
+    # Kilobytes on Linux
+    output["max_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    path = args.output or RESULTS_DIR / f"engine-{commit}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(output, indent=2) + "\n", encoding="utf-8")
+    print(f"Results written to {path}")
+
+    if args.compare is not None:
+        regressions = compare(output, json.loads(args.compare.read_text(encoding="utf-8")), threshold=args.threshold)
+
+        for regression in regressions:
+            print(f"Regression: {regression}")
+
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import json
+import os
+from pathlib import Path
+import tempfile
+import time
+
+from horus_audit.controls.permissions import scan_permissions
+from horus_audit.core.rootfs import RootFS
+
+
+def build_tree(root: Path, files: int, *, fanout: int = 1000) -> None:
+    """
+    Build a synthetic tree with a few permission findings.
+
+    Args:
+        root (Path): Tree root.
+        files (int): Number of regular files.
+        fanout (int, optional): Files per directory. Defaults to 1000.
+    """
+
+    (root / "etc").mkdir(parents=True, exist_ok=True)
+    (root / "etc" / "passwd").write_text(
+        f"root:x:0:0::/root:/bin/sh\nu:x:{os.getuid()}:0::/:/bin/sh\n"
+    )
+    (root / "etc" / "group").write_text(f"root:x:0:\ng:x:{os.getgid()}:\n")
+
+    for i in range(files):
+        directory = root / "data" / f"{i // (fanout * fanout):03d}" / f"{i // fanout:06d}"
+
+        if i % fanout == 0:
+            directory.mkdir(parents=True, exist_ok=True)
+
+        path = directory / f"{i:07d}"
+        fd = os.open(path, os.O_CREAT | os.O_WRONLY, 0o644)
+        os.close(fd)
+
+        if i % 10007 == 0:
+            os.chmod(path, 0o4755)
+        elif i % 10009 == 0:
+            os.chmod(path, 0o666)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the permission scanner.")
+    parser.add_argument("--files", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--tree", type=Path, help="Reuse an existing synthetic tree")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="horus-bench-") as tmp:
+        tree = args.tree or Path(tmp)
+
+        if not (tree / "data").exists():
+            start = time.perf_counter()
+            build_tree(tree, args.files)
+            print(f"Built {args.files} files in {time.perf_counter() - start:.1f}s")
+
+        runs = []
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            scan = scan_permissions(RootFS(tree), workers=workers)
+            elapsed = time.perf_counter() - start
+
+            runs.append({
+                "workers": workers,
+                "seconds": round(elapsed, 3),
+                "entries": scan.scanned,
+                "entries_per_second": round(scan.scanned / elapsed),
+                "suid": len(scan.suid),
+                "world_writable": len(scan.world_writable)
+            })
+
+        print(json.dumps({"benchmark": "scan_permissions", "files": args.files, "runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
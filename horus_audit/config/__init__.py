@@ -1,7 +1,16 @@
-from horus_audit.config.config import get_logger, setup_logging
+from horus_audit.config.config import (
+    JsonFormatter,
+    RateLimitFilter,
+    get_logger,
+    setup_logging,
+    shutdown_logging
+)
 
 
 __all__ = [
+    "JsonFormatter",
+    "RateLimitFilter",
     "get_logger",
-    "setup_logging"
+    "setup_logging",
+    "shutdown_logging"
 ]
@@ -1,17 +1,99 @@
+import atexit
+from datetime import datetime, timezone
+import json
 import logging
 from logging import Logger
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from pathlib import Path
+import queue
+import threading
+import time
 
 
 LOG_FILE = Path.home() / ".horus" / "horus.log"
 
+# Extra fields of structured records, passed with extra={...}
+RECORD_FIELDS = ("rule_id", "control", "duration")
 
-def setup_logging() -> None:
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+
+        for name in RECORD_FIELDS:
+            if hasattr(record, name):
+                entry[name] = getattr(record, name)
+
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    def __init__(self, *, rate: float = 10.0, burst: int = 50, level: int = logging.DEBUG) -> None:
+        super().__init__()
+
+        self.rate = rate
+        self.burst = burst
+        self.level = level
+        self.suppressed = 0
+
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.level:
+            return True
+
+        # One bucket per call site, f-string messages differing on every call
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                self.suppressed += 1
+                return False
+
+            self._buckets[key] = (tokens - 1, now)
+
+        return True
+
+
+def setup_logging(
+    *,
+    level: int = logging.INFO,
+    json_format: bool = False,
+    debug_rate: float | None = 10.0,
+    debug_burst: int = 50
+) -> None:
     """
     Setup root logging.
+
+    Records are queued by the logging threads and written to LOG_FILE by a
+    background listener, so concurrent audits never wait on the file.
+    Debug records are rate limited per call site before being queued.
+
+    Args:
+        level (int, optional): Lowest level logged. Defaults to logging.INFO.
+        json_format (bool, optional): Write JSON lines with the rule_id, control and duration extras. Defaults to False.
+        debug_rate (float | None, optional): Debug records per second and call site, None for no limit. Defaults to 10.0.
+        debug_burst (int, optional): Debug records allowed at once per call site. Defaults to 50.
     """
 
+    global _listener
+
     LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
 
     logger = logging.getLogger()
@@ -19,12 +101,15 @@ def setup_logging() -> None:
     if logger.handlers:
         return
 
-    logger.setLevel(logging.INFO)
+    logger.setLevel(level)
 
-    formatter = logging.Formatter(
-        fmt="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
+    if json_format:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            fmt="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S"
+        )
 
     file_handler = TimedRotatingFileHandler(
         filename=LOG_FILE,
@@ -33,11 +118,46 @@ def setup_logging() -> None:
         encoding="utf-8"
     )
     file_handler.setFormatter(formatter)
-    file_handler.setLevel(logging.INFO)
+    file_handler.setLevel(level)
+
+    records = queue.SimpleQueue()
+    queue_handler = QueueHandler(records)
+
+    if debug_rate is not None:
+        queue_handler.addFilter(RateLimitFilter(rate=debug_rate, burst=debug_burst))
+
+    _listener = QueueListener(records, file_handler, respect_handler_level=True)
+    _listener.start()
 
-    logger.addHandler(file_handler)
+    logger.addHandler(queue_handler)
     logger.propagate = False
 
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """
+    Flush queued records and stop the logging listener.
+    """
+
+    global _listener
+
+    if _listener is None:
+        return
+
+    logger = logging.getLogger()
+
+    for handler in list(logger.handlers):
+        if isinstance(handler, QueueHandler) and handler.queue is _listener.queue:
+            logger.removeHandler(handler)
+
+    _listener.stop()
+
+    for handler in _listener.handlers:
+        handler.close()
+
+    _listener = None
+
 
 def get_logger(module_name: str) -> Logger:
     """
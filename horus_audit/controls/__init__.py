@@ -1,10 +1,49 @@
+from horus_audit.controls.config_files import check_config_value
+from horus_audit.controls.content import check_file_contains, check_file_not_contains
 from horus_audit.controls.filesystem import (
     check_filesystem_module_disabled,
     check_filesystem_partition
 )
+from horus_audit.controls.integrity import check_file_integrity
+from horus_audit.controls.packages import (
+    check_package_absent,
+    check_package_installed,
+    check_package_min_version
+)
+from horus_audit.controls.permissions import (
+    check_permissions_sgid,
+    check_permissions_sticky_bit,
+    check_permissions_suid,
+    check_permissions_ungrouped,
+    check_permissions_unowned,
+    check_permissions_world_writable
+)
+from horus_audit.controls.services import (
+    check_service_disabled,
+    check_service_enabled,
+    check_service_masked
+)
+from horus_audit.controls.sysctl import check_sysctl_value
 
 
 __all__ = [
+    "check_config_value",
+    "check_file_contains",
+    "check_file_integrity",
+    "check_file_not_contains",
     "check_filesystem_module_disabled",
-    "check_filesystem_partition"
+    "check_filesystem_partition",
+    "check_package_absent",
+    "check_package_installed",
+    "check_package_min_version",
+    "check_permissions_sgid",
+    "check_permissions_sticky_bit",
+    "check_permissions_suid",
+    "check_permissions_ungrouped",
+    "check_permissions_unowned",
+    "check_permissions_world_writable",
+    "check_service_disabled",
+    "check_service_enabled",
+    "check_service_masked",
+    "check_sysctl_value"
 ]
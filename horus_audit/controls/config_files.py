@@ -0,0 +1,557 @@
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import glob
+import os
+from pathlib import Path
+import re
+import shlex
+import threading
+from typing import Any
+
+from horus_audit.config import get_logger
+from horus_audit.core.engine import EngineContext
+from horus_audit.core.executor import Executor
+from horus_audit.core.metrics import register_cache
+from horus_audit.core.registry import register_control
+from horus_audit.core.result import ControlResult
+from horus_audit.core.rootfs import RootFS
+
+
+logger = get_logger(__name__)
+
+MAX_INCLUDE_DEPTH = 16
+
+# Keyword and arguments, separated by whitespace or an optional "="
+_SSHD_LINE = re.compile(r"^([^\s=]+)(?:\s*=\s*|\s+)?(.*)$")
+
+
+@dataclass
+class SshdConfig:
+    options: dict[str, str] = field(default_factory=dict)
+    matches: list[tuple[str, dict[str, str]]] = field(default_factory=list)
+
+
+@dataclass
+class PamEntry:
+    type: str
+    control: str
+    module: str
+    args: list[str]
+    optional: bool = False
+
+
+@dataclass
+class FstabEntry:
+    spec: str
+    file: str
+    vfstype: str
+    options: list[str]
+    freq: int = 0
+    passno: int = 0
+
+
+class ConfigReader:
+    def __init__(self, root: RootFS) -> None:
+        self.root = root
+        self.dependencies = []
+
+    def read(self, path: str) -> list[str]:
+        local = self.root.resolve(path)
+        self.dependencies.append(local)
+
+        try:
+            return local.read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError:
+            return []
+
+    def expand(self, pattern: str, base: str) -> list[str]:
+        if not pattern.startswith("/"):
+            pattern = f"{base}/{pattern}"
+
+        directory = self.root.resolve(os.path.dirname(pattern))
+        self.dependencies.append(directory)
+
+        prefix = len(str(directory))
+        matches = sorted(glob.glob(str(directory / os.path.basename(pattern))))
+
+        return [os.path.dirname(pattern) + match[prefix:] for match in matches]
+
+
+def parse_sshd(reader: ConfigReader, path: str) -> SshdConfig:
+    """
+    Parse an sshd_config file, expanding Include directives.
+
+    Keywords are lowercased. As in sshd, the first value obtained for a
+    keyword is the effective one. Match blocks are kept separately.
+
+    Args:
+        reader (ConfigReader): Reader tracking the files read.
+        path (str): Path of the audited system.
+
+    Returns:
+        SshdConfig: Parsed configuration.
+    """
+
+    config = SshdConfig()
+    _parse_sshd_file(reader, path, config, config.options, 0)
+
+    return config
+
+
+def _parse_sshd_file(
+    reader: ConfigReader,
+    path: str,
+    config: SshdConfig,
+    block: dict[str, str],
+    depth: int
+) -> dict[str, str]:
+    if depth > MAX_INCLUDE_DEPTH:
+        return block
+
+    for line in reader.read(path):
+        line = line.strip()
+
+        if not line or line.startswith("#"):
+            continue
+
+        match = _SSHD_LINE.match(line)
+
+        # Rejected by sshd, the other lines are still audited
+        if match is None:
+            logger.warning(f"Invalid line in {path}: {line}")
+            continue
+
+        keyword, value = match.groups()
+        keyword = keyword.lower()
+        value = value.strip()
+
+        if keyword == "include":
+            for pattern in shlex.split(value):
+                for included in reader.expand(pattern, "/etc/ssh"):
+                    block = _parse_sshd_file(reader, included, config, block, depth + 1)
+
+        elif keyword == "match":
+            if value.lower() == "all":
+                block = config.options
+            else:
+                block = {}
+                config.matches.append((value, block))
+
+        else:
+            block.setdefault(keyword, value)
+
+    return block
+
+
+def parse_keyvalue(reader: ConfigReader, path: str) -> dict[str, str]:
+    """
+    Parse a KEY VALUE, KEY=VALUE or KEY = VALUE file such as login.defs.
+
+    Args:
+        reader (ConfigReader): Reader tracking the files read.
+        path (str): Path of the audited system.
+
+    Returns:
+        dict[str, str]: Values indexed by key, the last occurrence wins.
+    """
+
+    values = {}
+
+    for line in reader.read(path):
+        line = line.strip()
+
+        if not line or line[0] in "#;":
+            continue
+
+        key, separator, value = line.partition("=")
+
+        # KEY=VALUE and KEY = VALUE, unless "=" only appears in the value
+        if not separator or len(key.split()) != 1:
+            key, value = (line.split(None, 1) + [""])[:2]
+
+        values[key.strip()] = value.strip().strip('"')
+
+    return values
+
+
+def parse_pam(reader: ConfigReader, path: str) -> list[PamEntry]:
+    """
+    Parse a PAM service file, expanding @include, include and substack.
+
+    Args:
+        reader (ConfigReader): Reader tracking the files read.
+        path (str): Path of the audited system.
+
+    Returns:
+        list[PamEntry]: Stack entries in evaluation order.
+    """
+
+    entries = []
+    _parse_pam_file(reader, path, entries, None, 0)
+
+    return entries
+
+
+def _parse_pam_file(
+    reader: ConfigReader,
+    path: str,
+    entries: list[PamEntry],
+    only_type: str | None,
+    depth: int
+) -> None:
+    if depth > MAX_INCLUDE_DEPTH:
+        return
+
+    base = os.path.dirname(path)
+
+    for line in reader.read(path):
+        line = line.split("#", 1)[0].strip()
+
+        if not line:
+            continue
+
+        if line.startswith("@include"):
+            _parse_pam_file(reader, f"{base}/{line.split()[1]}", entries, only_type, depth + 1)
+            continue
+
+        tokens = _pam_tokens(line)
+
+        if len(tokens) < 3:
+            continue
+
+        type_, control, module, *args = tokens
+        optional = type_.startswith("-")
+        type_ = type_.lstrip("-").lower()
+
+        if only_type is not None and type_ != only_type:
+            continue
+
+        if control in ("include", "substack"):
+            _parse_pam_file(reader, f"{base}/{module}", entries, type_, depth + 1)
+            continue
+
+        entries.append(PamEntry(
+            type=type_,
+            control=control,
+            module=os.path.basename(module),
+            args=args,
+            optional=optional
+        ))
+
+
+def _pam_tokens(line: str) -> list[str]:
+    tokens = []
+    current = ""
+    depth = 0
+
+    # Bracketed controls such as [success=1 default=ignore] contain spaces
+    for c in line:
+        if c == "[":
+            depth += 1
+        elif c == "]":
+            depth -= 1
+
+        if c.isspace() and depth == 0:
+            if current:
+                tokens.append(current)
+            current = ""
+        else:
+            current += c
+
+    if current:
+        tokens.append(current)
+
+    return tokens
+
+
+def parse_fstab(reader: ConfigReader, path: str) -> list[FstabEntry]:
+    """
+    Parse an fstab file.
+
+    Args:
+        reader (ConfigReader): Reader tracking the files read.
+        path (str): Path of the audited system.
+
+    Returns:
+        list[FstabEntry]: Entries in file order.
+    """
+
+    entries = []
+
+    for line in reader.read(path):
+        fields = line.split("#", 1)[0].split()
+
+        if len(fields) < 4:
+            continue
+
+        entries.append(FstabEntry(
+            spec=fields[0],
+            file=fields[1].replace("\\040", " "),
+            vfstype=fields[2],
+            options=fields[3].split(","),
+            freq=int(fields[4]) if len(fields) > 4 and fields[4].isdigit() else 0,
+            passno=int(fields[5]) if len(fields) > 5 and fields[5].isdigit() else 0
+        ))
+
+    return entries
+
+
+PARSERS: dict[str, Callable[[ConfigReader, str], Any]] = {
+    "sshd": parse_sshd,
+    "keyvalue": parse_keyvalue,
+    "pam": parse_pam,
+    "fstab": parse_fstab
+}
+
+
+def _signature(path: Path) -> tuple[int, int, int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+
+    return st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class ConfigCache:
+    def __init__(self, max_entries: int = 256) -> None:
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, root: RootFS, path: str, dialect: str) -> Any:
+        """
+        Return a parsed configuration file, parsing it only when it changed.
+
+        Entries are validated against the inode and mtime of the file and
+        of everything it includes, so they stay valid across runs.
+
+        Args:
+            root (RootFS): Audited root filesystem.
+            path (str): Path of the audited system.
+            dialect (str): Parser name, see PARSERS.
+
+        Returns:
+            Any: Parsed structure of the dialect.
+
+        Raises:
+            KeyError: Unknown dialect.
+        """
+
+        parse = PARSERS[dialect]
+        key = (root, path, dialect)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                parsed, signatures = entry
+
+                if all(_signature(dep) == signature for dep, signature in signatures):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return parsed
+
+            self.misses += 1
+
+        reader = ConfigReader(root)
+        parsed = parse(reader, path)
+        signatures = [(dep, _signature(dep)) for dep in reader.dependencies]
+
+        with self._lock:
+            self._entries[key] = (parsed, signatures)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+        return parsed
+
+    def clear(self) -> None:
+        """
+        Drop every entry, in place as other modules import the instance.
+
+        Hits and misses keep counting, runs being measured from a baseline.
+        """
+
+        with self._lock:
+            self._entries.clear()
+
+
+config_cache = ConfigCache()
+register_cache("config", config_cache)
+
+
+def lookup(parsed: Any, dialect: str, key: str) -> str | None:
+    """
+    Return the effective value of a key in a parsed configuration.
+
+    sshd keys are keywords, keyvalue keys are variable names, pam keys are
+    module names optionally prefixed by a type ("auth:pam_faillock.so") and
+    fstab keys are mount points. PAM values are module arguments and fstab
+    values are mount options.
+
+    Args:
+        parsed (Any): Parsed configuration.
+        dialect (str): Parser name.
+        key (str): Key to look up.
+
+    Returns:
+        str | None: Value, None when the key is not configured.
+    """
+
+    if dialect == "sshd":
+        return parsed.options.get(key.lower())
+
+    if dialect == "keyvalue":
+        return parsed.get(key)
+
+    if dialect == "pam":
+        type_, _, module = key.rpartition(":")
+
+        for entry in parsed:
+            if entry.module == module and (not type_ or entry.type == type_):
+                return " ".join(entry.args)
+
+        return None
+
+    if dialect == "fstab":
+        for entry in parsed:
+            if entry.file.rstrip("/") == key.rstrip("/"):
+                return ",".join(entry.options)
+
+        return None
+
+    raise KeyError(f"Unknown dialect: {dialect}")
+
+
+@register_control("config.value")
+def check_config_value(
+    *,
+    rule_id: str,
+    control: str,
+    params: dict,
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
+) -> ControlResult:
+    """
+    Check a value of a parsed configuration file.
+    """
+
+    # Configuration file
+    path_param = params.get("path")
+
+    if not isinstance(path_param, str) or not path_param.strip():
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message="params.path is empty"
+        )
+
+    path = path_param.strip()
+
+    # Dialect
+    dialect = params.get("dialect", "keyvalue")
+
+    if dialect not in PARSERS:
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Unknown dialect: {dialect}"
+        )
+
+    # Key
+    key_param = params.get("key")
+
+    if not isinstance(key_param, str) or not key_param.strip():
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message="params.key is empty"
+        )
+
+    key = key_param.strip()
+
+    expectations = {"value", "min", "max", "contains", "absent"} & params.keys()
+
+    if not expectations:
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message="params has no expectation"
+        )
+
+    context = context or EngineContext(executor=executor)
+    actual = lookup(config_cache.get(context.root, path, dialect), dialect, key)
+
+    if params.get("absent"):
+        if actual is not None:
+            return ControlResult.failed_(
+                rule_id=rule_id,
+                control=control,
+                message=f"{key} is set in {path}"
+            )
+
+        return ControlResult.passed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"{key} is not set in {path}"
+        )
+
+    if actual is None:
+        return ControlResult.failed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"{key} is not set in {path}"
+        )
+
+    failure = _compare(actual, params, case_sensitive=dialect != "sshd")
+
+    if failure:
+        return ControlResult.failed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"{key} in {path} {failure}"
+        )
+
+    return ControlResult.passed_(
+        rule_id=rule_id,
+        control=control,
+        message=f"{key} in {path} is {actual}"
+    )
+
+
+def _compare(actual: str, params: dict, *, case_sensitive: bool) -> str | None:
+    if "value" in params:
+        expected = str(params["value"])
+
+        if case_sensitive and actual != expected:
+            return f"is {actual}, expected {expected}"
+
+        if not case_sensitive and actual.lower() != expected.lower():
+            return f"is {actual}, expected {expected}"
+
+    if "min" in params or "max" in params:
+        try:
+            number = int(actual.split()[0])
+        except (ValueError, IndexError):
+            return f"is {actual}, expected a number"
+
+        if "min" in params and number < int(params["min"]):
+            return f"is {number}, expected at least {params['min']}"
+
+        if "max" in params and number > int(params["max"]):
+            return f"is {number}, expected at most {params['max']}"
+
+    if "contains" in params:
+        tokens = set(actual.replace(",", " ").split())
+        missing = [str(token) for token in params["contains"] if str(token) not in tokens]
+
+        if missing:
+            return f"is missing {', '.join(missing)}"
+
+    return None
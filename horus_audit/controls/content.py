@@ -0,0 +1,342 @@
+from collections.abc import Iterable
+import mmap
+import os
+from pathlib import Path
+import re
+import threading
+from typing import Any
+
+from horus_audit.core.engine import EngineContext
+from horus_audit.core.executor import Executor
+from horus_audit.core.metrics import CacheCounter, register_cache
+from horus_audit.core.registry import Requirements, register_control
+from horus_audit.core.result import ControlResult
+from horus_audit.core.rootfs import RootFS
+from horus_audit.core.rule import Rule
+
+
+# Files above this size are searched through mmap
+MMAP_THRESHOLD = 1024 * 1024
+
+# Searches served by an earlier pass over the file, or needing a new pass
+scan_counter = CacheCounter()
+register_cache("content", scan_counter)
+
+
+def search_file(path: Path, patterns: Iterable[str]) -> dict[str, str | None]:
+    """
+    Search a file for several patterns in a single pass.
+
+    Patterns are combined into one alternation that skips every line no
+    pattern matches. Only the lines it stops on are tested against the
+    individual patterns, and found patterns are dropped from the
+    alternation.
+
+    Args:
+        path (Path): File to search.
+        patterns (Iterable[str]): Regular expressions, ^ and $ match at lines.
+
+    Returns:
+        dict[str, str | None]: First matching line per pattern, None when not found.
+
+    Raises:
+        OSError: Unreadable file.
+    """
+
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return _search(mapped, patterns)
+
+        return _search(f.read(), patterns)
+
+
+def _search(data: bytes | mmap.mmap, patterns: Iterable[str]) -> dict[str, str | None]:
+    found = dict.fromkeys(patterns)
+    remaining = {
+        pattern: re.compile(pattern.encode("utf-8"), re.MULTILINE)
+        for pattern in found
+    }
+    position = 0
+
+    while remaining:
+        try:
+            combined = re.compile(
+                b"|".join(b"(?:" + regex.pattern + b")" for regex in remaining.values()),
+                re.MULTILINE
+            )
+        except re.error:
+            # Group names or backreferences clashing between patterns
+            break
+
+        hit = combined.search(data, position)
+
+        if hit is None:
+            return found
+
+        line, position = _line(data, hit)
+
+        for pattern, regex in list(remaining.items()):
+            if regex.search(line):
+                found[pattern] = line.decode("utf-8", errors="replace")
+                del remaining[pattern]
+
+    for pattern, regex in remaining.items():
+        hit = regex.search(data, position)
+
+        if hit is not None:
+            found[pattern] = _line(data, hit)[0].decode("utf-8", errors="replace")
+
+    return found
+
+
+def _line(data: bytes | mmap.mmap, hit: re.Match) -> tuple[bytes, int]:
+    start = data.rfind(b"\n", 0, hit.start()) + 1
+    end = data.find(b"\n", hit.end())
+    end = len(data) if end == -1 else end
+
+    return data[start:end], end + 1
+
+
+class ContentScan:
+    def __init__(self, root: RootFS, path: str) -> None:
+        self.root = root
+        self.path = path
+        self.found = {}
+        self.readable = True
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "root": self.root,
+                "path": self.path,
+                "found": dict(self.found),
+                "readable": self.readable
+            }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def find(self, patterns: Iterable[str]) -> dict[str, str | None] | None:
+        patterns = set(patterns)
+
+        with self._lock:
+            pending = sorted(patterns - self.found.keys())
+
+            if pending and self.readable:
+                scan_counter.miss()
+            elif self.readable:
+                scan_counter.hit()
+
+            if pending and self.readable:
+                try:
+                    self.found.update(search_file(self.root.resolve(self.path), pending))
+                except OSError:
+                    self.readable = False
+
+            if not self.readable:
+                return None
+
+            return {pattern: self.found[pattern] for pattern in patterns}
+
+
+def plan_patterns(context: EngineContext, path: str, patterns: Iterable[str]) -> None:
+    """
+    Announce patterns that rules will search in a file.
+
+    Planned patterns are searched together with the first requested ones,
+    so every rule targeting the file shares a single pass.
+
+    Args:
+        context (EngineContext): Engine context.
+        path (str): Path of the audited system.
+        patterns (Iterable[str]): Regular expressions.
+    """
+
+    plan = context.facts.get("content.plan", dict)
+    plan.setdefault(path, set()).update(patterns)
+
+
+def find_patterns(
+    context: EngineContext,
+    path: str,
+    patterns: Iterable[str]
+) -> dict[str, str | None] | None:
+    """
+    Search a file for patterns, along with every pattern planned for it.
+
+    Args:
+        context (EngineContext): Engine context.
+        path (str): Path of the audited system.
+        patterns (Iterable[str]): Regular expressions.
+
+    Returns:
+        dict[str, str | None] | None: First matching line per pattern, None when the file is unreadable.
+    """
+
+    patterns = set(patterns)
+    planned = context.facts.get("content.plan", dict).get(path, set())
+    scan = context.facts.get(f"content:{path}", lambda: ContentScan(context.root, path))
+
+    found = scan.find(patterns | planned)
+
+    if found is None:
+        return None
+
+    return {pattern: found[pattern] for pattern in patterns}
+
+
+def _rule_patterns(params: dict) -> tuple[str, list[str]]:
+    # File
+    path_param = params.get("path")
+
+    if not isinstance(path_param, str) or not path_param.strip():
+        raise ValueError("params.path is empty")
+
+    # Patterns
+    patterns_param = params.get("patterns")
+
+    if (
+        not isinstance(patterns_param, list)
+        or not patterns_param
+        or not all(isinstance(pattern, str) and pattern for pattern in patterns_param)
+    ):
+        raise ValueError("params.patterns is empty")
+
+    if params.get("ignore_case", False):
+        patterns = [f"(?i:{pattern})" for pattern in patterns_param]
+    else:
+        patterns = list(patterns_param)
+
+    for pattern in patterns:
+        try:
+            # Wrapped as in the combined alternation
+            re.compile(f"(?:{pattern})")
+        except re.error as exc:
+            raise ValueError(f"Invalid pattern {pattern}: {exc}") from exc
+
+    return path_param.strip(), patterns
+
+
+def _plan_rules(rules: list[Rule], context: EngineContext) -> None:
+    for rule in rules:
+        try:
+            path, patterns = _rule_patterns(rule.params)
+        except ValueError:
+            # Reported when the rule executes
+            continue
+
+        plan_patterns(context, path, patterns)
+
+
+def _requires(params: dict, root: RootFS) -> Requirements:
+    path, _ = _rule_patterns(params)
+    return Requirements(facts={"content.plan": None, f"content:{path}": None})
+
+
+@register_control("file.contains", prepare=_plan_rules, requires=_requires)
+def check_file_contains(
+    *,
+    rule_id: str,
+    control: str,
+    params: dict,
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
+) -> ControlResult:
+    """
+    Check that a file contains a line matching every pattern.
+    """
+
+    try:
+        path, patterns = _rule_patterns(params)
+    except ValueError as exc:
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message=str(exc)
+        )
+
+    context = context or EngineContext(executor=executor)
+    found = find_patterns(context, path, patterns)
+
+    if found is None:
+        return ControlResult.failed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Unable to read {path}"
+        )
+
+    missing = [pattern for pattern in patterns if found[pattern] is None]
+
+    if missing:
+        return ControlResult.failed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"{path} does not match {', '.join(missing)}"
+        )
+
+    return ControlResult.passed_(
+        rule_id=rule_id,
+        control=control,
+        message=f"{path} matches every pattern"
+    )
+
+
+@register_control("file.not_contains", prepare=_plan_rules, requires=_requires)
+def check_file_not_contains(
+    *,
+    rule_id: str,
+    control: str,
+    params: dict,
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
+) -> ControlResult:
+    """
+    Check that no line of a file matches any pattern.
+    """
+
+    try:
+        path, patterns = _rule_patterns(params)
+    except ValueError as exc:
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message=str(exc)
+        )
+
+    context = context or EngineContext(executor=executor)
+    found = find_patterns(context, path, patterns)
+
+    if found is None:
+        if context.root.resolve(path).exists():
+            return ControlResult.error_(
+                rule_id=rule_id,
+                control=control,
+                message=f"Unable to read {path}"
+            )
+
+        return ControlResult.passed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"{path} does not exist"
+        )
+
+    for pattern in patterns:
+        if found[pattern] is not None:
+            return ControlResult.failed_(
+                rule_id=rule_id,
+                control=control,
+                message=f"{path} matches {pattern}: {found[pattern].strip()}"
+            )
+
+    return ControlResult.passed_(
+        rule_id=rule_id,
+        control=control,
+        message=f"{path} matches none of the patterns"
+    )
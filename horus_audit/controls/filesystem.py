@@ -1,15 +1,58 @@
-from horus_audit.core.executor import Executor
-from horus_audit.core.registry import register_control
+import os
+import re
+from typing import Any
+
+from horus_audit.controls.config_files import config_cache
+from horus_audit.controls.content import find_patterns, plan_patterns
+from horus_audit.core.engine import EngineContext
+from horus_audit.core.executor import ExecutionResult, Executor
+from horus_audit.core.registry import Requirements, register_control
 from horus_audit.core.result import ControlResult
+from horus_audit.core.rootfs import RootFS
+from horus_audit.core.rule import Rule
 
 
-@register_control("filesystem.module_disabled")
+MODPROBE_DIR = "/etc/modprobe.d"
+
+
+def _plan_module_disabled(rules: list[Rule], context: EngineContext) -> None:
+    files = _modprobe_files(context)
+
+    for rule in rules:
+        module = rule.params.get("module")
+
+        if isinstance(module, str) and module.strip():
+            for path in files:
+                plan_patterns(context, path, _modprobe_patterns(module.strip().lower()))
+
+
+def _find_module_argv(root: RootFS, module: str) -> list[str]:
+    return ["find", f"{root.resolve('/lib/modules')}/", "-type", "f", "-name", f"{module}*.ko*"]
+
+
+def _requires_module_disabled(params: dict, root: RootFS) -> Requirements:
+    module = params["module"].strip().lower()
+    facts = {"modprobe.d": None, "content.plan": None}
+
+    if root.is_host:
+        facts["lsmod"] = ("lsmod",)
+
+    return Requirements(facts=facts, commands=(tuple(_find_module_argv(root, module)),))
+
+
+@register_control(
+    "filesystem.module_disabled",
+    prepare=_plan_module_disabled,
+    requires=_requires_module_disabled
+)
 def check_filesystem_module_disabled(
     *,
     rule_id: str,
     control: str,
     params: dict,
-    executor: Executor
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
 ) -> ControlResult:
     """
     Check whether a filesystem module is properly disabled.
@@ -26,11 +69,11 @@ def check_filesystem_module_disabled(
         )
 
     module = module_param.strip().lower()
+    context = context or EngineContext(executor=executor)
+    root = context.root
 
     # Check whether the module exists on disk
-    find_cmd = executor.run(
-        ["find", "/lib/modules/", "-type", "f", "-name", f"{module}*.ko*"]
-    )
+    find_cmd = executor.run(_find_module_argv(root, module))
 
     exists = bool(find_cmd.stdout.strip())
 
@@ -41,8 +84,11 @@ def check_filesystem_module_disabled(
             message=f"Kernel module {module} does not exist"
         )
 
-    # Check whether the module is loaded
-    lsmod_cmd = executor.run(["lsmod"])
+    # Check whether the module is loaded, only meaningful on the running host
+    if root.is_host:
+        lsmod_cmd = context.facts.get("lsmod", lambda: executor.run(["lsmod"]))
+    else:
+        lsmod_cmd = ExecutionResult(stdout="", stderr="", code=1)
 
     if lsmod_cmd.code == 0:
         for line in lsmod_cmd.stdout.splitlines():
@@ -54,21 +100,17 @@ def check_filesystem_module_disabled(
                 )
 
     # Check whether modprobe rules are configured
-    grep_cmd = executor.run(["grep", "-RHi", "", "/etc/modprobe.d"])
+    install_pattern, blacklist_pattern = _modprobe_patterns(module)
 
     install_rule = False
     blacklist_rule = False
 
-    if grep_cmd.code == 0:
-        for line in grep_cmd.stdout.splitlines():
-            line = line.lower()
+    for path in _modprobe_files(context):
+        found = find_patterns(context, path, (install_pattern, blacklist_pattern))
 
-            if f"install {module}" in line and (
-                "/bin/true" in line or "/bin/false" in line
-            ):
-                install_rule = True
-            if f"blacklist {module}" in line:
-                blacklist_rule = True
+        if found is not None:
+            install_rule = install_rule or found[install_pattern] is not None
+            blacklist_rule = blacklist_rule or found[blacklist_pattern] is not None
 
     if not install_rule or not blacklist_rule:
         return ControlResult.failed_(
@@ -84,13 +126,26 @@ def check_filesystem_module_disabled(
     )
 
 
-@register_control("filesystem.partition")
+def _findmnt_argv(partition: str) -> list[str]:
+    return ["findmnt", "-kno", "TARGET,FSTYPE,OPTIONS", "--target", partition]
+
+
+def _requires_partition(params: dict, root: RootFS) -> Requirements:
+    if not root.is_host:
+        return Requirements()
+
+    return Requirements(commands=(tuple(_findmnt_argv(params["partition"].strip().lower())),))
+
+
+@register_control("filesystem.partition", requires=_requires_partition)
 def check_filesystem_partition(
     *,
     rule_id: str,
     control: str,
     params: dict,
-    executor: Executor
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
 ) -> ControlResult:
     """
     Check whether a filesystem path is mounted as a separate partition.
@@ -132,19 +187,24 @@ def check_filesystem_partition(
 
     required_options = set(options_param)
 
-    # List mounted partitions
-    findmnt_cmd = executor.run(
-        ["findmnt", "-kno", "TARGET,FSTYPE,OPTIONS", "--target", partition]
-    )
+    context = context or EngineContext(executor=executor)
 
-    if findmnt_cmd.code != 0 or not findmnt_cmd.stdout.strip():
+    if context.root.is_host:
+        # List mounted partitions
+        findmnt_cmd = executor.run(_findmnt_argv(partition))
+        mount = findmnt_cmd.stdout.strip() if findmnt_cmd.code == 0 else ""
+    else:
+        # Offline roots are not mounted, use their static configuration
+        mount = _fstab_entry(context.root, partition)
+
+    if not mount:
         return ControlResult.skipped_(
             rule_id=rule_id,
             control=control,
             message=f"Unable to determine mount information for {partition}"
         )
 
-    _, fstype, options = findmnt_cmd.stdout.strip().split(None, 2)
+    _, fstype, options = mount.split(None, 2)
 
     if fstype not in required_fstype:
         return ControlResult.failed_(
@@ -165,3 +225,36 @@ def check_filesystem_partition(
         control=control,
         message=f"{partition} is properly configured"
     )
+
+
+def _fstab_entry(root: RootFS, partition: str) -> str:
+    for entry in config_cache.get(root, "/etc/fstab", "fstab"):
+        if entry.file.rstrip("/") == partition.rstrip("/"):
+            return f"{entry.file} {entry.vfstype} {','.join(entry.options)}"
+
+    return ""
+
+
+def _modprobe_patterns(module: str) -> tuple[str, str]:
+    name = re.escape(module)
+
+    return (
+        rf"(?i:^\s*install\s+{name}\s.*/bin/(true|false)\b)",
+        rf"(?i:^\s*blacklist\s+{name}(\s|$))"
+    )
+
+
+def _modprobe_files(context: EngineContext) -> list[str]:
+    def collect() -> list[str]:
+        local = context.root.resolve(MODPROBE_DIR)
+        files = []
+
+        for directory, _, names in os.walk(local):
+            relative = os.path.relpath(directory, local)
+
+            for name in sorted(names):
+                files.append(os.path.normpath(f"{MODPROBE_DIR}/{relative}/{name}"))
+
+        return sorted(files)
+
+    return context.facts.get("modprobe.d", collect)
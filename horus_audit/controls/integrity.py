@@ -0,0 +1,421 @@
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import mmap
+import os
+from pathlib import Path
+import sqlite3
+from typing import Any
+
+from horus_audit.core.engine import EngineContext
+from horus_audit.core.executor import Executor
+from horus_audit.core.registry import register_control
+from horus_audit.core.result import ControlResult
+from horus_audit.core.rootfs import RootFS
+
+
+# Directory of the digest caches, the only one a policy can have them written to
+CACHE_DIR = Path.home() / ".horus"
+DIGEST_CACHE = CACHE_DIR / "digests.db"
+
+# Files above this size are hashed through mmap
+MMAP_THRESHOLD = 1024 * 1024
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class _Store:
+    schema = ""
+    journal_mode = "WAL"
+
+    def __init__(self, path: Path, *, readonly: bool = False) -> None:
+        if readonly:
+            # Never written, nor its journal mode changed
+            self._connection = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(f"PRAGMA journal_mode={self.journal_mode}")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(self.schema)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class Baseline(_Store):
+    # Read-only connections to a WAL database need write access to its side files
+    journal_mode = "DELETE"
+    schema = """
+        CREATE TABLE IF NOT EXISTS baseline (
+            path TEXT PRIMARY KEY,
+            algorithm TEXT NOT NULL,
+            digest TEXT NOT NULL
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path: Path, *, readonly: bool = False) -> None:
+        super().__init__(path, readonly=readonly)
+
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(baseline)")}
+        self._algorithm = "algorithm"
+
+        # Baselines recorded before the algorithm was stored, their entries have none
+        if "algorithm" not in columns and readonly:
+            self._algorithm = "NULL"
+        elif "algorithm" not in columns:
+            with self._connection:
+                self._connection.execute("ALTER TABLE baseline ADD COLUMN algorithm TEXT")
+
+    def lookup(self, paths: Iterable[str]) -> dict[str, tuple[str | None, str]]:
+        found = {}
+        paths = list(paths)
+
+        # Stay below the SQLite bound parameters limit
+        for i in range(0, len(paths), 500):
+            batch = paths[i:i + 500]
+            rows = self._connection.execute(
+                f"SELECT path, {self._algorithm}, digest FROM baseline WHERE path IN ({','.join('?' * len(batch))})",
+                batch
+            )
+            found.update((path, (algorithm, digest)) for path, algorithm, digest in rows)
+
+        return found
+
+    def update(self, digests: dict[str, str], algorithm: str) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO baseline (path, algorithm, digest) VALUES (?, ?, ?)",
+                ((path, algorithm, digest) for path, digest in digests.items())
+            )
+
+    def remove(self, paths: Iterable[str]) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "DELETE FROM baseline WHERE path = ?",
+                ((path,) for path in paths)
+            )
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM baseline").fetchone()[0]
+
+
+class DigestCache(_Store):
+    schema = """
+        CREATE TABLE IF NOT EXISTS digests (
+            device INTEGER NOT NULL,
+            inode INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            algorithm TEXT NOT NULL,
+            digest TEXT NOT NULL,
+            PRIMARY KEY (device, inode, algorithm)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, st: os.stat_result, algorithm: str) -> str | None:
+        row = self._connection.execute(
+            "SELECT digest FROM digests "
+            "WHERE device = ? AND inode = ? AND algorithm = ? AND size = ? AND mtime_ns = ?",
+            (st.st_dev, st.st_ino, algorithm, st.st_size, st.st_mtime_ns)
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return row[0]
+
+    def put(self, entries: Iterable[tuple[os.stat_result, str]], algorithm: str) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO digests "
+                "(device, inode, size, mtime_ns, algorithm, digest) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, algorithm, digest)
+                    for st, digest in entries
+                )
+            )
+
+
+def hash_file(path: Path, algorithm: str = "sha256") -> str:
+    """
+    Hash a file, through mmap for large files.
+
+    Args:
+        path (Path): File to hash.
+        algorithm (str, optional): hashlib algorithm. Defaults to "sha256".
+
+    Returns:
+        str: Hexadecimal digest.
+    """
+
+    digest = hashlib.new(algorithm)
+
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        else:
+            while chunk := f.read(CHUNK_SIZE):
+                digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def hash_files(
+    root: RootFS,
+    paths: Iterable[str],
+    *,
+    algorithm: str = "sha256",
+    cache: DigestCache | None = None,
+    workers: int = 4
+) -> dict[str, str | None]:
+    """
+    Hash files in parallel, skipping files whose digest is cached.
+
+    Cached digests are keyed by device, inode, size and mtime, so any
+    change to a file invalidates its entry.
+
+    Args:
+        root (RootFS): Audited root filesystem.
+        paths (Iterable[str]): Paths of the audited system.
+        algorithm (str, optional): hashlib algorithm. Defaults to "sha256".
+        cache (DigestCache | None, optional): Digest cache. Defaults to None.
+        workers (int, optional): Hashing threads. Defaults to 4.
+
+    Returns:
+        dict[str, str | None]: Digest per path, None for unreadable files.
+    """
+
+    digests = {}
+    pending = []
+
+    for path in paths:
+        local = root.resolve(path)
+
+        try:
+            st = local.stat()
+        except OSError:
+            digests[path] = None
+            continue
+
+        cached = cache.get(st, algorithm) if cache is not None else None
+
+        if cached is None:
+            pending.append((path, local, st))
+        else:
+            digests[path] = cached
+
+    def digest(item: tuple[str, Path, os.stat_result]) -> str | None:
+        try:
+            return hash_file(item[1], algorithm)
+        except OSError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        computed = list(pool.map(digest, pending))
+
+    for (path, _, _), value in zip(pending, computed):
+        digests[path] = value
+
+    if cache is not None:
+        cache.put(
+            ((st, value) for (_, _, st), value in zip(pending, computed) if value is not None),
+            algorithm
+        )
+
+    return digests
+
+
+def update_baseline(
+    baseline_path: Path,
+    paths: Iterable[str],
+    *,
+    root: RootFS | None = None,
+    algorithm: str = "sha256",
+    cache_path: Path | None = DIGEST_CACHE
+) -> int:
+    """
+    Record the current digests of files as their baseline.
+
+    Entries recorded with another algorithm are replaced, this being the
+    only way to re-baseline files once the algorithm changed.
+
+    Args:
+        baseline_path (Path): Baseline index.
+        paths (Iterable[str]): Paths of the audited system.
+        root (RootFS | None, optional): Audited root filesystem. Defaults to None.
+        algorithm (str, optional): hashlib algorithm. Defaults to "sha256".
+        cache_path (Path | None, optional): Digest cache. Defaults to DIGEST_CACHE.
+
+    Returns:
+        int: Number of recorded files.
+    """
+
+    cache = DigestCache(cache_path) if cache_path is not None else None
+
+    try:
+        digests = hash_files(root or RootFS(), paths, algorithm=algorithm, cache=cache)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    recorded = {path: digest for path, digest in digests.items() if digest is not None}
+
+    with Baseline(baseline_path) as baseline:
+        baseline.update(recorded, algorithm)
+
+    return len(recorded)
+
+
+@register_control("file.integrity")
+def check_file_integrity(
+    *,
+    rule_id: str,
+    control: str,
+    params: dict,
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
+) -> ControlResult:
+    """
+    Check that critical files match their baseline digests.
+
+    The baseline is opened read-only. Files baselined with another
+    algorithm are verified with that algorithm and reported until the
+    baseline is updated, see update_baseline. Files without a recorded
+    algorithm cannot be verified and are reported as not in the baseline.
+    """
+
+    # Files
+    paths_param = params.get("paths")
+
+    if (
+        not isinstance(paths_param, list)
+        or not paths_param
+        or not all(isinstance(path, str) and path for path in paths_param)
+    ):
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message="params.paths is empty"
+        )
+
+    # Baseline index
+    baseline_param = params.get("baseline")
+
+    if not isinstance(baseline_param, str) or not baseline_param.strip():
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message="params.baseline is empty"
+        )
+
+    baseline_path = Path(baseline_param.strip())
+
+    if not baseline_path.exists():
+        return ControlResult.skipped_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Baseline not found: {baseline_path}"
+        )
+
+    algorithm = params.get("algorithm", "sha256")
+
+    if algorithm not in hashlib.algorithms_available:
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Unsupported algorithm: {algorithm}"
+        )
+
+    # Digest cache, a name or a path within CACHE_DIR
+    cache_param = params.get("cache", DIGEST_CACHE.name)
+    cache_path = (CACHE_DIR / cache_param).resolve() if isinstance(cache_param, str) and cache_param else None
+
+    if cache_path is None or not cache_path.is_relative_to(CACHE_DIR.resolve()):
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message=f"params.cache is outside {CACHE_DIR}"
+        )
+
+    context = context or EngineContext(executor=executor)
+
+    with Baseline(baseline_path, readonly=True) as baseline:
+        entries = baseline.lookup(paths_param)
+
+    # Each file is hashed with the algorithm of its baseline entry
+    expected = {
+        path: digest
+        for path, (recorded, digest) in entries.items()
+        if recorded in hashlib.algorithms_available
+    }
+    algorithms = {path: entries[path][0] if path in expected else algorithm for path in paths_param}
+    actual = {}
+
+    with DigestCache(cache_path) as cache:
+        for name in set(algorithms.values()):
+            paths = [path for path in paths_param if algorithms[path] == name]
+            actual.update(hash_files(context.root, paths, algorithm=name, cache=cache))
+
+    missing = [path for path in paths_param if actual.get(path) is None]
+    unknown = [path for path in paths_param if path not in expected]
+    modified = [
+        path
+        for path in paths_param
+        if path in expected and actual.get(path) is not None and actual[path] != expected[path]
+    ]
+    outdated = [path for path in paths_param if algorithms[path] != algorithm]
+
+    if missing or modified:
+        details = []
+
+        if modified:
+            details.append(f"modified: {', '.join(modified)}")
+        if missing:
+            details.append(f"missing: {', '.join(missing)}")
+
+        return ControlResult.failed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Files differ from baseline ({'; '.join(details)})"
+        )
+
+    if unknown:
+        return ControlResult.warning_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Files not in baseline: {', '.join(unknown)}"
+        )
+
+    if outdated:
+        return ControlResult.warning_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Files baselined with another algorithm than {algorithm}: {', '.join(outdated)}"
+        )
+
+    return ControlResult.passed_(
+        rule_id=rule_id,
+        control=control,
+        message=f"{len(paths_param)} files match their baseline"
+    )
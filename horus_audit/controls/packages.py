@@ -0,0 +1,601 @@
+from dataclasses import asdict, dataclass, field
+import json
+import os
+from pathlib import Path
+import tempfile
+from typing import Any
+
+from horus_audit.config import get_logger
+from horus_audit.core.engine import EngineContext
+from horus_audit.core.executor import Executor
+from horus_audit.core.metrics import CacheCounter, register_cache
+from horus_audit.core.registry import Requirements, register_control
+from horus_audit.core.result import ControlResult
+from horus_audit.core.rootfs import RootFS
+
+
+logger = get_logger(__name__)
+
+PACKAGE_CACHE = Path.home() / ".horus" / "packages.json"
+
+# Inventories loaded from PACKAGE_CACHE, or parsed again
+inventory_counter = CacheCounter()
+register_cache("packages", inventory_counter)
+
+DPKG_STATUS = "/var/lib/dpkg/status"
+RPM_DATABASES = ("/var/lib/rpm", "/usr/lib/sysimage/rpm")
+
+RPM_QUERY_FORMAT = "%{NAME}\\t%{EPOCHNUM}:%{VERSION}-%{RELEASE}\\t%{ARCH}\\n"
+
+
+@dataclass
+class Package:
+    name: str
+    version: str
+    arch: str
+    state: str = "installed"
+
+
+@dataclass
+class PackageInventory:
+    manager: str | None
+    packages: dict[str, Package] = field(default_factory=dict)
+
+    def get(self, name: str) -> Package | None:
+        return self.packages.get(name)
+
+    def installed(self, name: str) -> bool:
+        package = self.packages.get(name)
+        return package is not None and package.state == "installed"
+
+
+def parse_dpkg_status(text: str) -> dict[str, Package]:
+    """
+    Parse the dpkg status database.
+
+    Args:
+        text (str): Content of /var/lib/dpkg/status.
+
+    Returns:
+        dict[str, Package]: Packages indexed by name.
+    """
+
+    packages = {}
+
+    for stanza in text.split("\n\n"):
+        fields = {}
+
+        for line in stanza.splitlines():
+            # Continuation lines belong to multi-line fields
+            if not line or line[0] in " \t":
+                continue
+
+            key, _, value = line.partition(":")
+            fields[key] = value.strip()
+
+        name = fields.get("Package")
+
+        if not name:
+            continue
+
+        status = fields.get("Status", "").split()
+        package = Package(
+            name=name,
+            version=fields.get("Version", ""),
+            arch=fields.get("Architecture", ""),
+            state=status[-1] if status else "unknown"
+        )
+
+        # Multi-arch packages: keep the installed instance
+        if name not in packages or package.state == "installed":
+            packages[name] = package
+
+    return packages
+
+
+def parse_rpm_query(text: str) -> dict[str, Package]:
+    """
+    Parse the output of a bulk rpm query.
+
+    Args:
+        text (str): Output of rpm -qa with RPM_QUERY_FORMAT.
+
+    Returns:
+        dict[str, Package]: Packages indexed by name.
+    """
+
+    packages = {}
+
+    for line in text.splitlines():
+        fields = line.split("\t")
+
+        if len(fields) != 3 or fields[0] == "gpg-pubkey":
+            continue
+
+        name, version, arch = fields
+        packages[name] = Package(name=name, version=version, arch=arch)
+
+    return packages
+
+
+def collect_packages(
+    root: RootFS,
+    executor: Executor,
+    *,
+    cache_path: Path | None = None
+) -> PackageInventory:
+    """
+    Build the package inventory of a system.
+
+    The dpkg database is parsed natively, the rpm database is read with a
+    single bulk query. Inventories are cached on disk and reused while the
+    database modification time is unchanged.
+
+    Args:
+        root (RootFS): Audited root filesystem.
+        executor (Executor): Execution backend.
+        cache_path (Path | None, optional): Inventory cache. Defaults to None.
+
+    Returns:
+        PackageInventory: Package inventory.
+    """
+
+    dpkg_status = root.resolve(DPKG_STATUS)
+
+    if dpkg_status.is_file():
+        manager, database = "dpkg", dpkg_status
+    else:
+        manager, database = "rpm", None
+
+        for candidate in RPM_DATABASES:
+            if root.resolve(candidate).is_dir():
+                database = root.resolve(candidate)
+                break
+
+    if database is None:
+        return PackageInventory(manager=None)
+
+    key = str(database)
+    mtime_ns = _database_mtime(database)
+    cached = _load_cache(cache_path).get(key) if cache_path is not None else None
+
+    if cached is not None and cached["mtime_ns"] == mtime_ns:
+        inventory_counter.hit()
+
+        return PackageInventory(
+            manager=cached["manager"],
+            packages={name: Package(**package) for name, package in cached["packages"].items()}
+        )
+
+    inventory_counter.miss()
+
+    if manager == "dpkg":
+        packages = parse_dpkg_status(dpkg_status.read_text(encoding="utf-8", errors="replace"))
+    else:
+        rpm_cmd = executor.run(_rpm_argv(root), timeout=60)
+
+        if rpm_cmd.code != 0:
+            raise RuntimeError(f"rpm query failed: {rpm_cmd.stderr}")
+
+        packages = parse_rpm_query(rpm_cmd.stdout)
+
+    if cache_path is not None:
+        _store_cache(cache_path, key, {
+            "mtime_ns": mtime_ns,
+            "manager": manager,
+            "packages": {name: asdict(package) for name, package in packages.items()}
+        })
+
+    return PackageInventory(manager=manager, packages=packages)
+
+
+def _rpm_argv(root: RootFS) -> list[str]:
+    argv = ["rpm", "-qa", "--queryformat", RPM_QUERY_FORMAT]
+
+    if not root.is_host:
+        argv[1:1] = ["--root", str(root.root)]
+
+    return argv
+
+
+def _database_mtime(database: Path) -> int:
+    if database.is_file():
+        return database.stat().st_mtime_ns
+
+    # rpm updates its database files in place, the directory mtime is not enough
+    with os.scandir(database) as entries:
+        return max(
+            [entry.stat().st_mtime_ns for entry in entries if entry.is_file()],
+            default=database.stat().st_mtime_ns
+        )
+
+
+def _load_cache(path: Path) -> dict[str, Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _store_cache(path: Path, key: str, entry: dict[str, Any]) -> None:
+    cache = _load_cache(path)
+    cache[key] = entry
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile(
+            "w",
+            dir=path.parent,
+            prefix=f".{path.name}.",
+            delete=False,
+            encoding="utf-8"
+        ) as f:
+            json.dump(cache, f)
+
+        os.replace(f.name, path)
+
+    except OSError as exc:
+        logger.warning(f"Unable to write package cache: {exc}")
+
+
+def compare_dpkg_versions(a: str, b: str) -> int:
+    """
+    Compare two Debian package versions.
+
+    Args:
+        a (str): First version.
+        b (str): Second version.
+
+    Returns:
+        int: Negative, zero or positive as a is lower, equal or greater than b.
+    """
+
+    epoch_a, upstream_a, revision_a = _split_dpkg_version(a)
+    epoch_b, upstream_b, revision_b = _split_dpkg_version(b)
+
+    if epoch_a != epoch_b:
+        return epoch_a - epoch_b
+
+    return _verrevcmp(upstream_a, upstream_b) or _verrevcmp(revision_a, revision_b)
+
+
+def _split_dpkg_version(version: str) -> tuple[int, str, str]:
+    epoch, _, rest = version.partition(":") if ":" in version else ("0", "", version)
+    upstream, _, revision = rest.rpartition("-") if "-" in rest else (rest, "", "")
+
+    return int(epoch or 0), upstream, revision
+
+
+def _dpkg_order(c: str) -> int:
+    if c.isdigit():
+        return 0
+    if c.isalpha():
+        return ord(c)
+    if c == "~":
+        return -1
+
+    return ord(c) + 256
+
+
+def _verrevcmp(a: str, b: str) -> int:
+    i = j = 0
+
+    while i < len(a) or j < len(b):
+        first_diff = 0
+
+        while (i < len(a) and not a[i].isdigit()) or (j < len(b) and not b[j].isdigit()):
+            order_a = _dpkg_order(a[i]) if i < len(a) else 0
+            order_b = _dpkg_order(b[j]) if j < len(b) else 0
+
+            if order_a != order_b:
+                return order_a - order_b
+
+            i += 1
+            j += 1
+
+        while i < len(a) and a[i] == "0":
+            i += 1
+        while j < len(b) and b[j] == "0":
+            j += 1
+
+        while i < len(a) and a[i].isdigit() and j < len(b) and b[j].isdigit():
+            if not first_diff:
+                first_diff = ord(a[i]) - ord(b[j])
+            i += 1
+            j += 1
+
+        if i < len(a) and a[i].isdigit():
+            return 1
+        if j < len(b) and b[j].isdigit():
+            return -1
+        if first_diff:
+            return first_diff
+
+    return 0
+
+
+def compare_rpm_versions(a: str, b: str) -> int:
+    """
+    Compare two RPM [epoch:]version[-release] strings.
+
+    A release only takes part in the comparison when both sides have one.
+
+    Args:
+        a (str): First version.
+        b (str): Second version.
+
+    Returns:
+        int: Negative, zero or positive as a is lower, equal or greater than b.
+    """
+
+    epoch_a, version_a, release_a = _split_rpm_version(a)
+    epoch_b, version_b, release_b = _split_rpm_version(b)
+
+    if epoch_a != epoch_b:
+        return epoch_a - epoch_b
+
+    result = _rpmvercmp(version_a, version_b)
+
+    if result or not release_a or not release_b:
+        return result
+
+    return _rpmvercmp(release_a, release_b)
+
+
+def _split_rpm_version(version: str) -> tuple[int, str, str]:
+    epoch, _, rest = version.partition(":") if ":" in version else ("0", "", version)
+    version, _, release = rest.rpartition("-") if "-" in rest else (rest, "", "")
+
+    return int(epoch or 0), version, release
+
+
+def _rpmvercmp(a: str, b: str) -> int:
+    if a == b:
+        return 0
+
+    i = j = 0
+
+    def separator(s: str, k: int) -> bool:
+        return k < len(s) and not (s[k].isascii() and s[k].isalnum()) and s[k] not in "~^"
+
+    while i < len(a) or j < len(b):
+        while separator(a, i):
+            i += 1
+        while separator(b, j):
+            j += 1
+
+        # Tilde sorts before everything, even the end of the string
+        if (i < len(a) and a[i] == "~") or (j < len(b) and b[j] == "~"):
+            if not (i < len(a) and a[i] == "~"):
+                return 1
+            if not (j < len(b) and b[j] == "~"):
+                return -1
+            i += 1
+            j += 1
+            continue
+
+        # Caret sorts after the end of the string, before anything else
+        if (i < len(a) and a[i] == "^") or (j < len(b) and b[j] == "^"):
+            if i >= len(a):
+                return -1
+            if j >= len(b):
+                return 1
+            if a[i] != "^":
+                return 1
+            if b[j] != "^":
+                return -1
+            i += 1
+            j += 1
+            continue
+
+        if i >= len(a) or j >= len(b):
+            break
+
+        numeric = a[i].isdigit()
+        kind = str.isdigit if numeric else str.isalpha
+
+        start_a = i
+        while i < len(a) and a[i].isascii() and kind(a[i]):
+            i += 1
+        start_b = j
+        while j < len(b) and b[j].isascii() and kind(b[j]):
+            j += 1
+
+        segment_a, segment_b = a[start_a:i], b[start_b:j]
+
+        if not segment_b:
+            return 1 if numeric else -1
+
+        if numeric:
+            segment_a, segment_b = segment_a.lstrip("0"), segment_b.lstrip("0")
+
+            if len(segment_a) != len(segment_b):
+                return len(segment_a) - len(segment_b)
+
+        if segment_a != segment_b:
+            return -1 if segment_a < segment_b else 1
+
+    if i >= len(a) and j >= len(b):
+        return 0
+
+    return -1 if i >= len(a) else 1
+
+
+def _inventory(context: EngineContext) -> PackageInventory:
+    return context.facts.get(
+        "packages",
+        lambda: collect_packages(context.root, context.executor, cache_path=PACKAGE_CACHE)
+    )
+
+
+def _requires(params: dict, root: RootFS) -> Requirements:
+    # The dpkg database is parsed natively, the cache may spare the rpm query
+    command = None if root.resolve(DPKG_STATUS).is_file() else tuple(_rpm_argv(root))
+    return Requirements(facts={"packages": command})
+
+
+@register_control("package.installed", prefetch=_inventory, requires=_requires)
+def check_package_installed(
+    *,
+    rule_id: str,
+    control: str,
+    params: dict,
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
+) -> ControlResult:
+    """
+    Check whether a package is installed.
+    """
+
+    # Package
+    name_param = params.get("name")
+
+    if not isinstance(name_param, str) or not name_param.strip():
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message="params.name is empty"
+        )
+
+    name = name_param.strip()
+    inventory = _inventory(context or EngineContext(executor=executor))
+
+    if inventory.manager is None:
+        return ControlResult.skipped_(
+            rule_id=rule_id,
+            control=control,
+            message="Unable to find a package database"
+        )
+
+    if not inventory.installed(name):
+        return ControlResult.failed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Package {name} is not installed"
+        )
+
+    return ControlResult.passed_(
+        rule_id=rule_id,
+        control=control,
+        message=f"Package {name} is installed"
+    )
+
+
+@register_control("package.absent", prefetch=_inventory, requires=_requires)
+def check_package_absent(
+    *,
+    rule_id: str,
+    control: str,
+    params: dict,
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
+) -> ControlResult:
+    """
+    Check whether a package is not installed.
+    """
+
+    # Package
+    name_param = params.get("name")
+
+    if not isinstance(name_param, str) or not name_param.strip():
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message="params.name is empty"
+        )
+
+    name = name_param.strip()
+    inventory = _inventory(context or EngineContext(executor=executor))
+
+    if inventory.manager is None:
+        return ControlResult.skipped_(
+            rule_id=rule_id,
+            control=control,
+            message="Unable to find a package database"
+        )
+
+    if inventory.installed(name):
+        return ControlResult.failed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Package {name} is installed"
+        )
+
+    return ControlResult.passed_(
+        rule_id=rule_id,
+        control=control,
+        message=f"Package {name} is not installed"
+    )
+
+
+@register_control("package.min_version", prefetch=_inventory, requires=_requires)
+def check_package_min_version(
+    *,
+    rule_id: str,
+    control: str,
+    params: dict,
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
+) -> ControlResult:
+    """
+    Check whether a package is installed with at least a given version.
+    """
+
+    # Package
+    name_param = params.get("name")
+
+    if not isinstance(name_param, str) or not name_param.strip():
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message="params.name is empty"
+        )
+
+    name = name_param.strip()
+
+    # Minimum version
+    version_param = params.get("version")
+
+    if not isinstance(version_param, str) or not version_param.strip():
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message="params.version is empty"
+        )
+
+    required = version_param.strip()
+    inventory = _inventory(context or EngineContext(executor=executor))
+
+    if inventory.manager is None:
+        return ControlResult.skipped_(
+            rule_id=rule_id,
+            control=control,
+            message="Unable to find a package database"
+        )
+
+    if not inventory.installed(name):
+        return ControlResult.failed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Package {name} is not installed"
+        )
+
+    installed = inventory.get(name).version
+    compare = compare_dpkg_versions if inventory.manager == "dpkg" else compare_rpm_versions
+
+    if compare(installed, required) < 0:
+        return ControlResult.failed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Package {name} {installed} is older than {required}"
+        )
+
+    return ControlResult.passed_(
+        rule_id=rule_id,
+        control=control,
+        message=f"Package {name} {installed} is at least {required}"
+    )
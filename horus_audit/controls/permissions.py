@@ -0,0 +1,407 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+import os
+import queue
+import stat
+import threading
+from typing import Any
+
+from horus_audit.core.engine import EngineContext
+from horus_audit.core.executor import Executor
+from horus_audit.core.registry import Requirements, register_control
+from horus_audit.core.result import ControlResult
+from horus_audit.core.rootfs import RootFS
+
+
+FINDINGS = ("world_writable", "sticky_bit", "suid", "sgid", "unowned", "ungrouped")
+
+
+@dataclass
+class PermissionScan:
+    world_writable: list[str] = field(default_factory=list)
+    sticky_bit: list[str] = field(default_factory=list)
+    suid: list[str] = field(default_factory=list)
+    sgid: list[str] = field(default_factory=list)
+    unowned: list[str] = field(default_factory=list)
+    ungrouped: list[str] = field(default_factory=list)
+    owners_known: bool = True
+    scanned: int = 0
+    errors: int = 0
+
+    def merge(self, other: "PermissionScan") -> None:
+        for name in FINDINGS:
+            getattr(self, name).extend(getattr(other, name))
+
+        self.scanned += other.scanned
+        self.errors += other.errors
+
+
+def scan_permissions(
+    root: RootFS,
+    *,
+    paths: Iterable[str] = ("/",),
+    exclude: Iterable[str] = (),
+    workers: int = 8
+) -> PermissionScan:
+    """
+    Walk a tree once and collect every permission finding.
+
+    Directories are listed in parallel with os.scandir. The walk never
+    crosses into another filesystem than the one of its starting path,
+    and excluded directories are not descended into.
+
+    Args:
+        root (RootFS): Audited root filesystem.
+        paths (Iterable[str], optional): Starting paths. Defaults to ("/",).
+        exclude (Iterable[str], optional): Directories to skip. Defaults to ().
+        workers (int, optional): Scanning threads. Defaults to 8.
+
+    Returns:
+        PermissionScan: Findings, as paths of the audited system.
+    """
+
+    uids = _read_ids(root, "/etc/passwd")
+    gids = _read_ids(root, "/etc/group")
+    excluded = {str(root.path(path)) for path in exclude}
+
+    pending = queue.Queue()
+
+    for path in paths:
+        local = str(root.path(path))
+
+        try:
+            st = os.lstat(local)
+        except OSError:
+            continue
+
+        if stat.S_ISDIR(st.st_mode) and local not in excluded:
+            pending.put((local, st.st_dev))
+
+    partials = [PermissionScan() for _ in range(max(workers, 1))]
+    threads = [
+        threading.Thread(
+            target=_scan_worker,
+            args=(pending, partials[i], excluded, uids, gids),
+            daemon=True
+        )
+        for i in range(len(partials))
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    pending.join()
+
+    for _ in threads:
+        pending.put(None)
+
+    for thread in threads:
+        thread.join()
+
+    scan = PermissionScan(owners_known=uids is not None and gids is not None)
+    prefix = 0 if root.is_host else len(str(root.root))
+
+    for partial in partials:
+        scan.merge(partial)
+
+    for name in FINDINGS:
+        setattr(scan, name, sorted(path[prefix:] or "/" for path in getattr(scan, name)))
+
+    return scan
+
+
+def _scan_worker(
+    pending: queue.Queue,
+    scan: PermissionScan,
+    excluded: set[str],
+    uids: set[int] | None,
+    gids: set[int] | None
+) -> None:
+    while True:
+        item = pending.get()
+
+        if item is None:
+            return
+
+        directory, device = item
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        scan.errors += 1
+                        continue
+
+                    mode = st.st_mode
+
+                    if stat.S_ISLNK(mode):
+                        continue
+
+                    scan.scanned += 1
+                    path = entry.path
+
+                    if uids is not None and st.st_uid not in uids:
+                        scan.unowned.append(path)
+
+                    if gids is not None and st.st_gid not in gids:
+                        scan.ungrouped.append(path)
+
+                    if stat.S_ISDIR(mode):
+                        if mode & stat.S_IWOTH and not mode & stat.S_ISVTX:
+                            scan.sticky_bit.append(path)
+
+                        # Stay on the filesystem of the starting path
+                        if st.st_dev == device and path not in excluded:
+                            pending.put((path, device))
+
+                    elif stat.S_ISREG(mode):
+                        if mode & stat.S_IWOTH:
+                            scan.world_writable.append(path)
+
+                        if mode & stat.S_ISUID:
+                            scan.suid.append(path)
+
+                        if mode & stat.S_ISGID:
+                            scan.sgid.append(path)
+
+        except OSError:
+            scan.errors += 1
+
+        finally:
+            pending.task_done()
+
+
+def _read_ids(root: RootFS, path: str) -> set[int] | None:
+    try:
+        lines = root.resolve(path).read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return None
+
+    ids = set()
+
+    for line in lines:
+        fields = line.split(":")
+
+        if len(fields) > 2 and fields[2].isdigit():
+            ids.add(int(fields[2]))
+
+    return ids
+
+
+def _scan_fact(paths: list[str], exclude: list[str]) -> str:
+    return f"permissions:{sorted(set(paths))}:{sorted(set(exclude))}"
+
+
+def _requires(params: dict, root: RootFS) -> Requirements:
+    return Requirements(facts={_scan_fact(params.get("paths", ["/"]), params.get("exclude", [])): None})
+
+
+@register_control("permissions.world_writable", requires=_requires)
+def check_permissions_world_writable(
+    *,
+    rule_id: str,
+    control: str,
+    params: dict,
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
+) -> ControlResult:
+    """
+    Check that no regular file is world-writable.
+    """
+
+    return _check_finding(
+        "world_writable",
+        "world-writable files",
+        rule_id=rule_id,
+        control=control,
+        params=params,
+        context=context or EngineContext(executor=executor)
+    )
+
+
+@register_control("permissions.sticky_bit", requires=_requires)
+def check_permissions_sticky_bit(
+    *,
+    rule_id: str,
+    control: str,
+    params: dict,
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
+) -> ControlResult:
+    """
+    Check that every world-writable directory has the sticky bit set.
+    """
+
+    return _check_finding(
+        "sticky_bit",
+        "world-writable directories without sticky bit",
+        rule_id=rule_id,
+        control=control,
+        params=params,
+        context=context or EngineContext(executor=executor)
+    )
+
+
+@register_control("permissions.suid", requires=_requires)
+def check_permissions_suid(
+    *,
+    rule_id: str,
+    control: str,
+    params: dict,
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
+) -> ControlResult:
+    """
+    Check that only allowed executables have the SUID bit set.
+    """
+
+    return _check_finding(
+        "suid",
+        "unexpected SUID files",
+        rule_id=rule_id,
+        control=control,
+        params=params,
+        context=context or EngineContext(executor=executor)
+    )
+
+
+@register_control("permissions.sgid", requires=_requires)
+def check_permissions_sgid(
+    *,
+    rule_id: str,
+    control: str,
+    params: dict,
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
+) -> ControlResult:
+    """
+    Check that only allowed executables have the SGID bit set.
+    """
+
+    return _check_finding(
+        "sgid",
+        "unexpected SGID files",
+        rule_id=rule_id,
+        control=control,
+        params=params,
+        context=context or EngineContext(executor=executor)
+    )
+
+
+@register_control("permissions.unowned", requires=_requires)
+def check_permissions_unowned(
+    *,
+    rule_id: str,
+    control: str,
+    params: dict,
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
+) -> ControlResult:
+    """
+    Check that every file is owned by an existing user.
+    """
+
+    return _check_finding(
+        "unowned",
+        "files without owner",
+        rule_id=rule_id,
+        control=control,
+        params=params,
+        context=context or EngineContext(executor=executor)
+    )
+
+
+@register_control("permissions.ungrouped", requires=_requires)
+def check_permissions_ungrouped(
+    *,
+    rule_id: str,
+    control: str,
+    params: dict,
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
+) -> ControlResult:
+    """
+    Check that every file belongs to an existing group.
+    """
+
+    return _check_finding(
+        "ungrouped",
+        "files without group",
+        rule_id=rule_id,
+        control=control,
+        params=params,
+        context=context or EngineContext(executor=executor)
+    )
+
+
+def _check_finding(
+    finding: str,
+    label: str,
+    *,
+    rule_id: str,
+    control: str,
+    params: dict,
+    context: EngineContext
+) -> ControlResult:
+    scope = {}
+
+    for name, default in (("paths", ["/"]), ("exclude", []), ("allowed", [])):
+        value = params.get(name, default)
+
+        if not isinstance(value, list) or not all(isinstance(v, str) and v for v in value):
+            return ControlResult.error_(
+                rule_id=rule_id,
+                control=control,
+                message=f"params.{name} has to be a list of paths"
+            )
+
+        scope[name] = value
+
+    if not scope["paths"]:
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message="params.paths is empty"
+        )
+
+    paths = sorted(set(scope["paths"]))
+    exclude = sorted(set(scope["exclude"]))
+
+    # Every rule sharing a scope reuses a single walk
+    scan = context.facts.get(
+        _scan_fact(paths, exclude),
+        lambda: scan_permissions(context.root, paths=paths, exclude=exclude)
+    )
+
+    if finding in ("unowned", "ungrouped") and not scan.owners_known:
+        return ControlResult.skipped_(
+            rule_id=rule_id,
+            control=control,
+            message="Unable to read users and groups"
+        )
+
+    allowed = set(scope["allowed"])
+    found = [path for path in getattr(scan, finding) if path not in allowed]
+
+    if found:
+        sample = ", ".join(found[:5]) + (", ..." if len(found) > 5 else "")
+
+        return ControlResult.failed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"{len(found)} {label} found: {sample}"
+        )
+
+    return ControlResult.passed_(
+        rule_id=rule_id,
+        control=control,
+        message=f"No {label} found"
+    )
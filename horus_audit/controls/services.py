@@ -0,0 +1,304 @@
+from dataclasses import dataclass
+import os
+from typing import Any
+
+from horus_audit.core.engine import EngineContext
+from horus_audit.core.executor import Executor
+from horus_audit.core.registry import Requirements, register_control
+from horus_audit.core.result import ControlResult
+from horus_audit.core.rootfs import RootFS
+
+
+# Highest precedence first, as systemd for system units
+UNIT_DIRS = (
+    "/etc/systemd/system",
+    "/run/systemd/system",
+    "/usr/local/lib/systemd/system",
+    "/usr/lib/systemd/system",
+    "/lib/systemd/system"
+)
+
+# Directories whose .wants and .requires links enable units
+ENABLE_DIRS = ("/etc/systemd/system", "/run/systemd/system")
+
+UNIT_SUFFIXES = (
+    ".service",
+    ".socket",
+    ".timer",
+    ".target",
+    ".path",
+    ".mount",
+    ".automount",
+    ".swap",
+    ".slice"
+)
+
+INSTALL_KEYS = ("wantedby", "requiredby", "upheldby", "alias", "also")
+
+
+@dataclass
+class Unit:
+    name: str
+    state: str
+    path: str | None = None
+
+
+def read_units(root: RootFS) -> dict[str, Unit]:
+    """
+    Collect the enablement state of every unit from the unit directories.
+
+    Units are found with systemd precedence, masked units are links to
+    /dev/null and enabled units are linked from a .wants or .requires
+    directory of the administrator or runtime configuration. Other units
+    are disabled when they have an [Install] section and static otherwise.
+
+    Args:
+        root (RootFS): Audited root filesystem.
+
+    Returns:
+        dict[str, Unit]: Units, aliases and enabled template instances indexed by name.
+    """
+
+    units = {}
+    aliases = {}
+    enabled = set()
+
+    for directory in UNIT_DIRS:
+        try:
+            with os.scandir(root.resolve(directory)) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        for entry in entries:
+            name = entry.name
+
+            if entry.is_dir(follow_symlinks=False):
+                if directory in ENABLE_DIRS and name.endswith((".wants", ".requires")):
+                    try:
+                        enabled.update(os.listdir(entry.path))
+                    except OSError:
+                        pass
+                continue
+
+            # Lower precedence directories are masked by higher ones
+            if not name.endswith(UNIT_SUFFIXES) or name in units or name in aliases:
+                continue
+
+            if entry.is_symlink():
+                target = os.readlink(entry.path)
+
+                if target == "/dev/null":
+                    units[name] = Unit(name=name, state="masked")
+                    continue
+
+                if os.path.basename(target) != name:
+                    aliases[name] = os.path.basename(target)
+                    continue
+
+            units[name] = Unit(name=name, state="", path=f"{directory}/{name}")
+
+    for unit in units.values():
+        if unit.state:
+            continue
+
+        if unit.name in enabled:
+            unit.state = "enabled"
+        elif _has_install_section(root, unit.path):
+            unit.state = "disabled"
+        else:
+            unit.state = "static"
+
+    # Enabled instances of template units
+    for name in sorted(enabled - units.keys()):
+        prefix, at, suffix = name.partition("@")
+        template = units.get(f"{prefix}@{suffix[suffix.rfind('.'):]}") if at else None
+
+        if template is not None and template.state != "masked":
+            units[name] = Unit(name=name, state="enabled", path=template.path)
+
+    for alias, target in aliases.items():
+        if target in units:
+            units[alias] = units[target]
+
+    return units
+
+
+def _has_install_section(root: RootFS, path: str) -> bool:
+    try:
+        lines = root.resolve(path).read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return False
+
+    section = ""
+
+    for line in lines:
+        line = line.strip()
+
+        if line.startswith("["):
+            section = line
+        elif section == "[Install]" and line.split("=", 1)[0].strip().lower() in INSTALL_KEYS:
+            return True
+
+    return False
+
+
+def _unit_name(service: str) -> str:
+    return service if service.endswith(UNIT_SUFFIXES) else f"{service}.service"
+
+
+def _units(context: EngineContext) -> dict[str, Unit]:
+    return context.facts.get("services", lambda: read_units(context.root))
+
+
+def _requires(params: dict, root: RootFS) -> Requirements:
+    return Requirements(facts={"services": None})
+
+
+def _lookup(params: dict, context: EngineContext) -> tuple[str, Unit | None]:
+    service_param = params.get("service")
+
+    if not isinstance(service_param, str) or not service_param.strip():
+        raise ValueError("params.service is empty")
+
+    name = _unit_name(service_param.strip())
+
+    return name, _units(context).get(name)
+
+
+@register_control("service.enabled", prefetch=_units, requires=_requires)
+def check_service_enabled(
+    *,
+    rule_id: str,
+    control: str,
+    params: dict,
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
+) -> ControlResult:
+    """
+    Check whether a service is enabled.
+    """
+
+    context = context or EngineContext(executor=executor)
+
+    try:
+        name, unit = _lookup(params, context)
+    except ValueError as exc:
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message=str(exc)
+        )
+
+    if unit is None:
+        return ControlResult.failed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Service {name} is not installed"
+        )
+
+    if unit.state != "enabled":
+        return ControlResult.failed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Service {name} is {unit.state}"
+        )
+
+    return ControlResult.passed_(
+        rule_id=rule_id,
+        control=control,
+        message=f"Service {name} is enabled"
+    )
+
+
+@register_control("service.disabled", prefetch=_units, requires=_requires)
+def check_service_disabled(
+    *,
+    rule_id: str,
+    control: str,
+    params: dict,
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
+) -> ControlResult:
+    """
+    Check whether a service is not enabled.
+    """
+
+    context = context or EngineContext(executor=executor)
+
+    try:
+        name, unit = _lookup(params, context)
+    except ValueError as exc:
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message=str(exc)
+        )
+
+    if unit is None:
+        return ControlResult.passed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Service {name} is not installed"
+        )
+
+    if unit.state == "enabled":
+        return ControlResult.failed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Service {name} is enabled"
+        )
+
+    return ControlResult.passed_(
+        rule_id=rule_id,
+        control=control,
+        message=f"Service {name} is {unit.state}"
+    )
+
+
+@register_control("service.masked", prefetch=_units, requires=_requires)
+def check_service_masked(
+    *,
+    rule_id: str,
+    control: str,
+    params: dict,
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
+) -> ControlResult:
+    """
+    Check whether a service is masked or not installed.
+    """
+
+    context = context or EngineContext(executor=executor)
+
+    try:
+        name, unit = _lookup(params, context)
+    except ValueError as exc:
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message=str(exc)
+        )
+
+    if unit is None:
+        return ControlResult.passed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Service {name} is not installed"
+        )
+
+    if unit.state != "masked":
+        return ControlResult.failed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Service {name} is {unit.state}"
+        )
+
+    return ControlResult.passed_(
+        rule_id=rule_id,
+        control=control,
+        message=f"Service {name} is masked"
+    )
@@ -0,0 +1,223 @@
+import os
+from typing import Any
+
+from horus_audit.core.engine import EngineContext
+from horus_audit.core.executor import Executor
+from horus_audit.core.registry import Requirements, register_control
+from horus_audit.core.result import ControlResult
+from horus_audit.core.rootfs import RootFS
+
+
+PROC_SYS = "/proc/sys"
+
+# Highest precedence first, as systemd-sysctl
+SYSCTL_DIRS = (
+    "/etc/sysctl.d",
+    "/run/sysctl.d",
+    "/usr/local/lib/sysctl.d",
+    "/usr/lib/sysctl.d",
+    "/lib/sysctl.d"
+)
+SYSCTL_CONF = "/etc/sysctl.conf"
+
+
+def read_sysctl(root: RootFS) -> dict[str, str]:
+    """
+    Snapshot every readable kernel parameter in a single walk of /proc/sys.
+
+    Args:
+        root (RootFS): Audited root filesystem.
+
+    Returns:
+        dict[str, str]: Values indexed by dotted parameter name.
+    """
+
+    base = str(root.path(PROC_SYS))
+    snapshot = {}
+    pending = [base]
+
+    while pending:
+        directory = pending.pop()
+
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                pending.append(entry.path)
+                continue
+
+            try:
+                with open(entry.path, "r", encoding="utf-8", errors="replace") as f:
+                    value = f.read()
+            except OSError:
+                # Write-only or restricted parameters
+                continue
+
+            key = entry.path[len(base) + 1:].replace("/", ".")
+            snapshot[key] = normalize_value(value)
+
+    return snapshot
+
+
+def read_sysctl_config(root: RootFS) -> dict[str, str]:
+    """
+    Merge persistent kernel parameters with systemd-sysctl precedence.
+
+    A file name in a higher precedence directory masks the same name in
+    lower ones, the remaining files are applied in lexical order of their
+    names and /etc/sysctl.conf is applied last.
+
+    Args:
+        root (RootFS): Audited root filesystem.
+
+    Returns:
+        dict[str, str]: Configured values indexed by dotted parameter name.
+    """
+
+    files = {}
+
+    for directory in SYSCTL_DIRS:
+        try:
+            names = os.listdir(root.resolve(directory))
+        except OSError:
+            continue
+
+        for name in names:
+            if name.endswith(".conf") and name not in files:
+                files[name] = root.resolve(f"{directory}/{name}")
+
+    config = {}
+
+    for path in [files[name] for name in sorted(files)] + [root.resolve(SYSCTL_CONF)]:
+        try:
+            lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError:
+            continue
+
+        for line in lines:
+            line = line.strip()
+
+            if not line or line[0] in "#;" or "=" not in line:
+                continue
+
+            key, _, value = line.partition("=")
+            key = key.strip().lstrip("-").replace("/", ".")
+
+            config[key] = normalize_value(value)
+
+    return config
+
+
+def normalize_value(value: Any) -> str:
+    """
+    Normalize a kernel parameter value for comparison.
+
+    Args:
+        value (Any): Raw value.
+
+    Returns:
+        str: Value with whitespace collapsed.
+    """
+
+    return " ".join(str(value).split())
+
+
+def _prefetch(context: EngineContext) -> None:
+    context.facts.get("sysctl", lambda: read_sysctl(context.root))
+    context.facts.get("sysctl.config", lambda: read_sysctl_config(context.root))
+
+
+def _requires(params: dict, root: RootFS) -> Requirements:
+    facts = {"sysctl": None}
+
+    if params.get("persistent", True):
+        facts["sysctl.config"] = None
+
+    return Requirements(facts=facts)
+
+
+@register_control("sysctl.value", prefetch=_prefetch, requires=_requires)
+def check_sysctl_value(
+    *,
+    rule_id: str,
+    control: str,
+    params: dict,
+    executor: Executor,
+    os_info: Any | None = None,
+    context: EngineContext | None = None
+) -> ControlResult:
+    """
+    Check whether a kernel parameter has the expected runtime and persistent value.
+    """
+
+    # Kernel parameter
+    key_param = params.get("key")
+
+    if not isinstance(key_param, str) or not key_param.strip():
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message="params.key is empty"
+        )
+
+    key = key_param.strip().replace("/", ".")
+
+    # Expected value
+    value_param = params.get("value")
+
+    if value_param is None or isinstance(value_param, (dict, list)) or not str(value_param).strip():
+        return ControlResult.error_(
+            rule_id=rule_id,
+            control=control,
+            message="params.value is empty"
+        )
+
+    expected = normalize_value(value_param)
+    persistent = params.get("persistent", True)
+
+    context = context or EngineContext(executor=executor)
+    root = context.root
+
+    runtime = context.facts.get("sysctl", lambda: read_sysctl(root)).get(key)
+
+    if runtime is None and root.is_host:
+        return ControlResult.skipped_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Kernel parameter {key} is not available"
+        )
+
+    if runtime is None and not persistent:
+        # Offline root without /proc/sys, nothing left to check
+        return ControlResult.skipped_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Kernel parameter {key} runtime value not available on offline root"
+        )
+
+    if runtime is not None and runtime != expected:
+        return ControlResult.failed_(
+            rule_id=rule_id,
+            control=control,
+            message=f"Kernel parameter {key} is {runtime}, expected {expected}"
+        )
+
+    if persistent:
+        configured = context.facts.get("sysctl.config", lambda: read_sysctl_config(root)).get(key)
+
+        if configured != expected:
+            return ControlResult.failed_(
+                rule_id=rule_id,
+                control=control,
+                message=f"Kernel parameter {key} is not persistently set to {expected}"
+            )
+
+    return ControlResult.passed_(
+        rule_id=rule_id,
+        control=control,
+        message=f"Kernel parameter {key} is set to {expected}"
+    )
@@ -0,0 +1,381 @@
+import asyncio
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+import hashlib
+import heapq
+import json
+import os
+import socket
+import threading
+import zlib
+
+from horus_audit.config import get_logger
+from horus_audit.core.executor_helper import HEADER
+from horus_audit.core.result import STATUSES, ControlResult
+
+
+logger = get_logger(__name__)
+
+Address = str | tuple[str, int]
+
+# Largest accepted frame, compressed
+MAX_FRAME = 64 * 1024 * 1024
+
+
+def result_digest(result: ControlResult) -> str:
+    """
+    Hash the outcome of a result, durations excluded.
+
+    Args:
+        result (ControlResult): Control result.
+
+    Returns:
+        str: Hexadecimal digest.
+    """
+
+    payload = "\0".join((result.control, result.status, result.message)).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
+def _encode(payload: dict) -> bytes:
+    body = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+    return HEADER.pack(len(body)) + body
+
+
+def _decode(body: bytes) -> dict:
+    return json.loads(zlib.decompress(body).decode("utf-8"))
+
+
+@dataclass
+class FleetSummary:
+    rules: dict[str, dict[str, int]] = field(default_factory=dict)
+    failures: dict[str, int] = field(default_factory=dict)
+
+    def update(self, host: str, rule_id: str, old: str | None, new: str | None) -> None:
+        counts = self.rules.setdefault(rule_id, dict.fromkeys(STATUSES, 0))
+
+        if old is not None:
+            counts[old] -= 1
+            if old == "FAILED":
+                self.failures[host] -= 1
+
+        if new is not None:
+            counts[new] += 1
+            if new == "FAILED":
+                self.failures[host] = self.failures.get(host, 0) + 1
+
+    def worst_hosts(self, n: int = 10) -> list[tuple[str, int]]:
+        return heapq.nlargest(
+            n,
+            ((host, count) for host, count in self.failures.items() if count),
+            key=lambda item: item[1]
+        )
+
+
+@dataclass
+class _HostState:
+    run: int = 0
+    results: dict[str, tuple[str, str]] = field(default_factory=dict)
+
+
+class Collector:
+    def __init__(
+        self,
+        address: Address,
+        *,
+        sink: Callable[[list[tuple[str, str, ControlResult]]], None] | None = None,
+        batch_size: int = 1000,
+        flush_interval: float = 1.0
+    ) -> None:
+        self.address = address
+        self.summary = FleetSummary()
+        self.received = 0
+        self.duplicates = 0
+
+        self._sink = sink
+        self._batch = []
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._stopped = None
+        self._connections = set()
+
+    def start(self) -> None:
+        """
+        Serve agents on a background thread, returning once listening.
+        """
+
+        ready = threading.Event()
+
+        def serve() -> None:
+            self._loop = asyncio.new_event_loop()
+
+            try:
+                self._loop.run_until_complete(self.serve(ready))
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=serve, name="horus-collector", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    async def serve(self, ready: threading.Event | None = None) -> None:
+        """
+        Serve agents until stopped, on a single event loop.
+
+        Args:
+            ready (threading.Event | None, optional): Set once listening. Defaults to None.
+        """
+
+        self._stopped = asyncio.Event()
+
+        if isinstance(self.address, str):
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+
+            server = await asyncio.start_unix_server(self._handle, path=self.address)
+        else:
+            server = await asyncio.start_server(self._handle, *self.address)
+
+            # Resolve an ephemeral port
+            self.address = server.sockets[0].getsockname()[:2]
+
+        if ready is not None:
+            ready.set()
+
+        flusher = asyncio.create_task(self._flush_periodically())
+
+        async with server:
+            await self._stopped.wait()
+
+        for task in [flusher, *self._connections]:
+            task.cancel()
+
+        await asyncio.gather(flusher, *self._connections, return_exceptions=True)
+        self.flush()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            self.flush()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+
+        try:
+            while True:
+                (size,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+
+                if size > MAX_FRAME:
+                    raise ValueError(f"Frame too large: {size}")
+
+                reply = self.apply(_decode(await reader.readexactly(size)))
+
+                writer.write(_encode(reply))
+                await writer.drain()
+
+        except asyncio.IncompleteReadError:
+            pass
+
+        except (ValueError, KeyError, TypeError, zlib.error) as exc:
+            logger.warning(f"Invalid agent message: {exc}")
+
+        except ConnectionError:
+            pass
+
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    def apply(self, message: dict) -> dict:
+        """
+        Apply a delta pushed by an agent.
+
+        A delta based on run 0 is a full snapshot, any other delta has to
+        be based on the last run acknowledged for the host and policy, or
+        the agent is asked to resend a snapshot.
+
+        Args:
+            message (dict): Agent delta.
+
+        Returns:
+            dict: Acknowledgement or resync request.
+        """
+
+        host = message["host"]
+        policy = message["policy"]
+        base = message["base"]
+
+        with self._lock:
+            state = self._hosts.setdefault((host, policy), _HostState())
+
+            if base != 0 and base != state.run:
+                return {"resync": True}
+
+            received = {
+                rule_id: (control, status, text)
+                for rule_id, control, status, text in message["results"]
+            }
+            removed = set(message.get("removed", ()))
+
+            if base == 0:
+                removed |= state.results.keys() - received.keys()
+
+            for rule_id in removed:
+                if rule_id in state.results:
+                    _, old = state.results.pop(rule_id)
+                    self.summary.update(host, rule_id, old, None)
+
+            for rule_id, (control, status, text) in received.items():
+                result = ControlResult(rule_id=rule_id, control=control, status=status, message=text)
+                digest = result_digest(result)
+                previous = state.results.get(rule_id)
+
+                self.received += 1
+
+                if previous is not None and previous[0] == digest:
+                    self.duplicates += 1
+                    continue
+
+                state.results[rule_id] = (digest, status)
+                self.summary.update(host, rule_id, previous[1] if previous else None, status)
+                self._batch.append((host, policy, result))
+
+            state.run = message["run"]
+            full = len(self._batch) >= self._batch_size
+
+        if full:
+            self.flush()
+
+        return {"ack": state.run}
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._batch = self._batch, []
+
+        if batch and self._sink is not None:
+            self._sink(batch)
+
+    def worst_hosts(self, n: int = 10) -> list[tuple[str, int]]:
+        with self._lock:
+            return self.summary.worst_hosts(n)
+
+    def rule_summary(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {rule_id: dict(counts) for rule_id, counts in self.summary.rules.items()}
+
+
+class CollectorClient:
+    def __init__(self, address: Address, *, timeout: float = 10.0) -> None:
+        self.address = address
+        self.timeout = timeout
+        self.sent = 0
+
+        self._socket = None
+        self._stream = None
+        self._acked = {}
+
+    def push(self, *, host: str, policy: str, results: Iterable[ControlResult]) -> int:
+        """
+        Push the results of a run, sending only what changed since the last acknowledged run.
+
+        Args:
+            host (str): Audited host.
+            policy (str): Policy category.
+            results (Iterable[ControlResult]): Run results.
+
+        Returns:
+            int: Results sent.
+        """
+
+        current = {result.rule_id: (result_digest(result), result) for result in results}
+        key = (host, policy)
+
+        for _ in range(2):
+            run, acked = self._acked.get(key, (0, {}))
+
+            changed = [
+                [rule_id, result.control, result.status, result.message]
+                for rule_id, (digest, result) in current.items()
+                if acked.get(rule_id) != digest
+            ]
+            reply = self._request({
+                "host": host,
+                "policy": policy,
+                "base": run,
+                "run": run + 1,
+                "results": changed,
+                "removed": sorted(acked.keys() - current.keys())
+            })
+
+            if "ack" in reply:
+                digests = {rule_id: digest for rule_id, (digest, _) in current.items()}
+                self._acked[key] = (reply["ack"], digests)
+                self.sent += len(changed)
+                return len(changed)
+
+            # The collector lost track of this agent, resend a snapshot
+            self._acked.pop(key, None)
+
+        raise ConnectionError(f"Collector keeps rejecting deltas of {host}")
+
+    def _request(self, payload: dict) -> dict:
+        if self._socket is None:
+            family = socket.AF_UNIX if isinstance(self.address, str) else socket.AF_INET
+            self._socket = socket.socket(family, socket.SOCK_STREAM)
+            self._socket.settimeout(self.timeout)
+
+            try:
+                self._socket.connect(self.address)
+            except OSError:
+                self.close()
+                raise
+
+            self._stream = self._socket.makefile("rb")
+
+        try:
+            self._socket.sendall(_encode(payload))
+
+            header = self._stream.read(HEADER.size)
+
+            if len(header) < HEADER.size:
+                raise ConnectionError("Collector closed the connection")
+
+            (size,) = HEADER.unpack(header)
+            return _decode(self._stream.read(size))
+
+        except OSError:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
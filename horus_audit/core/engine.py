@@ -1,47 +1,486 @@
-from dataclasses import dataclass
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field, replace
+from functools import partial
+import importlib
+import multiprocessing
+from pathlib import Path
+import socket
+import threading
+import time
 from typing import Any
 
+from horus_audit.config import get_logger
+from horus_audit.core.exceptions import PolicyError
 from horus_audit.core.executor import Executor, LocalExecutor
+from horus_audit.core.facts import FactCache
+from horus_audit.core.journal import Journal
+from horus_audit.core.metrics import MeteredExecutor
+from horus_audit.core.plan import ExecutionPlan, compile_plan
 from horus_audit.core.registry import registry
 from horus_audit.core.result import ControlResult
-from horus_audit.core.rule import Policy, Rule
+from horus_audit.core.rootfs import RootFS
+from horus_audit.core.rule import SEVERITIES, Policy, Rule, policy_hash, rule_key
+from horus_audit.core.shard import Shard, shard_policy
+from horus_audit.core.tracing import span
+
+
+logger = get_logger(__name__)
 
 
 @dataclass
 class EngineContext:
     executor: Executor
     os_info: Any | None = None
+    root: RootFS = field(default_factory=RootFS)
+    facts: FactCache = field(default_factory=FactCache)
+
+
+@dataclass(frozen=True)
+class Gate:
+    threshold: int = 1
+    severity: str = "critical"
+    statuses: tuple[str, ...] = ("FAILED", "ERROR")
+
+    def __post_init__(self) -> None:
+        if self.threshold < 1:
+            raise ValueError("Gate threshold has to be positive")
+
+        if self.severity not in SEVERITIES:
+            raise ValueError(f"Unknown severity: {self.severity}")
+
+    def counts(self, rule: Rule, result: ControlResult) -> bool:
+        return result.status in self.statuses and SEVERITIES.index(rule.severity) <= SEVERITIES.index(self.severity)
+
+
+@dataclass
+class _GateRun:
+    gate: Gate
+    failures: int = 0
+    reason: str | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def tripped(self) -> bool:
+        return self.reason is not None
+
+    def record(self, rule: Rule, result: ControlResult) -> bool:
+        """
+        Count a result against the gate.
+
+        Args:
+            rule (Rule): Executed rule.
+            result (ControlResult): Its result.
+
+        Returns:
+            bool: Whether this result tripped the gate.
+        """
+
+        if not self.gate.counts(rule, result):
+            return False
+
+        with self._lock:
+            self.failures += 1
+
+            if self.failures != self.gate.threshold:
+                return False
+
+            # Frozen once tripped, every skipped rule of the run reports the same reason
+            self.reason = (
+                f"Not executed, gate tripped after {self.failures} {self.gate.severity} or more severe failures"
+            )
+
+            return True
 
 
 def run_policy(
     policy: Policy,
     *,
     executor: Executor | None = None,
-    os_info: Any | None = None
+    os_info: Any | None = None,
+    shard: Shard | None = None,
+    workers: int = 1,
+    processes: int = 0,
+    root: str | Path | RootFS | None = None,
+    facts: FactCache | None = None,
+    on_result: Callable[[ControlResult], None] | None = None,
+    gate: Gate | None = None,
+    plan: ExecutionPlan | None = None,
+    journal: Path | None = None,
+    resume: bool = False
 ) -> list[ControlResult]:
     """
     Execute a validated policy.
 
+    The policy is first compiled into an execution plan, unless a plan
+    compiled earlier is given. Controls registered as CPU-bound are
+    dispatched to a process pool when processes is positive, every other
+    control runs on the thread pool. Controls registered with a prepare
+    hook first receive all of their rules at once, so they can plan
+    shared work before any rule executes.
+
+    With a journal, every completed result is appended to it and the
+    journal is marked complete once the run succeeds. With resume, an
+    incomplete journal of the same policy and target, as left by an
+    interrupted run, is loaded and its rules are not executed again.
+
     Args:
         policy (Policy): Validated policy.
         executor (Executor | None, optional): Execution backend. Defaults to None.
         os_info (Any | None, optional): OS information. Defaults to None.
+        shard (Shard | None, optional): Only execute the rules of this shard. Defaults to None.
+        workers (int, optional): Threads for I/O-bound controls. Defaults to 1.
+        processes (int, optional): Processes for CPU-bound controls. Defaults to 0.
+        root (str | Path | RootFS | None, optional): Root filesystem to audit. Defaults to None.
+        facts (FactCache | None, optional): Fact cache shared with other runs. Defaults to None.
+        on_result (Callable[[ControlResult], None] | None, optional):
+            Called as soon as each rule completes. Defaults to None.
+        gate (Gate | None, optional): Fail fast, executing the most severe rules first and
+            skipping the remaining ones once the gate trips. Defaults to None.
+        plan (ExecutionPlan | None, optional): Plan of the policy, after sharding. Defaults to None.
+        journal (Path | None, optional): Journal to append results to. Defaults to None.
+        resume (bool, optional): Resume from an incomplete journal, otherwise it is started over.
+            Defaults to False.
 
     Returns:
-        list[ControlResult]: Control results.
+        list[ControlResult]: Control results, in policy order.
+
+    Raises:
+        PolicyError: The plan was compiled for another policy.
     """
 
+    if shard is not None:
+        policy = shard_policy(policy, shard)
+
+    # Counted per run, a gate can be reused
+    gate = _GateRun(gate) if gate is not None else None
+
     backend = executor or LocalExecutor()
-    context = EngineContext(executor=backend, os_info=os_info)
+    context = EngineContext(
+        executor=backend,
+        os_info=os_info,
+        root=root if isinstance(root, RootFS) else RootFS(root or "/"),
+        facts=facts if facts is not None else FactCache()
+    )
+
+    if plan is not None and plan.policy_hash != policy_hash(policy):
+        raise PolicyError("Execution plan does not match the policy")
+
+    if journal is None:
+        return _run(
+            policy,
+            context,
+            plan=plan,
+            workers=workers,
+            processes=processes,
+            on_result=on_result,
+            gate=gate
+        )
+
+    # Host and root audited, a journal is never resumed against another target
+    target = f"{getattr(backend, 'host', None) or socket.gethostname()}:{context.root.root}"
+
+    with Journal(journal, policy, target=target, resume=resume) as log:
+        done = log.completed
+        remaining = Policy(
+            category=policy.category,
+            rules=[rule for rule in policy.rules if rule.rule_id not in done]
+        )
+
+        if done:
+            logger.info(f"Resuming {policy.category}: {len(done)} of {len(policy.rules)} rules already completed")
+
+            # Costs of the given plan still apply to the remaining rules
+            costs = {step.rule_id: step.cost for step in plan.steps} if plan is not None else None
+            plan = compile_plan(remaining, root=context.root, costs=costs)
+
+        for rule in policy.rules:
+            if rule.rule_id in done:
+                if gate is not None:
+                    gate.record(rule, done[rule.rule_id])
+
+                if on_result is not None:
+                    on_result(done[rule.rule_id])
+
+        def record(result: ControlResult) -> None:
+            # Rules skipped by the gate were not executed
+            if gate is None or not gate.tripped or result.status != "SKIPPED":
+                log.record(result)
+
+            if on_result is not None:
+                on_result(result)
+
+        results = iter(_run(
+            remaining,
+            context,
+            plan=plan,
+            workers=workers,
+            processes=processes,
+            on_result=record,
+            gate=gate
+        ))
+
+        log.complete()
+
+    return [done[rule.rule_id] if rule.rule_id in done else next(results) for rule in policy.rules]
+
+
+def _run(
+    policy: Policy,
+    context: EngineContext,
+    *,
+    plan: ExecutionPlan | None,
+    workers: int,
+    processes: int,
+    on_result: Callable[[ControlResult], None] | None,
+    gate: _GateRun | None
+) -> list[ControlResult]:
+    if plan is None:
+        plan = compile_plan(policy, root=context.root)
+
+    _prepare(plan, policy.rules, context)
+
+    if workers <= 1 and processes <= 0:
+        results = [None] * len(policy.rules)
+
+        for i in plan.order if gate is not None else range(len(policy.rules)):
+            rule = policy.rules[i]
+
+            if gate is not None and gate.tripped:
+                results[i] = ControlResult.skipped_(rule_id=rule.rule_id, control=rule.control, message=gate.reason)
+            else:
+                results[i] = _execute_rule(rule, context)
+
+                if gate is not None:
+                    gate.record(rule, results[i])
+
+            if on_result is not None:
+                on_result(results[i])
+
+        return results
+
+    return _run_concurrent(
+        policy.rules,
+        context,
+        plan=plan,
+        workers=max(workers, 1),
+        processes=processes,
+        on_result=on_result,
+        gate=gate
+    )
+
+
+def run_policies(
+    policies: list[Policy],
+    *,
+    executor: Executor | None = None,
+    os_info: Any | None = None,
+    workers: int = 1,
+    processes: int = 0,
+    root: str | Path | RootFS | None = None,
+    facts: FactCache | None = None,
+    gate: Gate | None = None
+) -> list[list[ControlResult]]:
+    """
+    Execute overlapping policies as a single batch.
+
+    Rules with the same control and parameters execute once, whatever
+    their identifier and policy, with a fact cache shared by every policy.
+    A deduplicated rule keeps the highest severity and priority of its
+    copies, so gate ordering is unchanged.
+
+    Args:
+        policies (list[Policy]): Validated policies.
+        executor (Executor | None, optional): Execution backend. Defaults to None.
+        os_info (Any | None, optional): OS information. Defaults to None.
+        workers (int, optional): Threads for I/O-bound controls. Defaults to 1.
+        processes (int, optional): Processes for CPU-bound controls. Defaults to 0.
+        root (str | Path | RootFS | None, optional): Root filesystem to audit. Defaults to None.
+        facts (FactCache | None, optional): Fact cache shared with other runs. Defaults to None.
+        gate (Gate | None, optional): Fail fast over the whole batch. Defaults to None.
 
-    results = []
+    Returns:
+        list[list[ControlResult]]: Results of each policy, in policy order.
+    """
+
+    unique = {}
+    rules = []
+    owners = []
+
+    for policy in policies:
+        indexes = []
+
+        for rule in policy.rules:
+            i = unique.setdefault(rule_key(rule), len(rules))
+
+            if i == len(rules):
+                rules.append(rule)
+            else:
+                kept = rules[i]
+                rules[i] = replace(
+                    kept,
+                    severity=min(kept.severity, rule.severity, key=SEVERITIES.index),
+                    priority=max(kept.priority, rule.priority)
+                )
+
+            indexes.append(i)
+
+        owners.append(indexes)
+
+    logger.info(f"Batch of {len(policies)} policies: {sum(map(len, owners))} rules, {len(rules)} unique")
+
+    results = run_policy(
+        Policy(category=", ".join(policy.category for policy in policies), rules=rules),
+        executor=executor,
+        os_info=os_info,
+        workers=workers,
+        processes=processes,
+        root=root,
+        facts=facts,
+        gate=gate
+    )
+
+    # Every policy reports its own rule identifiers
+    return [
+        [replace(results[i], rule_id=rule.rule_id) for rule, i in zip(policy.rules, indexes)]
+        for policy, indexes in zip(policies, owners)
+    ]
+
+
+def _prepare(plan: ExecutionPlan, rules: list[Rule], context: EngineContext) -> None:
+    for batch in plan.batches:
+        if not batch.prepare:
+            continue
+
+        try:
+            registry.spec(batch.control).prepare([rules[i] for i in batch.rules], context)
+        except Exception as exc:
+            # Only an optimization, the rules run unprepared and report their own errors
+            logger.warning(f"Unable to prepare {batch.control} rules: {exc}")
+
+
+def _run_concurrent(
+    rules: list[Rule],
+    context: EngineContext,
+    *,
+    plan: ExecutionPlan,
+    workers: int,
+    processes: int,
+    on_result: Callable[[ControlResult], None] | None = None,
+    gate: _GateRun | None = None
+) -> list[ControlResult]:
+    cpu_bound = [processes > 0 and step.pool == "process" for step in plan.steps]
+
+    # The context is shipped once per worker process, not once per rule
+    process_pool = ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("forkserver"),
+        initializer=_init_worker,
+        initargs=(context,)
+    ) if any(cpu_bound) else nullcontext()
+
+    with ThreadPoolExecutor(max_workers=workers) as thread_pool, process_pool:
+        futures = [None] * len(rules)
+
+        for i in plan.order if gate is not None else range(len(rules)):
+            rule = rules[i]
+
+            if gate is not None and gate.tripped:
+                break
+
+            if cpu_bound[i]:
+                module = registry.get(rule.control).__module__
+                futures[i] = process_pool.submit(_execute_in_worker, rule, module)
+
+                # Ahead of the other callbacks, which only see the result
+                if isinstance(context.executor, MeteredExecutor):
+                    futures[i].add_done_callback(partial(_merge_counts, context.executor))
+            else:
+                futures[i] = thread_pool.submit(_execute_rule, rule, context)
 
-    for rule in policy.rules:
-        results.append(_execute_rule(rule, context))
+            if gate is not None:
+                futures[i].add_done_callback(partial(_check_gate, rule, gate, futures))
+
+            if on_result is not None:
+                futures[i].add_done_callback(partial(_notify, rule, on_result, gate))
+
+    results = [_collect(rule, future, gate) for rule, future in zip(rules, futures)]
+
+    if on_result is not None:
+        # Rules never submitted once the gate tripped
+        for result, future in zip(results, futures):
+            if future is None:
+                on_result(result)
 
     return results
 
 
+def _check_gate(rule: Rule, gate: _GateRun, futures: list[Future | None], future: Future) -> None:
+    if future.cancelled() or not gate.record(rule, _collect(rule, future, gate)):
+        return
+
+    # Rules already running complete, pending ones are skipped
+    for pending in futures:
+        if pending is not None:
+            pending.cancel()
+
+
+def _notify(
+    rule: Rule,
+    on_result: Callable[[ControlResult], None],
+    gate: _GateRun | None,
+    future: Future
+) -> None:
+    on_result(_collect(rule, future, gate))
+
+
+def _merge_counts(executor: MeteredExecutor, future: Future) -> None:
+    if future.cancelled() or future.exception() is not None:
+        return
+
+    _, counts = future.result()
+
+    if counts is not None:
+        executor.merge(*counts)
+
+
+def _collect(rule: Rule, future: Future | None, gate: _GateRun | None = None) -> ControlResult:
+    if future is None or future.cancelled():
+        return ControlResult.skipped_(rule_id=rule.rule_id, control=rule.control, message=gate.reason)
+
+    try:
+        result = future.result()
+
+        # Results of worker processes come with their command counts
+        return result[0] if isinstance(result, tuple) else result
+
+    except Exception as exc:
+        return ControlResult.error_(
+            rule_id=rule.rule_id,
+            control=rule.control,
+            message=str(exc).capitalize() or "Worker process failed"
+        )
+
+
+_worker_context = None
+
+
+def _init_worker(context: EngineContext) -> None:
+    global _worker_context
+    _worker_context = context
+
+
+def _execute_in_worker(rule: Rule, module: str) -> tuple[ControlResult, tuple[dict[str, int], int] | None]:
+    # Registers the control in a freshly started worker
+    importlib.import_module(module)
+
+    result = _execute_rule(rule, _worker_context)
+    executor = _worker_context.executor
+
+    return result, executor.drain() if isinstance(executor, MeteredExecutor) else None
+
+
 def _execute_rule(rule: Rule, context: EngineContext) -> ControlResult:
     if not registry.has(rule.control):
         return ControlResult.error_(
@@ -51,19 +490,40 @@ def _execute_rule(rule: Rule, context: EngineContext) -> ControlResult:
         )
 
     f = registry.get(rule.control)
+    start = time.perf_counter()
 
     try:
-        return f(
-            rule_id=rule.rule_id,
-            control=rule.control,
-            params=rule.params,
-            executor=context.executor,
-            os_info=context.os_info
-        )
+        with span(rule.rule_id, "rule", control=rule.control):
+            result = f(
+                rule_id=rule.rule_id,
+                control=rule.control,
+                params=rule.params,
+                executor=context.executor,
+                os_info=context.os_info,
+                context=context
+            )
+
+        if not isinstance(result, ControlResult):
+            result = ControlResult.error_(
+                rule_id=rule.rule_id,
+                control=rule.control,
+                message=f"Control returned {type(result).__name__} instead of a result"
+            )
 
     except Exception as exc:
-        return ControlResult.error_(
+        result = ControlResult.error_(
             rule_id=rule.rule_id,
             control=rule.control,
             message=str(exc).capitalize()
         )
+
+    result.duration = time.perf_counter() - start
+
+    logger.debug(
+        "Rule %s: %s",
+        rule.rule_id,
+        result.status,
+        extra={"rule_id": rule.rule_id, "control": rule.control, "duration": result.duration}
+    )
+
+    return result
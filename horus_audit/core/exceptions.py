@@ -4,3 +4,7 @@ class ExecutorError(RuntimeError):
 
 class PolicyError(Exception):
     pass
+
+
+class ShardError(Exception):
+    pass
@@ -1,9 +1,24 @@
+from collections.abc import Callable
 from dataclasses import dataclass
+import json
 import os
+from pathlib import Path
+import select
 import shutil
 import subprocess
+import sys
+import threading
+import time
+from typing import Any
+import weakref
 
+from horus_audit.config import get_logger
+from horus_audit.core import executor_helper
 from horus_audit.core.exceptions import ExecutorError
+from horus_audit.core.tracing import span
+
+
+logger = get_logger(__name__)
 
 
 @dataclass
@@ -23,6 +38,27 @@ class Executor:
         raise NotImplementedError
 
 
+def validate_argv(argv: list[str]) -> None:
+    """
+    Validate a command line before execution.
+
+    Args:
+        argv (list[str]): Command line.
+
+    Raises:
+        ExecutorError: Malformed command line.
+    """
+
+    if not isinstance(argv, list):
+        raise ExecutorError("Command must be a list")
+
+    if len(argv) == 0:
+        raise ExecutorError("argv is empty")
+
+    if not all(isinstance(arg, str) and arg for arg in argv):
+        raise ExecutorError("argv contains empty values")
+
+
 class LocalExecutor(Executor):
     def __init__(
         self,
@@ -30,6 +66,7 @@ class LocalExecutor(Executor):
         allowed_commands: set[str] | None = None
     ) -> None:
         self._allowed_commands = allowed_commands
+        self._resolved = {}
 
     def run(
         self,
@@ -37,36 +74,19 @@ class LocalExecutor(Executor):
         *,
         timeout: int = 10
     ) -> ExecutionResult:
-        if not isinstance(argv, list):
-            raise ExecutorError("Command must be a list")
-
-        if len(argv) == 0:
-            raise ExecutorError("argv is empty")
-
-        if not all(isinstance(arg, str) and arg for arg in argv):
-            raise ExecutorError("argv contains empty values")
-
-        executable = os.path.basename(argv[0])
-
-        if self._allowed_commands is not None and executable not in self._allowed_commands:
-            raise ExecutorError(f"Command not allowed: {executable}")
-
-        if not os.path.isabs(argv[0]):
-            exe_path = shutil.which(argv[0])
-
-            if not exe_path:
-                raise ExecutorError(f"Command not found: {argv[0]}")
-
-            argv[0] = exe_path
+        argv = self._prepare(argv)
+        # Lazy formatting, rate limited per call site when logging is set up
+        logger.debug("Running %s", argv[0])
 
         try:
-            process = subprocess.run(
-                argv,
-                shell=False,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
+            with span(argv[0], "command"):
+                process = subprocess.run(
+                    argv,
+                    shell=False,
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout
+                )
 
         except subprocess.TimeoutExpired as exc:
             return ExecutionResult(
@@ -92,3 +112,221 @@ class LocalExecutor(Executor):
     ) -> ExecutionResult:
         argv = [executable, *args]
         return self.run(argv, timeout=timeout)
+
+    def _prepare(self, argv: list[str]) -> list[str]:
+        validate_argv(argv)
+
+        # Resolved executables already passed the allow-list check
+        exe_path = self._resolved.get(argv[0])
+
+        if exe_path is None:
+            exe_path = self._resolve(argv[0])
+            self._resolved[argv[0]] = exe_path
+
+        return [exe_path, *argv[1:]]
+
+    def _resolve(self, command: str) -> str:
+        executable = os.path.basename(command)
+
+        if self._allowed_commands is not None and executable not in self._allowed_commands:
+            raise ExecutorError(f"Command not allowed: {executable}")
+
+        if os.path.isabs(command):
+            return command
+
+        exe_path = shutil.which(command)
+
+        if not exe_path:
+            raise ExecutorError(f"Command not found: {command}")
+
+        return exe_path
+
+
+class _Helper:
+    def __init__(self) -> None:
+        self._process = subprocess.Popen(
+            [sys.executable, "-I", str(Path(executor_helper.__file__))],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            close_fds=True
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self._process.poll() is None
+
+    def request(self, payload: dict, *, timeout: float) -> dict:
+        try:
+            self._process.stdin.write(executor_helper.encode_frame(payload))
+            self._process.stdin.flush()
+        except OSError as exc:
+            raise ExecutorError(f"Helper process unavailable: {exc}") from exc
+
+        deadline = time.monotonic() + timeout
+        header = self._read(executor_helper.HEADER.size, deadline)
+        (size,) = executor_helper.HEADER.unpack(header)
+
+        return json.loads(self._read(size, deadline).decode("utf-8"))
+
+    def close(self) -> None:
+        if self.alive:
+            self._process.kill()
+
+        self._process.wait()
+
+        for stream in (self._process.stdin, self._process.stdout):
+            stream.close()
+
+    def _read(self, size: int, deadline: float) -> bytes:
+        fd = self._process.stdout.fileno()
+        chunks = []
+
+        while size > 0:
+            ready, _, _ = select.select([fd], [], [], max(0.0, deadline - time.monotonic()))
+
+            if not ready:
+                raise TimeoutError("Helper process did not respond")
+
+            chunk = os.read(fd, size)
+
+            if not chunk:
+                raise ExecutorError("Helper process exited unexpectedly")
+
+            chunks.append(chunk)
+            size -= len(chunk)
+
+        return b"".join(chunks)
+
+
+_pools = weakref.WeakSet()
+
+
+class ProcessPool:
+    def __init__(self, factory: Callable[[], Any], size: int) -> None:
+        if size < 1:
+            raise ExecutorError("pool_size has to be positive")
+
+        self._factory = factory
+        self._size = size
+        self._reset()
+
+        _pools.add(self)
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"factory": self._factory, "size": self._size}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["factory"], state["size"])
+
+    def _reset(self) -> None:
+        # Processes are owned by the parent, a forked child starts empty
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self._size)
+
+    def acquire(self) -> Any:
+        self._slots.acquire()
+
+        try:
+            with self._lock:
+                while self._idle:
+                    process = self._idle.pop()
+
+                    if process.alive:
+                        return process
+
+                    process.close()
+
+            return self._factory()
+
+        except Exception as exc:
+            self._slots.release()
+            raise ExecutorError(f"Unable to start process: {exc}") from exc
+
+    def release(self, process: Any) -> None:
+        if process.alive:
+            with self._lock:
+                self._idle.append(process)
+
+        self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+
+        for process in idle:
+            process.close()
+
+
+def _reset_pools_after_fork() -> None:
+    for pool in list(_pools):
+        pool._reset()
+
+
+os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+class PersistentExecutor(LocalExecutor):
+    def __init__(
+        self,
+        *,
+        allowed_commands: set[str] | None = None,
+        pool_size: int = 1,
+        grace: float = 5.0
+    ) -> None:
+        super().__init__(allowed_commands=allowed_commands)
+
+        self._grace = grace
+        self._pool = ProcessPool(_Helper, pool_size)
+
+    def run(
+        self,
+        argv: list[str],
+        *,
+        timeout: int = 10
+    ) -> ExecutionResult:
+        argv = self._prepare(argv)
+        logger.debug("Running %s", argv[0])
+        helper = self._pool.acquire()
+
+        try:
+            with span(argv[0], "command"):
+                response = helper.request(
+                    {"argv": argv, "timeout": timeout},
+                    timeout=timeout + self._grace
+                )
+
+        except TimeoutError:
+            helper.close()
+
+            return ExecutionResult(
+                stdout="",
+                stderr=f"Command '{argv}' timed out after {timeout} seconds",
+                code=124
+            )
+
+        except Exception as exc:
+            helper.close()
+            raise ExecutorError(f"Execution failed: {exc}") from exc
+
+        finally:
+            self._pool.release(helper)
+
+        if "error" in response:
+            raise ExecutorError(f"Execution failed: {response['error']}")
+
+        return ExecutionResult(
+            stdout=response["stdout"],
+            stderr=response["stderr"],
+            code=response["code"]
+        )
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def __enter__(self) -> "PersistentExecutor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,94 @@
+import json
+import struct
+import subprocess
+import sys
+
+
+# Frame header: payload length as a 4-byte big-endian integer
+HEADER = struct.Struct(">I")
+
+
+def read_frame(stream) -> dict | None:
+    """
+    Read a single frame.
+
+    Args:
+        stream: Binary input stream.
+
+    Returns:
+        dict | None: Decoded payload, None on end of stream.
+    """
+
+    header = stream.read(HEADER.size)
+
+    if len(header) < HEADER.size:
+        return None
+
+    (size,) = HEADER.unpack(header)
+    body = stream.read(size)
+
+    if len(body) < size:
+        return None
+
+    return json.loads(body.decode("utf-8"))
+
+
+def encode_frame(payload: dict) -> bytes:
+    """
+    Encode a single frame.
+
+    Args:
+        payload (dict): JSON payload.
+
+    Returns:
+        bytes: Framed payload.
+    """
+
+    body = json.dumps(payload).encode("utf-8")
+    return HEADER.pack(len(body)) + body
+
+
+def _handle(request: dict) -> dict:
+    try:
+        process = subprocess.run(
+            request["argv"],
+            shell=False,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+            timeout=request["timeout"]
+        )
+
+    except subprocess.TimeoutExpired as exc:
+        return {
+            "stdout": "",
+            "stderr": str(exc).capitalize().rstrip("\n"),
+            "code": 124
+        }
+
+    except Exception as exc:
+        return {"error": str(exc)}
+
+    return {
+        "stdout": (process.stdout or "").rstrip("\n"),
+        "stderr": (process.stderr or "").rstrip("\n"),
+        "code": process.returncode
+    }
+
+
+def main() -> None:
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+
+    while True:
+        request = read_frame(stdin)
+
+        if request is None:
+            return
+
+        stdout.write(encode_frame(_handle(request)))
+        stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
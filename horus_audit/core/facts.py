@@ -0,0 +1,71 @@
+from collections.abc import Callable
+import threading
+from typing import Any, TypeVar
+
+from horus_audit.core.tracing import span
+
+
+T = TypeVar("T")
+
+
+class FactCache:
+    def __init__(self) -> None:
+        self._facts = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Worker processes receive a read-only snapshot of collected facts
+        with self._lock:
+            return {"facts": dict(self._facts)}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__()
+        self._facts = state["facts"]
+
+    def get(self, name: str, collector: Callable[[], T]) -> T:
+        """
+        Return a fact, collecting it on first use.
+
+        Concurrent callers asking for the same fact wait for a single
+        collection. Failed collections are not cached.
+
+        Args:
+            name (str): Fact name.
+            collector (Callable[[], T]): Fact collector.
+
+        Returns:
+            T: Fact value.
+        """
+
+        # Counters are updated by concurrent rule threads
+        with self._lock:
+            if name in self._facts:
+                self.hits += 1
+                return self._facts[name]
+
+            lock = self._locks.setdefault(name, threading.Lock())
+
+        # Spans the wait for a concurrent collection too
+        with span(name, "fact"), lock:
+            with self._lock:
+                if name in self._facts:
+                    self.hits += 1
+                    return self._facts[name]
+
+                self.misses += 1
+
+            value = collector()
+            self._facts[name] = value
+
+        return value
+
+    def has(self, name: str) -> bool:
+        return name in self._facts
+
+    def clear(self) -> None:
+        with self._lock:
+            self._facts.clear()
+            self._locks.clear()
@@ -0,0 +1,170 @@
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass
+from pathlib import Path
+
+from horus_audit.config import get_logger
+from horus_audit.core.engine import run_policy
+from horus_audit.core.executor import Executor
+from horus_audit.core.facts import FactCache
+from horus_audit.core.remote import RemoteExecutor, Transport
+from horus_audit.core.result import ControlResult
+from horus_audit.core.rootfs import RootFS
+from horus_audit.core.rule import Policy
+
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class HostAudit:
+    host: str
+    results: list[ControlResult]
+    error: str | None = None
+
+
+@dataclass
+class RootAudit:
+    root: RootFS
+    results: list[ControlResult]
+
+
+def run_fleet(
+    policy: Policy,
+    transports: Iterable[Transport],
+    *,
+    max_connections: int = 16,
+    channels: int = 1,
+    allowed_commands: set[str] | None = None,
+    executor_factory: Callable[[Transport], Executor] | None = None
+) -> Iterator[HostAudit]:
+    """
+    Audit many hosts concurrently.
+
+    At most max_connections hosts are connected at any time and each host
+    reuses its persistent channels for every command of the policy. Audits
+    are yielded as soon as each host completes.
+
+    Args:
+        policy (Policy): Validated policy.
+        transports (Iterable[Transport]): One transport per host.
+        max_connections (int, optional): Concurrently audited hosts. Defaults to 16.
+        channels (int, optional): Persistent channels per host. Defaults to 1.
+        allowed_commands (set[str] | None, optional): Command allow-list. Defaults to None.
+        executor_factory (Callable[[Transport], Executor] | None, optional):
+            Executor factory, its executors are connected and closed when they define connect and close.
+            Defaults to None.
+
+    Yields:
+        HostAudit: Per-host results, in completion order.
+    """
+
+    if max_connections < 1:
+        raise ValueError("max_connections has to be positive")
+
+    def factory(transport: Transport) -> Executor:
+        if executor_factory is not None:
+            return executor_factory(transport)
+
+        return RemoteExecutor(
+            transport,
+            allowed_commands=allowed_commands,
+            channels=channels
+        )
+
+    pending = iter(transports)
+    running: set[Future] = set()
+
+    with ThreadPoolExecutor(max_workers=max_connections) as pool:
+        # Submit lazily so very large fleets are never fully materialized
+        for transport in pending:
+            running.add(pool.submit(_audit_host, policy, transport, factory))
+
+            if len(running) >= max_connections:
+                break
+
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                yield future.result()
+
+                transport = next(pending, None)
+
+                if transport is not None:
+                    running.add(pool.submit(_audit_host, policy, transport, factory))
+
+
+def _audit_host(
+    policy: Policy,
+    transport: Transport,
+    factory: Callable[[Transport], Executor]
+) -> HostAudit:
+    try:
+        executor = factory(transport)
+
+        try:
+            # An unreachable host fails once, not once per rule
+            if hasattr(executor, "connect"):
+                executor.connect()
+
+            results = run_policy(policy, executor=executor)
+
+        finally:
+            if hasattr(executor, "close"):
+                executor.close()
+
+    except Exception as exc:
+        logger.error(f"Audit failed on {transport.host}: {exc}")
+
+        return HostAudit(host=transport.host, results=[], error=str(exc))
+
+    return HostAudit(host=transport.host, results=results)
+
+
+def audit_roots(
+    policy: Policy,
+    roots: Iterable[str | Path | RootFS],
+    *,
+    workers: int = 4,
+    executor: Executor | None = None,
+    facts: dict[RootFS, FactCache] | None = None
+) -> Iterator[RootAudit]:
+    """
+    Audit offline root filesystems concurrently.
+
+    Each root gets its own fact cache. Passing the same facts mapping to
+    later calls reuses the facts already collected for a root.
+
+    Args:
+        policy (Policy): Validated policy.
+        roots (Iterable[str | Path | RootFS]): Mounted images, container rootfs or chroots.
+        workers (int, optional): Concurrently audited roots. Defaults to 4.
+        executor (Executor | None, optional): Execution backend. Defaults to None.
+        facts (dict[RootFS, FactCache] | None, optional): Per-root fact caches. Defaults to None.
+
+    Yields:
+        RootAudit: Per-root results, in completion order.
+    """
+
+    caches = facts if facts is not None else {}
+    targets = [root if isinstance(root, RootFS) else RootFS(root) for root in roots]
+
+    for target in targets:
+        caches.setdefault(target, FactCache())
+
+    def audit(target: RootFS) -> RootAudit:
+        results = run_policy(
+            policy,
+            executor=executor,
+            root=target,
+            facts=caches[target]
+        )
+
+        return RootAudit(root=target, results=results)
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        futures = [pool.submit(audit, target) for target in targets]
+
+        for future in as_completed(futures):
+            yield future.result()
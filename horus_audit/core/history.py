@@ -0,0 +1,319 @@
+import atexit
+from collections.abc import Iterable
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+import queue
+import sqlite3
+import threading
+import time
+
+from horus_audit.config import get_logger
+from horus_audit.core.result import ControlResult
+
+
+logger = get_logger(__name__)
+
+HISTORY_DB = Path.home() / ".horus" / "history.db"
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS runs (
+        run_id INTEGER PRIMARY KEY,
+        host TEXT NOT NULL,
+        policy TEXT NOT NULL,
+        started_at REAL NOT NULL
+    );
+
+    -- Latest runs of a host and policy
+    CREATE INDEX IF NOT EXISTS runs_host_policy ON runs (host, policy, run_id);
+
+    CREATE TABLE IF NOT EXISTS results (
+        run_id INTEGER NOT NULL,
+        rule_id TEXT NOT NULL,
+        status TEXT NOT NULL,
+        message TEXT NOT NULL,
+        duration REAL NOT NULL,
+        timestamp REAL NOT NULL,
+        PRIMARY KEY (run_id, rule_id)
+    ) WITHOUT ROWID;
+
+    -- Covers time window scans, primary key columns included
+    CREATE INDEX IF NOT EXISTS results_timestamp ON results (timestamp, rule_id, status);
+"""
+
+
+@dataclass
+class Change:
+    rule_id: str
+    previous: str | None
+    current: str | None
+    message: str
+
+
+@dataclass
+class Flapping:
+    host: str
+    rule_id: str
+    changes: int
+
+
+class ResultStore:
+    def __init__(
+        self,
+        path: Path = HISTORY_DB,
+        *,
+        batch_size: int = 64
+    ) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with closing(sqlite3.connect(path)) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+
+        self.path = path
+        self._batch_size = batch_size
+        self._queue = queue.Queue()
+        self._error = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._writer = threading.Thread(target=self._write, name="horus-history", daemon=True)
+        self._writer.start()
+
+        # Queued runs are written even when the store is never closed
+        atexit.register(self.close)
+
+    def record(
+        self,
+        *,
+        host: str,
+        policy: str,
+        results: Iterable[ControlResult],
+        started_at: float | None = None
+    ) -> None:
+        """
+        Queue the results of a run for writing.
+
+        Runs are written by a background thread, several queued runs
+        sharing a single transaction, so recording never waits on disk.
+
+        Args:
+            host (str): Audited host.
+            policy (str): Policy category.
+            results (Iterable[ControlResult]): Run results.
+            started_at (float | None, optional): Run start, as epoch seconds. Defaults to now.
+
+        Raises:
+            ValueError: The store is closed.
+        """
+
+        run = (host, policy, started_at or time.time(), list(results))
+
+        # Never queued behind the writer's stop marker
+        with self._lock:
+            if self._closed:
+                raise ValueError("Result store is closed")
+
+            self._queue.put(run)
+
+    def flush(self) -> None:
+        """
+        Wait until every queued run is written.
+
+        Raises:
+            ValueError: The store is closed, its writer is gone.
+            sqlite3.Error: A queued run could not be written.
+        """
+
+        if self._closed:
+            raise ValueError("Result store is closed")
+
+        self._queue.join()
+
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self) -> None:
+        atexit.unregister(self.close)
+
+        with self._lock:
+            if self._closed:
+                return
+
+            self._closed = True
+            self._queue.put(None)
+
+        self._writer.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _write(self) -> None:
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA synchronous=NORMAL")
+
+        try:
+            while True:
+                batch = [self._queue.get()]
+
+                # Runs queued meanwhile share the transaction
+                while len(batch) < self._batch_size and batch[-1] is not None:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                try:
+                    with connection:
+                        for run in batch:
+                            if run is not None:
+                                self._insert(connection, *run)
+
+                except sqlite3.Error as exc:
+                    logger.error("Unable to record %d runs: %s", len(batch), exc)
+                    self._error = exc
+
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+
+                if batch[-1] is None:
+                    return
+
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _insert(
+        connection: sqlite3.Connection,
+        host: str,
+        policy: str,
+        started_at: float,
+        results: list[ControlResult]
+    ) -> None:
+        run_id = connection.execute(
+            "INSERT INTO runs (host, policy, started_at) VALUES (?, ?, ?)",
+            (host, policy, started_at)
+        ).lastrowid
+
+        connection.executemany(
+            "INSERT OR REPLACE INTO results "
+            "(run_id, rule_id, status, message, duration, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (run_id, result.rule_id, result.status, result.message, result.duration, started_at)
+                for result in results
+            )
+        )
+
+    def _query(self, sql: str, parameters: tuple) -> list[tuple]:
+        # Every queued run was written on closing
+        if not self._closed:
+            self.flush()
+
+        with closing(sqlite3.connect(self.path)) as connection:
+            return connection.execute(sql, parameters).fetchall()
+
+    def changes(self, *, host: str, policy: str) -> list[Change]:
+        """
+        Compare the last run of a host and policy with the previous one.
+
+        Args:
+            host (str): Audited host.
+            policy (str): Policy category.
+
+        Returns:
+            list[Change]: Rules whose status changed, appeared or disappeared.
+        """
+
+        runs = self._query(
+            "SELECT run_id FROM runs WHERE host = ? AND policy = ? ORDER BY run_id DESC LIMIT 2",
+            (host, policy)
+        )
+
+        if not runs:
+            return []
+
+        current = runs[0][0]
+        previous = runs[1][0] if len(runs) > 1 else -1
+
+        rows = self._query(
+            """
+            SELECT c.rule_id, p.status, c.status, c.message
+            FROM results c LEFT JOIN results p ON p.run_id = ? AND p.rule_id = c.rule_id
+            WHERE c.run_id = ? AND (p.status IS NULL OR p.status != c.status)
+            UNION ALL
+            SELECT p.rule_id, p.status, NULL, ''
+            FROM results p LEFT JOIN results c ON c.run_id = ? AND c.rule_id = p.rule_id
+            WHERE p.run_id = ? AND c.rule_id IS NULL
+            ORDER BY 1
+            """,
+            (previous, current, current, previous)
+        )
+
+        return [Change(*row) for row in rows]
+
+    def flapping(
+        self,
+        *,
+        days: float = 30,
+        min_changes: int = 3,
+        host: str | None = None
+    ) -> list[Flapping]:
+        """
+        Find rules whose status keeps changing between runs.
+
+        Args:
+            days (float, optional): Time window. Defaults to 30.
+            min_changes (int, optional): Status changes to be flapping. Defaults to 3.
+            host (str | None, optional): Only consider this host. Defaults to None.
+
+        Returns:
+            list[Flapping]: Flapping rules, most changes first.
+        """
+
+        rows = self._query(
+            """
+            SELECT host, rule_id, SUM(changed) AS changes FROM (
+                SELECT r.host, s.rule_id,
+                    s.status != LAG(s.status, 1, s.status) OVER (
+                        PARTITION BY r.host, s.rule_id ORDER BY s.run_id
+                    ) AS changed
+                FROM results s JOIN runs r ON r.run_id = s.run_id
+                WHERE s.timestamp >= ? AND (? IS NULL OR r.host = ?)
+            )
+            GROUP BY host, rule_id
+            HAVING changes >= ?
+            ORDER BY changes DESC, host, rule_id
+            """,
+            (time.time() - days * 86400, host, host, min_changes)
+        )
+
+        return [Flapping(*row) for row in rows]
+
+    def pass_rate(self, *, days: float = 30, host: str | None = None) -> dict[str, float]:
+        """
+        Compute the share of passed results of every rule.
+
+        Args:
+            days (float, optional): Time window. Defaults to 30.
+            host (str | None, optional): Only consider this host. Defaults to None.
+
+        Returns:
+            dict[str, float]: Pass rate between 0 and 1, indexed by rule.
+        """
+
+        rows = self._query(
+            """
+            SELECT rule_id, AVG(status = 'PASSED') FROM results
+            WHERE timestamp >= ?
+                AND (? IS NULL OR run_id IN (SELECT run_id FROM runs WHERE host = ?))
+            GROUP BY rule_id
+            ORDER BY rule_id
+            """,
+            (time.time() - days * 86400, host, host)
+        )
+
+        return dict(rows)
@@ -0,0 +1,176 @@
+from collections import Counter
+from dataclasses import asdict
+import json
+import os
+from pathlib import Path
+import tempfile
+import threading
+import time
+
+from horus_audit.config import get_logger
+from horus_audit.core.result import ControlResult
+from horus_audit.core.rule import Policy, policy_hash
+
+
+logger = get_logger(__name__)
+
+JOURNAL_VERSION = 1
+
+
+class Journal:
+    def __init__(
+        self,
+        path: Path,
+        policy: Policy,
+        *,
+        target: str = "",
+        resume: bool = False,
+        batch_size: int = 64,
+        interval: float = 1.0
+    ) -> None:
+        self.path = path
+        self.policy_hash = policy_hash(policy)
+        self.target = target
+        self.completed = {}
+
+        self._batch_size = batch_size
+        self._interval = interval
+        self._pending = 0
+        self._synced_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        end = self._load(policy) if resume and path.exists() else None
+
+        if end is None:
+            self._create(policy)
+        else:
+            # Drops a line torn by the interruption
+            os.truncate(path, end)
+
+        self._file = path.open("ab")
+
+    def record(self, result: ControlResult) -> None:
+        """
+        Append a completed result.
+
+        Results are written at once but only synced to disk every
+        batch_size results or interval seconds, an interruption losing
+        at most those results.
+
+        Args:
+            result (ControlResult): Completed result.
+        """
+
+        line = json.dumps(asdict(result)).encode("utf-8") + b"\n"
+
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self._pending += 1
+
+            if self._pending >= self._batch_size or time.monotonic() - self._synced_at >= self._interval:
+                self._sync()
+
+    def sync(self) -> None:
+        with self._lock:
+            self._sync()
+
+    def complete(self) -> None:
+        """
+        Mark the run as completed, the journal is no longer resumed.
+        """
+
+        with self._lock:
+            self._file.write(json.dumps({"complete": True}).encode("utf-8") + b"\n")
+            self._file.flush()
+            self._pending += 1
+            self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _sync(self) -> None:
+        if self._pending:
+            os.fdatasync(self._file.fileno())
+
+        self._pending = 0
+        self._synced_at = time.monotonic()
+
+    def _load(self, policy: Policy) -> int | None:
+        # Duplicated identifiers cannot be told apart, they always execute again
+        counts = Counter(rule.rule_id for rule in policy.rules)
+        end = 0
+
+        with self.path.open("rb") as f:
+            try:
+                header = json.loads(f.readline())
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                header = None
+
+            if not isinstance(header, dict) or header.get("version") != JOURNAL_VERSION:
+                logger.warning(f"Invalid journal, starting over: {self.path}")
+                return None
+
+            if header.get("policy_hash") != self.policy_hash or header.get("target") != self.target:
+                logger.info(f"Journal of another policy or target, starting over: {self.path}")
+                return None
+
+            end = f.tell()
+
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("Incomplete line")
+
+                    entry = json.loads(line)
+
+                    if entry.get("complete"):
+                        logger.info(f"Journal of a completed run, starting over: {self.path}")
+                        self.completed = {}
+                        return None
+
+                    result = ControlResult(**entry)
+                except (ValueError, TypeError, AttributeError):
+                    logger.warning(f"Journal truncated after {len(self.completed)} results: {self.path}")
+                    break
+
+                if counts[result.rule_id] == 1:
+                    self.completed[result.rule_id] = result
+
+                end += len(line)
+
+        return end
+
+    def _create(self, policy: Policy) -> None:
+        header = {
+            "version": JOURNAL_VERSION,
+            "category": policy.category,
+            "policy_hash": self.policy_hash,
+            "target": self.target,
+            "rules": len(policy.rules)
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile("wb", dir=self.path.parent, delete=False) as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(f.name, self.path)
+
+        # Persists the new directory entry
+        directory = os.open(self.path.parent, os.O_RDONLY)
+
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
@@ -0,0 +1,342 @@
+from bisect import bisect_left
+from collections import Counter
+from contextlib import suppress
+from dataclasses import dataclass, field
+import os
+from pathlib import Path
+import resource
+import tempfile
+import threading
+import time
+from typing import Any
+
+from horus_audit.core.executor import ExecutionResult, Executor
+from horus_audit.core.result import STATUSES, ControlResult
+
+
+# Upper bounds of the control latency histogram, in seconds
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Exit code of timed out commands, as timeout(1)
+TIMEOUT_CODE = 124
+
+
+class MeteredExecutor(Executor):
+    def __init__(self, backend: Executor) -> None:
+        self.backend = backend
+        self.commands = Counter()
+        self.timeouts = 0
+
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        argv: list[str],
+        *,
+        timeout: int = 10
+    ) -> ExecutionResult:
+        result = self.backend.run(argv, timeout=timeout)
+
+        with self._lock:
+            self.commands[os.path.basename(argv[0])] += 1
+
+            if result.code == TIMEOUT_CODE:
+                self.timeouts += 1
+
+        return result
+
+    def run_text(
+        self,
+        executable: str,
+        *args: str,
+        timeout: int = 10
+    ) -> ExecutionResult:
+        # Counted as run, the backend's run_text would bypass the counters
+        return self.run([executable, *args], timeout=timeout)
+
+    def drain(self) -> tuple[dict[str, int], int]:
+        """
+        Take the counts recorded so far, resetting them.
+
+        Returns:
+            tuple[dict[str, int], int]: Commands by executable and timeouts.
+        """
+
+        with self._lock:
+            commands, timeouts = dict(self.commands), self.timeouts
+            self.commands.clear()
+            self.timeouts = 0
+
+        return commands, timeouts
+
+    def merge(self, commands: dict[str, int], timeouts: int) -> None:
+        with self._lock:
+            self.commands.update(commands)
+            self.timeouts += timeouts
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Worker processes start from zero and send their counts back with each result
+        return {"backend": self.backend}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["backend"])
+
+    def __getattr__(self, name: str) -> Any:
+        # Private and special names are looked up before backend is set when unpickling
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        # close, host and any other backend specific attribute, never a command
+        return getattr(self.backend, name)
+
+
+class CacheCounter:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+
+    def hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+
+# Process-wide caches, exported with every run
+_caches = {}
+
+
+def register_cache(name: str, cache: Any) -> None:
+    """
+    Export the hits and misses of a process-wide cache with run metrics.
+
+    Args:
+        name (str): Cache label.
+        cache (Any): Cache with hits and misses counters.
+    """
+
+    _caches[name] = cache
+
+
+def cache_counts() -> dict[str, tuple[int, int]]:
+    """
+    Snapshot the registered caches, as a baseline of the next run.
+
+    Returns:
+        dict[str, tuple[int, int]]: Hits and misses by cache.
+    """
+
+    return {name: (cache.hits, cache.misses) for name, cache in _caches.items()}
+
+
+@dataclass
+class RunMetrics:
+    policy: str
+    results: list[ControlResult]
+    duration: float
+    timestamp: float = field(default_factory=time.time)
+    commands: dict[str, int] = field(default_factory=dict)
+    timeouts: int = 0
+    caches: dict[str, tuple[int, int]] = field(default_factory=dict)
+    usage: dict[str, resource.struct_rusage] = field(default_factory=dict)
+
+
+def collect_metrics(
+    *,
+    policy: str,
+    results: list[ControlResult],
+    duration: float,
+    executor: Executor | None = None,
+    caches: dict[str, Any] | None = None,
+    baseline: dict[str, tuple[int, int]] | None = None
+) -> RunMetrics:
+    """
+    Gather the metrics of a finished run.
+
+    Args:
+        policy (str): Policy category.
+        results (list[ControlResult]): Run results.
+        duration (float): Run duration in seconds.
+        executor (Executor | None, optional): Backend of the run, counted when a MeteredExecutor. Defaults to None.
+        caches (dict[str, Any] | None, optional): Caches of the run with hits and misses counters, by name,
+            along with every registered cache. Defaults to None.
+        baseline (dict[str, tuple[int, int]] | None, optional): Registered cache counts when the run started,
+            see cache_counts. Defaults to None.
+
+    Returns:
+        RunMetrics: Run metrics, with the resource usage of the process and its children.
+    """
+
+    counts = {}
+
+    for name, cache in {**_caches, **(caches or {})}.items():
+        hits, misses = (baseline or {}).get(name, (0, 0))
+        counts[name] = (cache.hits - hits, cache.misses - misses)
+
+    metrics = RunMetrics(
+        policy=policy,
+        results=results,
+        duration=duration,
+        caches=counts,
+        usage={
+            "self": resource.getrusage(resource.RUSAGE_SELF),
+            "children": resource.getrusage(resource.RUSAGE_CHILDREN)
+        }
+    )
+
+    if isinstance(executor, MeteredExecutor):
+        metrics.commands = dict(executor.commands)
+        metrics.timeouts = executor.timeouts
+
+    return metrics
+
+
+def render_metrics(metrics: RunMetrics) -> str:
+    """
+    Render run metrics in the OpenMetrics text format.
+
+    Every metric describes the last run, so counts are exposed as gauges
+    and the text is also valid for the Prometheus text format parser of
+    the node_exporter textfile collector.
+
+    Args:
+        metrics (RunMetrics): Run metrics.
+
+    Returns:
+        str: Exposition text, ending with "# EOF".
+    """
+
+    policy = {"policy": metrics.policy}
+    lines = []
+
+    def family(name: str, kind: str, help_text: str) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    def sample(name: str, value: float, **labels: str) -> None:
+        lines.append(f"{name}{_labels({**policy, **labels})} {_number(value)}")
+
+    family("horus_audit_last_run_timestamp_seconds", "gauge", "Completion time of the last run.")
+    sample("horus_audit_last_run_timestamp_seconds", metrics.timestamp)
+
+    family("horus_audit_run_duration_seconds", "gauge", "Duration of the last run.")
+    sample("horus_audit_run_duration_seconds", metrics.duration)
+
+    counts = Counter((result.control, result.status) for result in metrics.results)
+    controls = sorted({result.control for result in metrics.results})
+
+    family("horus_audit_results", "gauge", "Results of the last run by control and status.")
+
+    for control in controls:
+        for status in STATUSES:
+            sample("horus_audit_results", counts[control, status], control=control, status=status)
+
+    family("horus_audit_status_results", "gauge", "Results of the last run by status.")
+    totals = Counter(result.status for result in metrics.results)
+
+    for status in STATUSES:
+        sample("horus_audit_status_results", totals[status], status=status)
+
+    family("horus_audit_control_duration_seconds", "histogram", "Rule execution time by control.")
+
+    for control in controls:
+        durations = [result.duration for result in metrics.results if result.control == control]
+        buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+        for duration in durations:
+            buckets[bisect_left(LATENCY_BUCKETS, duration)] += 1
+
+        cumulative = 0
+
+        for bound, count in zip([*map(_number, LATENCY_BUCKETS), "+Inf"], buckets):
+            cumulative += count
+            sample("horus_audit_control_duration_seconds_bucket", cumulative, control=control, le=bound)
+
+        sample("horus_audit_control_duration_seconds_sum", sum(durations), control=control)
+        sample("horus_audit_control_duration_seconds_count", len(durations), control=control)
+
+    family("horus_audit_commands", "gauge", "Commands executed during the last run by executable.")
+
+    for command, count in sorted(metrics.commands.items()):
+        sample("horus_audit_commands", count, command=command)
+
+    family("horus_audit_command_timeouts", "gauge", "Commands timed out during the last run.")
+    sample("horus_audit_command_timeouts", metrics.timeouts)
+
+    caches = sorted(metrics.caches.items())
+
+    family("horus_audit_cache_hits", "gauge", "Cache hits by cache.")
+
+    for name, (hits, _) in caches:
+        sample("horus_audit_cache_hits", hits, cache=name)
+
+    family("horus_audit_cache_misses", "gauge", "Cache misses by cache.")
+
+    for name, (_, misses) in caches:
+        sample("horus_audit_cache_misses", misses, cache=name)
+
+    family("horus_audit_cache_hit_ratio", "gauge", "Ratio of cache lookups served from the cache.")
+
+    for name, (hits, misses) in caches:
+        sample("horus_audit_cache_hit_ratio", hits / (hits + misses) if hits + misses else 0, cache=name)
+
+    family("horus_audit_cpu_seconds", "gauge", "CPU time of the audit process and of its waited for children.")
+
+    for process, usage in metrics.usage.items():
+        sample("horus_audit_cpu_seconds", usage.ru_utime, process=process, mode="user")
+        sample("horus_audit_cpu_seconds", usage.ru_stime, process=process, mode="system")
+
+    family("horus_audit_max_rss_bytes", "gauge", "Peak resident set size, of the largest child for children.")
+
+    for process, usage in metrics.usage.items():
+        # Kilobytes on Linux
+        sample("horus_audit_max_rss_bytes", usage.ru_maxrss * 1024, process=process)
+
+    lines.append("# EOF")
+
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path: Path, metrics: RunMetrics) -> None:
+    """
+    Atomically write run metrics to a textfile, as read by node_exporter.
+
+    Args:
+        path (Path): Textfile, ending with .prom for node_exporter.
+        metrics (RunMetrics): Run metrics.
+    """
+
+    text = render_metrics(metrics)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    f = tempfile.NamedTemporaryFile("w", dir=path.parent, suffix=".tmp", delete=False, encoding="utf-8")
+
+    try:
+        with f:
+            f.write(text)
+
+        # Readable by the exporter user
+        os.chmod(f.name, 0o644)
+        os.replace(f.name, path)
+
+    except BaseException:
+        # No partial file left in the textfile directory
+        with suppress(FileNotFoundError):
+            os.unlink(f.name)
+
+        raise
+
+
+def _labels(labels: dict[str, str]) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
@@ -1,5 +1,8 @@
-from dataclasses import dataclass
+import json
+import os
+from pathlib import Path
 import platform
+import tempfile
 
 import distro
 
@@ -8,27 +11,107 @@ from horus_audit.config import get_logger
 
 logger = get_logger(__name__)
 
+OS_CACHE = Path.home() / ".horus" / "os_info.json"
+OS_RELEASE = "/etc/os-release"
+BOOT_ID = "/proc/sys/kernel/random/boot_id"
+
+# Fields read from release files, cached on disk
+DISTRO_FIELDS = ("distro_id", "name", "version", "major_version", "family")
+# Fields read from a single uname call
+UNAME_FIELDS = ("kernel_version", "architecture", "hostname")
+
 
-@dataclass
 class OSInfo:
-    distro_id: str
-    name: str
-    version: str
-    major_version: str
-    family: str
-    kernel_version: str
-    architecture: str
-    hostname: str
+    def __init__(self, *, cache_path: Path | None = None, **fields: str) -> None:
+        unknown = fields.keys() - set(DISTRO_FIELDS + UNAME_FIELDS)
+
+        if unknown:
+            raise TypeError(f"Unknown OS information: {', '.join(sorted(unknown))}")
+
+        self._cache_path = cache_path
+        self.__dict__.update(fields)
+
+    def __getattr__(self, name: str) -> str:
+        # Only called for fields not resolved yet
+        if name in DISTRO_FIELDS:
+            self.__dict__.update(_distro_fields(self._cache_path))
+        elif name in UNAME_FIELDS:
+            self.__dict__.update(_uname_fields())
+        else:
+            raise AttributeError(name)
+
+        return self.__dict__[name]
+
+    def resolve(self) -> "OSInfo":
+        for name in DISTRO_FIELDS[:1] + UNAME_FIELDS[:1]:
+            getattr(self, name)
+
+        return self
+
+    def as_dict(self) -> dict[str, str]:
+        return {name: getattr(self, name) for name in DISTRO_FIELDS + UNAME_FIELDS}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, OSInfo):
+            return NotImplemented
+
+        return self.as_dict() == other.as_dict()
+
+    def __repr__(self) -> str:
+        resolved = ", ".join(
+            f"{name}={self.__dict__[name]!r}"
+            for name in DISTRO_FIELDS + UNAME_FIELDS
+            if name in self.__dict__
+        )
 
+        return f"OSInfo({resolved})"
 
-def detect_os() -> OSInfo:
+
+def detect_os(*, cache_path: Path | None = None) -> OSInfo:
     """
     Detect the running Linux distribution.
 
+    Fields are resolved on first access. Distribution fields are read
+    together, from cache_path when it was written since the last boot and
+    the last change of /etc/os-release.
+
+    Args:
+        cache_path (Path | None, optional): On-disk cache, see OS_CACHE. Defaults to None.
+
     Returns:
         OSInfo: OS information.
     """
 
+    return OSInfo(cache_path=cache_path)
+
+
+def _cache_key() -> list:
+    try:
+        mtime = os.stat(OS_RELEASE).st_mtime_ns
+    except OSError:
+        mtime = None
+
+    try:
+        boot_id = Path(BOOT_ID).read_text(encoding="utf-8").strip()
+    except OSError:
+        boot_id = None
+
+    return [mtime, boot_id]
+
+
+def _distro_fields(cache_path: Path | None) -> dict[str, str]:
+    key = _cache_key() if cache_path is not None else None
+
+    if cache_path is not None:
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+
+            if cached["key"] == key:
+                return cached["fields"]
+
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
     # Distribution information
     distro_id = distro.id().lower().strip()
     name = distro.name().strip()
@@ -44,13 +127,6 @@ def detect_os() -> OSInfo:
     else:
         family = like.split()[0]
 
-    uname = platform.uname()
-    # Hardware information
-    kernel_version = uname.release
-    architecture = uname.machine
-    # Hostname
-    hostname = uname.node
-
     logger.info(
         "Detected OS: "
         f"distro_id={distro_id}, "
@@ -58,6 +134,38 @@ def detect_os() -> OSInfo:
         f"version={version}, "
         f"family={family}"
     )
+
+    fields = {
+        "distro_id": distro_id,
+        "name": name,
+        "version": version,
+        "major_version": major_version,
+        "family": family
+    }
+
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+            with tempfile.NamedTemporaryFile("w", dir=cache_path.parent, delete=False) as f:
+                json.dump({"key": key, "fields": fields}, f)
+
+            os.replace(f.name, cache_path)
+
+        except OSError as exc:
+            logger.warning(f"Unable to cache OS information: {exc}")
+
+    return fields
+
+
+def _uname_fields() -> dict[str, str]:
+    uname = platform.uname()
+    # Hardware information
+    kernel_version = uname.release
+    architecture = uname.machine
+    # Hostname
+    hostname = uname.node
+
     logger.info(
         "Hardware: "
         f"kernel={kernel_version}, "
@@ -65,13 +173,8 @@ def detect_os() -> OSInfo:
     )
     logger.info(f"Hostname: {hostname}")
 
-    return OSInfo(
-        distro_id=distro_id,
-        name=name,
-        version=version,
-        major_version=major_version,
-        family=family,
-        kernel_version=kernel_version,
-        architecture=architecture,
-        hostname=hostname
-    )
+    return {
+        "kernel_version": kernel_version,
+        "architecture": architecture,
+        "hostname": hostname
+    }
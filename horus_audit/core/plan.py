@@ -0,0 +1,245 @@
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from dataclasses import asdict, dataclass, field
+import json
+import os
+from pathlib import Path
+import shlex
+import tempfile
+
+from horus_audit.core.registry import Requirements, registry
+from horus_audit.core.result import ControlResult
+from horus_audit.core.rootfs import RootFS
+from horus_audit.core.rule import Policy, execution_order, policy_hash
+
+
+# Estimated seconds of a rule without measured cost, commands excluded
+DEFAULT_COST = 0.001
+# Estimated seconds of a command
+COMMAND_COST = 0.005
+
+
+@dataclass
+class PlanStep:
+    index: int
+    rule_id: str
+    control: str
+    function: str | None
+    pool: str
+    facts: list[str]
+    commands: list[list[str]]
+    cost: float
+    declared: bool
+
+
+@dataclass
+class PlanBatch:
+    control: str
+    prepare: bool
+    rules: list[int]
+
+
+@dataclass
+class ExecutionPlan:
+    policy_hash: str
+    category: str
+    steps: list[PlanStep]
+    order: list[int]
+    batches: list[PlanBatch]
+    facts: dict[str, list[str] | None] = field(default_factory=dict)
+    commands: list[list[str]] = field(default_factory=list)
+
+    def predicted_commands(self) -> int:
+        per_rule = sum(len(step.commands) for step in self.steps)
+        return per_rule + sum(command is not None for command in self.facts.values())
+
+    def predicted_duration(self, workers: int = 1) -> float:
+        fact_cost = COMMAND_COST * sum(command is not None for command in self.facts.values())
+        total = sum(step.cost for step in self.steps) + fact_cost
+
+        if workers <= 1 or not self.steps:
+            return total
+
+        # Bounded by the slowest rule
+        return max(total / workers, max(step.cost for step in self.steps))
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ExecutionPlan":
+        return cls(
+            policy_hash=data["policy_hash"],
+            category=data["category"],
+            steps=[PlanStep(**step) for step in data["steps"]],
+            order=data["order"],
+            batches=[PlanBatch(**batch) for batch in data["batches"]],
+            facts=data["facts"],
+            commands=data["commands"]
+        )
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile("w", dir=path.parent, delete=False, encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+        os.replace(f.name, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "ExecutionPlan":
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+def compile_plan(
+    policy: Policy,
+    *,
+    root: RootFS | None = None,
+    costs: Mapping[str, float] | None = None
+) -> ExecutionPlan:
+    """
+    Compile a policy into an execution plan, without executing anything.
+
+    Each rule is resolved in the registry and asks its control for the
+    facts and commands it needs. Facts are collected once per run and
+    commands are listed once, duplicates being counted in the prediction.
+
+    Args:
+        policy (Policy): Validated policy.
+        root (RootFS | None, optional): Root filesystem to audit. Defaults to None.
+        costs (Mapping[str, float] | None, optional): Measured seconds by rule_id or control,
+            see control_costs. Defaults to None.
+
+    Returns:
+        ExecutionPlan: Execution plan.
+    """
+
+    root = root or RootFS()
+    costs = costs or {}
+    steps = []
+    batches = {}
+    facts = {}
+    commands = {}
+
+    for i, rule in enumerate(policy.rules):
+        spec = registry.spec(rule.control) if registry.has(rule.control) else None
+        requirements = Requirements()
+
+        if spec is not None and spec.requires is not None:
+            try:
+                requirements = spec.requires(rule.params, root)
+            except (KeyError, ValueError, TypeError, AttributeError):
+                # Invalid parameters, the rule reports them when executed
+                pass
+
+        for fact, command in requirements.facts.items():
+            facts.setdefault(fact, list(command) if command is not None else None)
+
+            if command is not None:
+                commands.setdefault(tuple(command), None)
+
+        for command in requirements.commands:
+            commands.setdefault(tuple(command), None)
+
+        cost = costs.get(rule.rule_id, costs.get(rule.control))
+
+        if cost is None:
+            cost = DEFAULT_COST + COMMAND_COST * len(requirements.commands)
+
+        steps.append(PlanStep(
+            index=i,
+            rule_id=rule.rule_id,
+            control=rule.control,
+            function=f"{spec.function.__module__}.{spec.function.__qualname__}" if spec else None,
+            pool="process" if spec is not None and spec.cpu_bound else "thread",
+            facts=sorted(requirements.facts),
+            commands=[list(command) for command in requirements.commands],
+            cost=float(cost),
+            declared=spec is not None and spec.requires is not None
+        ))
+
+        batch = batches.setdefault(
+            rule.control,
+            PlanBatch(control=rule.control, prepare=spec is not None and spec.prepare is not None, rules=[])
+        )
+        batch.rules.append(i)
+
+    return ExecutionPlan(
+        policy_hash=policy_hash(policy),
+        category=policy.category,
+        steps=steps,
+        order=execution_order(policy.rules),
+        batches=list(batches.values()),
+        facts=facts,
+        commands=[list(command) for command in commands]
+    )
+
+
+def control_costs(results: Iterable[ControlResult]) -> dict[str, float]:
+    """
+    Measure the mean duration of each control in a previous run.
+
+    Args:
+        results (Iterable[ControlResult]): Results of a previous run.
+
+    Returns:
+        dict[str, float]: Mean seconds by control.
+    """
+
+    totals = Counter()
+    counts = Counter()
+
+    for result in results:
+        totals[result.control] += result.duration
+        counts[result.control] += 1
+
+    return {control: totals[control] / counts[control] for control in counts}
+
+
+def explain(plan: ExecutionPlan, *, workers: int = 1) -> str:
+    """
+    Describe an execution plan and its predicted cost.
+
+    Args:
+        plan (ExecutionPlan): Execution plan.
+        workers (int, optional): Threads of the predicted run. Defaults to 1.
+
+    Returns:
+        str: Human readable plan.
+    """
+
+    lines = [f"Plan of {plan.category} ({len(plan.steps)} rules, policy {plan.policy_hash[:12]})", "", "Batches:"]
+
+    for batch in plan.batches:
+        steps = [plan.steps[i] for i in batch.rules]
+        flags = [steps[0].pool]
+
+        if batch.prepare:
+            flags.append("prepared")
+        if steps[0].function is None:
+            flags.append("unknown control")
+        elif not steps[0].declared:
+            flags.append("requirements unknown")
+
+        cost = sum(step.cost for step in steps)
+        lines.append(f"  {batch.control:<32} {len(steps):>6} rules {cost:>9.3f}s  {', '.join(flags)}")
+
+    lines += ["", f"Facts ({len(plan.facts)}):"]
+
+    for fact, command in sorted(plan.facts.items()):
+        lines.append(f"  {fact}" + (f"  <- {shlex.join(command)}" if command is not None else ""))
+
+    runs = Counter(tuple(command) for step in plan.steps for command in step.commands)
+    runs.update(tuple(command) for command in plan.facts.values() if command is not None)
+
+    lines += ["", f"Commands ({plan.predicted_commands()} predicted, {len(plan.commands)} distinct):"]
+
+    for command in sorted(runs, key=lambda command: (-runs[command], command)):
+        lines.append(f"  {runs[command]:>6} x {shlex.join(command)}")
+
+    lines += ["", f"Predicted duration: {plan.predicted_duration():.3f}s sequential"]
+
+    if workers > 1:
+        lines[-1] += f", {plan.predicted_duration(workers):.3f}s with {workers} workers"
+
+    return "\n".join(lines) + "\n"
@@ -1,4 +1,6 @@
 from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
 
 from horus_audit.core.result import ControlResult
 
@@ -6,21 +8,57 @@ from horus_audit.core.result import ControlResult
 ControlFunction = Callable[..., ControlResult]
 
 
+@dataclass(frozen=True)
+class Requirements:
+    # Facts used by a rule, with the command collecting each one if any
+    facts: dict[str, tuple[str, ...] | None] = field(default_factory=dict)
+    # Commands run by the rule itself, on every execution
+    commands: tuple[tuple[str, ...], ...] = ()
+
+
+@dataclass(frozen=True)
+class ControlSpec:
+    name: str
+    function: ControlFunction
+    cpu_bound: bool = False
+    prepare: Callable[..., None] | None = None
+    prefetch: Callable[..., Any] | None = None
+    requires: Callable[..., Requirements] | None = None
+
+
 class ControlRegistry:
     def __init__(self) -> None:
         self._controls = {}
 
-    def register(self, name: str) -> Callable[[ControlFunction], ControlFunction]:
+    def register(
+        self,
+        name: str,
+        *,
+        cpu_bound: bool = False,
+        prepare: Callable[..., None] | None = None,
+        prefetch: Callable[..., Any] | None = None,
+        requires: Callable[..., Requirements] | None = None
+    ) -> Callable[[ControlFunction], ControlFunction]:
         def decorator(f: ControlFunction) -> ControlFunction:
             if name in self._controls:
                 raise ValueError(f"Control registered: {name}")
 
-            self._controls[name] = f
+            self._controls[name] = ControlSpec(
+                name=name,
+                function=f,
+                cpu_bound=cpu_bound,
+                prepare=prepare,
+                prefetch=prefetch,
+                requires=requires
+            )
             return f
 
         return decorator
 
     def get(self, name: str) -> ControlFunction:
+        return self.spec(name).function
+
+    def spec(self, name: str) -> ControlSpec:
         if name not in self._controls:
             raise KeyError(f"Unknown control: {name}")
 
@@ -0,0 +1,271 @@
+from functools import partial
+import os
+from pathlib import Path
+import secrets
+import select
+import shlex
+import subprocess
+import time
+
+from horus_audit.core.exceptions import ExecutorError
+from horus_audit.core.executor import (
+    ExecutionResult,
+    Executor,
+    ProcessPool,
+    validate_argv
+)
+from horus_audit.core.tracing import span
+
+
+class Transport:
+    host: str
+
+    def command(self) -> list[str]:
+        raise NotImplementedError
+
+
+class LocalTransport(Transport):
+    def __init__(
+        self,
+        host: str = "localhost",
+        *,
+        shell: str = "/bin/sh"
+    ) -> None:
+        self.host = host
+        self._shell = shell
+
+    def command(self) -> list[str]:
+        return [self._shell]
+
+
+class SSHTransport(Transport):
+    def __init__(
+        self,
+        host: str,
+        *,
+        user: str | None = None,
+        port: int | None = None,
+        control_dir: Path = Path.home() / ".horus" / "ssh",
+        persist: int = 60,
+        options: dict[str, str] | None = None
+    ) -> None:
+        self.host = host
+        self._user = user
+        self._port = port
+        self._control_dir = control_dir
+        self._persist = persist
+        self._options = options or {}
+
+    def command(self) -> list[str]:
+        self._control_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+        # Every channel to a host shares one master connection
+        options = {
+            "BatchMode": "yes",
+            "ControlMaster": "auto",
+            "ControlPath": str(self._control_dir / "%C"),
+            "ControlPersist": str(self._persist),
+            **self._options
+        }
+
+        argv = ["ssh", "-T"]
+
+        for key, value in options.items():
+            argv += ["-o", f"{key}={value}"]
+
+        if self._user:
+            argv += ["-l", self._user]
+
+        if self._port:
+            argv += ["-p", str(self._port)]
+
+        return [*argv, self.host, "/bin/sh"]
+
+
+class _Channel:
+    def __init__(self, transport: Transport) -> None:
+        self._marker = f"HORUS-{secrets.token_hex(8)}".encode("ascii")
+        self._buffer = b""
+        self._process = subprocess.Popen(
+            transport.command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            close_fds=True
+        )
+
+        self._send(
+            'HORUS_DIR=$(mktemp -d) || exit 1\n'
+            'trap \'rm -rf "$HORUS_DIR"\' EXIT\n'
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self._process.poll() is None
+
+    def request(self, argv: list[str], *, timeout: int, wait: float) -> ExecutionResult:
+        deadline = time.monotonic() + wait
+        command = shlex.join(["timeout", str(timeout), *argv])
+
+        self._send(
+            f'{command} </dev/null >"$HORUS_DIR/out" 2>"$HORUS_DIR/err"; '
+            'rc=$?; '
+            f'printf "%s %s %s %s\\n" {self._marker.decode("ascii")} "$rc" '
+            '"$(wc -c <"$HORUS_DIR/out")" "$(wc -c <"$HORUS_DIR/err")"; '
+            'cat "$HORUS_DIR/out" "$HORUS_DIR/err"\n'
+        )
+
+        while True:
+            line = self._read_line(deadline)
+
+            if line.startswith(self._marker):
+                break
+
+        _, code, out_size, err_size = line.split()
+
+        stdout = self._read(int(out_size), deadline)
+        stderr = self._read(int(err_size), deadline)
+
+        return ExecutionResult(
+            stdout=stdout.decode("utf-8", errors="replace").rstrip("\n"),
+            stderr=stderr.decode("utf-8", errors="replace").rstrip("\n"),
+            code=int(code)
+        )
+
+    def close(self) -> None:
+        if self.alive:
+            try:
+                self._process.stdin.close()
+                self._process.wait(timeout=1)
+            except (OSError, subprocess.TimeoutExpired):
+                self._process.kill()
+
+        self._process.wait()
+
+        for stream in (self._process.stdin, self._process.stdout):
+            stream.close()
+
+    def _send(self, script: str) -> None:
+        try:
+            self._process.stdin.write(script.encode("utf-8"))
+            self._process.stdin.flush()
+        except OSError as exc:
+            raise ExecutorError(f"Channel unavailable: {exc}") from exc
+
+    def _fill(self, deadline: float) -> None:
+        fd = self._process.stdout.fileno()
+        ready, _, _ = select.select([fd], [], [], max(0.0, deadline - time.monotonic()))
+
+        if not ready:
+            raise TimeoutError("Channel did not respond")
+
+        chunk = os.read(fd, 65536)
+
+        if not chunk:
+            raise ExecutorError("Channel closed unexpectedly")
+
+        self._buffer += chunk
+
+    def _read_line(self, deadline: float) -> bytes:
+        while b"\n" not in self._buffer:
+            self._fill(deadline)
+
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line
+
+    def _read(self, size: int, deadline: float) -> bytes:
+        while len(self._buffer) < size:
+            self._fill(deadline)
+
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class RemoteExecutor(Executor):
+    def __init__(
+        self,
+        transport: Transport,
+        *,
+        allowed_commands: set[str] | None = None,
+        channels: int = 1,
+        grace: float = 5.0
+    ) -> None:
+        self._transport = transport
+        self._allowed_commands = allowed_commands
+        self._allowed = set()
+        self._grace = grace
+        self._pool = ProcessPool(partial(_Channel, transport), channels)
+
+    @property
+    def host(self) -> str:
+        return self._transport.host
+
+    def connect(self, *, timeout: int = 10) -> None:
+        """
+        Open a first channel and check the host answers.
+
+        Args:
+            timeout (int, optional): Seconds to wait for the host. Defaults to 10.
+
+        Raises:
+            ExecutorError: The host cannot be reached.
+        """
+
+        channel = self._pool.acquire()
+
+        try:
+            channel.request(["true"], timeout=timeout, wait=timeout + self._grace)
+
+        except Exception as exc:
+            channel.close()
+            raise ExecutorError(f"Unable to connect to {self.host}: {exc}") from exc
+
+        finally:
+            self._pool.release(channel)
+
+    def run(
+        self,
+        argv: list[str],
+        *,
+        timeout: int = 10
+    ) -> ExecutionResult:
+        validate_argv(argv)
+
+        if argv[0] not in self._allowed:
+            executable = os.path.basename(argv[0])
+
+            if self._allowed_commands is not None and executable not in self._allowed_commands:
+                raise ExecutorError(f"Command not allowed: {executable}")
+
+            self._allowed.add(argv[0])
+
+        channel = self._pool.acquire()
+
+        try:
+            with span(argv[0], "command", host=self.host):
+                return channel.request(argv, timeout=timeout, wait=timeout + self._grace)
+
+        except TimeoutError:
+            channel.close()
+
+            return ExecutionResult(
+                stdout="",
+                stderr=f"Command '{argv}' timed out after {timeout} seconds",
+                code=124
+            )
+
+        except Exception as exc:
+            channel.close()
+            raise ExecutorError(f"Execution failed on {self.host}: {exc}") from exc
+
+        finally:
+            self._pool.release(channel)
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def __enter__(self) -> "RemoteExecutor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
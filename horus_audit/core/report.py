@@ -1,11 +1,33 @@
-from dataclasses import dataclass
+from array import array
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
+import json
+import multiprocessing
+import os
+from pathlib import Path
+import tempfile
 from typing import Any
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
 
-from horus_audit.core.result import ControlResult
+from horus_audit.core.result import STATUSES, ControlResult
 from horus_audit.core.rule import Policy
+from horus_audit.core.table import ResultTable
+from horus_audit.core.tracing import span
+
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+# Fields results are grouped by, category being the control prefix
+INDEX_FIELDS = ("status", "control", "category")
+
+# Results per page of the HTML report
+PAGE_SIZE = 1000
 
 
 @dataclass
@@ -15,6 +37,31 @@ class ReportContext:
     results: list[ControlResult]
     summary: dict[str, int]
     os_info: Any | None
+    indexes: dict[str, dict[str, array]] = field(default_factory=dict)
+
+
+def index_results(results: Iterable[ControlResult]) -> dict[str, dict[str, array]]:
+    """
+    Group result positions by status, control and control category.
+
+    Positions are stored as unsigned integer arrays, in result order.
+
+    Args:
+        results (Iterable[ControlResult]): Results.
+
+    Returns:
+        dict[str, dict[str, array]]: Positions by value, by field.
+    """
+
+    indexes = {name: {} for name in INDEX_FIELDS}
+    statuses, controls, categories = (indexes[name] for name in INDEX_FIELDS)
+
+    for i, result in enumerate(results):
+        statuses.setdefault(result.status, array("L")).append(i)
+        controls.setdefault(result.control, array("L")).append(i)
+        categories.setdefault(_category(result.control), array("L")).append(i)
+
+    return indexes
 
 
 def build_report(
@@ -23,23 +70,15 @@ def build_report(
     results: list[ControlResult],
     os_info: Any | None = None
 ) -> ReportContext:
-    summary = {
-        "PASSED": 0,
-        "FAILED": 0,
-        "WARNING": 0,
-        "SKIPPED": 0,
-        "ERROR": 0
-    }
-
-    for result in results:
-        summary[result.status] += 1
+    indexes = index_results(results)
 
     return ReportContext(
         category=policy.category,
         generated_at=datetime.now(timezone.utc).isoformat() + "Z",
         results=results,
-        summary=summary,
-        os_info=os_info
+        summary={status: len(indexes["status"].get(status, ())) for status in STATUSES},
+        os_info=os_info,
+        indexes=indexes
     )
 
 
@@ -54,6 +93,202 @@ def render_report(
         autoescape=select_autoescape(enabled_extensions=()),
         enable_async=False
     )
-    template = env.get_template(template_name)
+    with span("render_report", "report", template=template_name):
+        template = env.get_template(template_name)
+        return template.render(report=context)
+
+
+def write_html_report(
+    results: Iterable[ControlResult] | ResultTable,
+    directory: Path,
+    *,
+    category: str,
+    os_info: Any | None = None,
+    page_size: int = PAGE_SIZE,
+    workers: int = 1,
+    template_dir: str | Path = TEMPLATE_DIR
+) -> Path:
+    """
+    Write a paginated HTML report, with an index for client-side filtering.
+
+    Results are consumed in a single pass: the summary and the page ranges
+    holding each status, control and category, and each host for a result
+    table, are accumulated while pages of page_size results are rendered
+    by worker processes, at most two pages per worker being in flight.
+    Given an iterator or a result table, memory is bounded by the page
+    size and the number of distinct values. The index page only holds the
+    summary and index.json, so it opens at once whatever the number of
+    results.
+
+    Args:
+        results (Iterable[ControlResult] | ResultTable): Results, or fleet results.
+        directory (Path): Output directory.
+        category (str): Policy category.
+        os_info (Any | None, optional): OS information. Defaults to None.
+        page_size (int, optional): Results per page. Defaults to PAGE_SIZE.
+        workers (int, optional): Processes rendering pages, 1 renders them in this process. Defaults to 1.
+        template_dir (str | Path, optional): Directory of index.html.j2 and page.html.j2. Defaults to TEMPLATE_DIR.
+
+    Returns:
+        Path: Index page.
+
+    Raises:
+        ValueError: Invalid page size.
+    """
+
+    if page_size < 1:
+        raise ValueError(f"Invalid page size: {page_size}")
+
+    if isinstance(results, ResultTable):
+        rows = ((host, result.to_result()) for host, result in results.rows())
+    else:
+        rows = ((None, result) for result in results)
+
+    report = {
+        "category": category,
+        "generated_at": datetime.now(timezone.utc).isoformat() + "Z",
+        "os_info": os_info,
+        "summary": dict.fromkeys(STATUSES, 0)
+    }
+    groups = {name: {} for name in INDEX_FIELDS}
+    page = []
+    template_dir = str(template_dir)
+
+    directory.mkdir(parents=True, exist_ok=True)
+
+    with span("write_html_report", "report"), _PageWriter(directory, template_dir, workers, page_size) as writer:
+        for host, result in rows:
+            if len(page) == page_size:
+                # Written once the next page is known to exist
+                writer.write(report, page, last=False)
+                page = []
+
+            number = len(writer.pages) + 1
+            report["summary"][result.status] += 1
+            values = [("status", result.status), ("control", result.control), ("category", _category(result.control))]
+
+            if host is not None:
+                values.append(("host", host))
+
+            for name, value in values:
+                group = groups.setdefault(name, {}).setdefault(value, {"count": 0, "pages": []})
+                group["count"] += 1
+
+                # Consecutive pages as [first, last], a value on every page being a single range
+                if group["pages"] and group["pages"][-1][1] >= number - 1:
+                    group["pages"][-1][1] = number
+                else:
+                    group["pages"].append([number, number])
+
+            page.append((host, result))
+
+        if page:
+            writer.write(report, page, last=True)
+
+    index = {
+        "category": category,
+        "generated_at": report["generated_at"],
+        "total": sum(report["summary"].values()),
+        "page_size": page_size,
+        "summary": report["summary"],
+        "pages": writer.pages,
+        "groups": {name: dict(sorted(values.items())) for name, values in groups.items()}
+    }
+
+    _write_atomic(directory / "index.json", json.dumps(index))
+    _write_atomic(directory / "index.html", _template(template_dir, "index.html.j2").render(report=report, index=index))
+
+    return directory / "index.html"
+
+
+class _PageWriter:
+    def __init__(self, directory: Path, template_dir: str, workers: int, page_size: int) -> None:
+        self.directory = directory
+        self.template_dir = template_dir
+        self.workers = workers
+        self.page_size = page_size
+        self.pages = []
+
+        self._pool = None
+        self._pending = deque()
+
+    def write(self, report: dict[str, Any], rows: list[tuple[str | None, ControlResult]], *, last: bool) -> None:
+        number = len(self.pages) + 1
+        page = {"file": f"page-{number:05d}.html", "first": (number - 1) * self.page_size, "count": len(rows)}
+        values = {
+            "category": report["category"],
+            "generated_at": report["generated_at"],
+            "number": number,
+            "first": page["first"],
+            "rows": rows,
+            "hosts": rows[0][0] is not None,
+            "previous": f"page-{number - 1:05d}.html" if number > 1 else None,
+            "next": f"page-{number + 1:05d}.html" if not last else None
+        }
+        self.pages.append(page)
+
+        # A single page report is rendered without starting workers
+        if self._pool is None and self.workers > 1 and not last:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("forkserver")
+            )
+
+        if self._pool is None:
+            _render_page(self.template_dir, self.directory / page["file"], values)
+            return
+
+        # Bounds the results shipped to the workers and not yet written
+        if len(self._pending) >= 2 * self.workers:
+            self._pending.popleft().result()
+
+        self._pending.append(self._pool.submit(_render_page, self.template_dir, self.directory / page["file"], values))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._pool is None:
+            return
+
+        try:
+            while self._pending:
+                self._pending.popleft().result()
+        finally:
+            self._pool.shutdown(cancel_futures=True)
+
+
+def _render_page(template_dir: str, path: Path, values: dict[str, Any]) -> None:
+    # A page is bounded by the page size, rendering it at once is faster than streaming
+    _write_atomic(path, _template(template_dir, "page.html.j2").render(**values))
+
+
+@lru_cache(maxsize=8)
+def _template(template_dir: str, name: str) -> Template:
+    # Compiled once per process
+    env = Environment(loader=FileSystemLoader(template_dir), autoescape=True, enable_async=False)
+    env.filters["category"] = _category
+
+    return env.get_template(name)
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    f = tempfile.NamedTemporaryFile("w", dir=path.parent, suffix=".tmp", delete=False, encoding="utf-8")
+
+    try:
+        with f:
+            f.write(text)
+
+        # Readable by the web server serving the report
+        os.chmod(f.name, 0o644)
+        os.replace(f.name, path)
+
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(f.name)
+
+        raise
+
 
-    return template.render(report=context)
+def _category(control: str) -> str:
+    return control.split(".", 1)[0]
@@ -1,13 +1,26 @@
 from dataclasses import dataclass
+from enum import IntEnum
 from typing import Literal
 
 
-@dataclass
+STATUSES = ("PASSED", "FAILED", "WARNING", "SKIPPED", "ERROR")
+
+
+class Status(IntEnum):
+    PASSED = 0
+    FAILED = 1
+    WARNING = 2
+    SKIPPED = 3
+    ERROR = 4
+
+
+@dataclass(slots=True)
 class ControlResult:
     rule_id: str
     control: str
     status: Literal["PASSED", "FAILED", "WARNING", "SKIPPED", "ERROR"]
     message: str
+    duration: float = 0.0
 
     @classmethod
     def passed_(cls, *, rule_id: str, control: str, message: str) -> "ControlResult":
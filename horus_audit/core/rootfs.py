@@ -0,0 +1,107 @@
+import errno
+import os
+from pathlib import Path
+
+
+MAX_SYMLINKS = 40
+
+
+class RootFS:
+    def __init__(self, root: str | Path = "/") -> None:
+        self.root = Path(root).resolve()
+
+    def __repr__(self) -> str:
+        return f"RootFS({str(self.root)!r})"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, RootFS) and self.root == other.root
+
+    def __hash__(self) -> int:
+        return hash(self.root)
+
+    @property
+    def is_host(self) -> bool:
+        return self.root == Path("/")
+
+    def path(self, path: str | Path) -> Path:
+        """
+        Map an absolute path of the audited system under the root.
+
+        The mapping is lexical, ".." never escapes the root.
+
+        Args:
+            path (str | Path): Path on the audited system.
+
+        Returns:
+            Path: Path on the local filesystem.
+        """
+
+        parts = []
+
+        for part in str(path).split("/"):
+            if part in ("", "."):
+                continue
+
+            if part == "..":
+                if parts:
+                    parts.pop()
+                continue
+
+            parts.append(part)
+
+        return self.root.joinpath(*parts)
+
+    def resolve(self, path: str | Path) -> Path:
+        """
+        Resolve a path of the audited system, following symlinks as a chroot would.
+
+        Absolute symlink targets are interpreted relative to the root, so
+        links inside an image never point back to the auditing host.
+
+        Args:
+            path (str | Path): Path on the audited system.
+
+        Returns:
+            Path: Path on the local filesystem.
+
+        Raises:
+            OSError: Too many levels of symbolic links.
+        """
+
+        if self.is_host:
+            return Path(path)
+
+        pending = [part for part in str(path).split("/") if part]
+        resolved = []
+        links = 0
+
+        while pending:
+            part = pending.pop(0)
+
+            if part == ".":
+                continue
+
+            if part == "..":
+                if resolved:
+                    resolved.pop()
+                continue
+
+            current = self.root.joinpath(*resolved, part)
+
+            if not current.is_symlink():
+                resolved.append(part)
+                continue
+
+            links += 1
+
+            if links > MAX_SYMLINKS:
+                raise OSError(errno.ELOOP, os.strerror(errno.ELOOP), str(path))
+
+            target = os.readlink(current)
+
+            if target.startswith("/"):
+                resolved = []
+
+            pending = [p for p in target.split("/") if p] + pending
+
+        return self.root.joinpath(*resolved)
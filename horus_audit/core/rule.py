@@ -1,15 +1,79 @@
 from dataclasses import dataclass, field
+import hashlib
+import json
 from typing import Any
 
 
-@dataclass
+# Most severe first
+SEVERITIES = ("critical", "high", "medium", "low", "info")
+
+
+@dataclass(slots=True)
 class Rule:
     rule_id: str
     control: str
     params: dict[str, Any] = field(default_factory=dict)
+    severity: str = "medium"
+    priority: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Policy:
     category: str
     rules: list[Rule]
+
+
+def execution_order(rules: list[Rule]) -> list[int]:
+    """
+    Order rules by severity, then by descending priority.
+
+    Args:
+        rules (list[Rule]): Policy rules.
+
+    Returns:
+        list[int]: Rule indexes, in policy order among equal rules.
+    """
+
+    return sorted(
+        range(len(rules)),
+        key=lambda i: (SEVERITIES.index(rules[i].severity), -rules[i].priority)
+    )
+
+
+def rule_key(rule: Rule) -> tuple[str, str]:
+    """
+    Identify the check performed by a rule, whatever its identifier.
+
+    Args:
+        rule (Rule): Policy rule.
+
+    Returns:
+        tuple[str, str]: Control and canonical JSON of its parameters.
+    """
+
+    return rule.control, json.dumps(rule.params, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def policy_hash(policy: Policy) -> str:
+    """
+    Hash everything of a policy that affects its execution.
+
+    Args:
+        policy (Policy): Validated policy.
+
+    Returns:
+        str: Hexadecimal digest.
+    """
+
+    # A single encoder call for the whole policy
+    canonical = json.dumps(
+        [
+            policy.category,
+            [[rule.rule_id, rule.control, rule.params, rule.severity, rule.priority] for rule in policy.rules]
+        ],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
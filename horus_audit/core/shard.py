@@ -0,0 +1,299 @@
+from collections import Counter
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+import hashlib
+import heapq
+import json
+from pathlib import Path
+from typing import Any, TextIO
+
+from horus_audit.core.exceptions import ShardError
+from horus_audit.core.report import ReportContext, index_results
+from horus_audit.core.result import STATUSES, ControlResult
+from horus_audit.core.rule import Policy, Rule, policy_hash
+
+
+@dataclass
+class Shard:
+    index: int
+    count: int
+    costs: Mapping[str, float] | None = None
+
+    def __post_init__(self) -> None:
+        if self.count < 1:
+            raise ShardError("Shard count has to be positive")
+
+        if not 0 <= self.index < self.count:
+            raise ShardError(f"Shard index out of range: {self.index}/{self.count}")
+
+
+def shard_of(rule_id: str, count: int) -> int:
+    """
+    Return the shard owning a rule.
+
+    Args:
+        rule_id (str): Rule identifier.
+        count (int): Number of shards.
+
+    Returns:
+        int: Shard index.
+    """
+
+    # Stable across processes and Python versions, unlike hash()
+    digest = hashlib.blake2b(rule_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count
+
+
+def shard_policy(policy: Policy, shard: Shard) -> Policy:
+    """
+    Select the rules of a policy owned by a shard.
+
+    Rules are partitioned by a stable hash of their rule_id or, when
+    costs are provided, balanced greedily by cost. Both partitions only
+    depend on the policy, so every job computes the same assignment.
+
+    Args:
+        policy (Policy): Validated policy.
+        shard (Shard): Shard to select.
+
+    Returns:
+        Policy: Policy restricted to the shard rules, in policy order.
+    """
+
+    if shard.costs is None:
+        owned = {
+            i
+            for i, rule in enumerate(policy.rules)
+            if shard_of(rule.rule_id, shard.count) == shard.index
+        }
+    else:
+        owned = _balance(policy.rules, shard)
+
+    return Policy(
+        category=policy.category,
+        rules=[rule for i, rule in enumerate(policy.rules) if i in owned]
+    )
+
+
+def _balance(rules: list[Rule], shard: Shard) -> set[int]:
+    costs = shard.costs or {}
+
+    def cost(i: int) -> float:
+        rule = rules[i]
+        return float(costs.get(rule.rule_id, costs.get(rule.control, 1.0)))
+
+    # Longest processing time first onto the least loaded shard
+    loads = [(0.0, index) for index in range(shard.count)]
+    owned = set()
+
+    for i in sorted(range(len(rules)), key=lambda i: (-cost(i), rules[i].rule_id, i)):
+        load, index = heapq.heappop(loads)
+
+        if index == shard.index:
+            owned.add(i)
+
+        heapq.heappush(loads, (load + cost(i), index))
+
+    return owned
+
+
+def write_shard(
+    path: Path,
+    *,
+    policy: Policy,
+    shard: Shard,
+    results: list[ControlResult]
+) -> None:
+    """
+    Write the results of a shard as JSON lines, in policy order.
+
+    The header identifies the policy and the partitioning, each result
+    records its position in the policy so shards merge in policy order.
+
+    Args:
+        path (Path): Output file.
+        policy (Policy): Audited policy, before sharding.
+        shard (Shard): Executed shard.
+        results (list[ControlResult]): Shard results.
+
+    Raises:
+        ShardError: Duplicated rule identifiers, or a result of a rule outside the policy.
+    """
+
+    positions = {rule.rule_id: i for i, rule in enumerate(policy.rules)}
+
+    # Results are matched to their rule by identifier only
+    if len(positions) != len(policy.rules):
+        counts = Counter(rule.rule_id for rule in policy.rules)
+        raise ShardError(f"Duplicated rule identifiers in the policy: {sorted(k for k, n in counts.items() if n > 1)}")
+
+    unknown = [result.rule_id for result in results if result.rule_id not in positions]
+
+    if unknown:
+        raise ShardError(f"Results of rules outside the policy: {unknown}")
+
+    counts = Counter(result.rule_id for result in results)
+
+    if len(counts) != len(results):
+        raise ShardError(f"Several results for rules: {sorted(k for k, n in counts.items() if n > 1)}")
+
+    with path.open("w", encoding="utf-8") as f:
+        header = {
+            "category": policy.category,
+            "policy_hash": policy_hash(policy),
+            "partition": _partition(shard),
+            "shard": shard.index,
+            "count": shard.count
+        }
+        f.write(json.dumps(header) + "\n")
+
+        for result in sorted(results, key=lambda result: positions[result.rule_id]):
+            f.write(json.dumps({"position": positions[result.rule_id], **asdict(result)}) + "\n")
+
+
+class ShardMerge:
+    """
+    Shard outputs merged in policy order, checked to belong to the same run.
+
+    Every shard has to come from the same policy and partitioning, else
+    ShardError is raised on opening. Results are read once, by iterating
+    the merge: shard files are merged one line at a time, as each one is
+    in policy order, and summary counts the statuses of the results read
+    so far.
+    """
+
+    def __init__(self, paths: Iterable[Path]) -> None:
+        self.summary = dict.fromkeys(STATUSES, 0)
+        self._files = []
+        self._stack = ExitStack()
+
+        with self._stack as stack:
+            first = None
+            seen = set()
+
+            for path in paths:
+                f = stack.enter_context(path.open("r", encoding="utf-8"))
+                header = _read_header(path, f.readline())
+
+                if first is None:
+                    first = header
+
+                if any(header[name] != first[name] for name in ("category", "policy_hash", "partition", "count")):
+                    raise ShardError(f"Shard does not belong to this run: {path}")
+
+                if header["shard"] in seen:
+                    raise ShardError(f"Duplicated shard {header['shard']}: {path}")
+
+                seen.add(header["shard"])
+                self._files.append(f)
+
+            if first is None:
+                raise ShardError("No shard to merge")
+
+            missing = sorted(set(range(first["count"])) - seen)
+
+            if missing:
+                raise ShardError(f"Missing shards: {missing}")
+
+            # Kept open until the merge is closed
+            self._stack = stack.pop_all()
+
+        self.category = first["category"]
+
+    def __iter__(self) -> Iterator[ControlResult]:
+        """
+        Yield the merged results, in policy order.
+
+        Raises:
+            ShardError: A rule in several shards.
+        """
+
+        previous = None
+
+        for position, result in heapq.merge(*map(_read_results, self._files), key=lambda entry: entry[0]):
+            # Positions are unique in a shard, a rule in several shards repeats one
+            if position == previous:
+                raise ShardError(f"Rule in several shards: {result.rule_id}")
+
+            previous = position
+            self.summary[result.status] += 1
+
+            yield result
+
+    def close(self) -> None:
+        self._stack.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def merge_shards(
+    paths: Iterable[Path],
+    *,
+    os_info: Any | None = None
+) -> ReportContext:
+    """
+    Merge shard outputs into a single report, in policy order.
+
+    The report holds every result, ShardMerge streams them instead, e.g.
+    into write_html_report.
+
+    Args:
+        paths (Iterable[Path]): Shard output files.
+        os_info (Any | None, optional): OS information. Defaults to None.
+
+    Returns:
+        ReportContext: Merged report.
+
+    Raises:
+        ShardError: Missing, duplicated or inconsistent shards, or a rule in several shards.
+    """
+
+    with ShardMerge(paths) as merge:
+        results = list(merge)
+
+    return ReportContext(
+        category=merge.category,
+        generated_at=datetime.now(timezone.utc).isoformat() + "Z",
+        results=results,
+        summary=merge.summary,
+        os_info=os_info,
+        indexes=index_results(results)
+    )
+
+
+def _read_results(f: TextIO) -> Iterator[tuple[int, ControlResult]]:
+    for line in f:
+        if not line.strip():
+            continue
+
+        entry = json.loads(line)
+        position = entry.pop("position")
+
+        yield position, ControlResult(**entry)
+
+
+def _partition(shard: Shard) -> str:
+    if shard.costs is None:
+        return "hash"
+
+    # Cost balanced shards only agree when computed from the same costs
+    costs = json.dumps(shard.costs, sort_keys=True, separators=(",", ":"))
+    return "cost:" + hashlib.blake2b(costs.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _read_header(path: Path, line: str) -> dict[str, Any]:
+    try:
+        header = json.loads(line)
+    except json.JSONDecodeError as exc:
+        raise ShardError(f"Invalid shard header: {path}") from exc
+
+    if not isinstance(header, dict) or not {"category", "policy_hash", "partition", "shard", "count"} <= header.keys():
+        raise ShardError(f"Invalid shard header: {path}")
+
+    return header
@@ -0,0 +1,170 @@
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+import time
+from typing import Any
+
+from horus_audit.config import get_logger
+from horus_audit.core.engine import EngineContext, run_policy
+from horus_audit.core.executor import Executor, LocalExecutor
+from horus_audit.core.facts import FactCache
+from horus_audit.core.metrics import MeteredExecutor, cache_counts, collect_metrics, write_metrics
+from horus_audit.core.os_info import OS_CACHE, OSInfo, detect_os
+from horus_audit.core.registry import registry
+from horus_audit.core.result import ControlResult
+from horus_audit.core.rootfs import RootFS
+from horus_audit.core.rule import Policy
+from horus_audit.core.tracing import tracing
+from horus_audit.core.yaml_loader import load_policy
+
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class StartupTimings:
+    os_info: float = 0.0
+    policy: float = 0.0
+    first_result: float = 0.0
+    total: float = 0.0
+
+
+@dataclass
+class Audit:
+    policy: Policy
+    os_info: OSInfo
+    results: list[ControlResult]
+    timings: StartupTimings = field(default_factory=StartupTimings)
+
+
+def run_audit(
+    policy_path: Path,
+    *,
+    executor: Executor | None = None,
+    root: str | Path | RootFS | None = None,
+    workers: int = 1,
+    processes: int = 0,
+    os_cache: Path | None = OS_CACHE,
+    trace: Path | None = None,
+    metrics: Path | None = None,
+    journal: Path | None = None,
+    resume: bool = False
+) -> Audit:
+    """
+    Load a policy and execute it, overlapping every startup step.
+
+    OS detection runs in the background while the policy loads. As soon as
+    it is loaded, the facts of its controls are prefetched while the first
+    rules already execute, rules waiting on a fact being prefetched. Every
+    timing is measured from the call.
+
+    Args:
+        policy_path (Path): Policy file.
+        executor (Executor | None, optional): Execution backend. Defaults to None.
+        root (str | Path | RootFS | None, optional): Root filesystem to audit. Defaults to None.
+        workers (int, optional): Threads for I/O-bound controls. Defaults to 1.
+        processes (int, optional): Processes for CPU-bound controls. Defaults to 0.
+        os_cache (Path | None, optional): OS information cache. Defaults to OS_CACHE.
+        trace (Path | None, optional): Chrome trace-event file of the run. Defaults to None.
+        metrics (Path | None, optional): OpenMetrics textfile of the run. Defaults to None.
+        journal (Path | None, optional): Journal of completed results. Defaults to None.
+        resume (bool, optional): Resume an interrupted run from its journal. Defaults to False.
+
+    Returns:
+        Audit: Policy, OS information, results and startup timings.
+
+    Raises:
+        PolicyError: Policy issues.
+    """
+
+    start = time.perf_counter()
+    timings = StartupTimings()
+
+    # Process-wide caches outlive the run, only this run's hits are reported
+    baseline = cache_counts()
+
+    def elapsed() -> float:
+        return time.perf_counter() - start
+
+    executor = executor or LocalExecutor()
+
+    if metrics is not None:
+        executor = MeteredExecutor(executor)
+
+    context = EngineContext(
+        executor=executor,
+        os_info=detect_os(cache_path=os_cache),
+        root=root if isinstance(root, RootFS) else RootFS(root or "/"),
+        facts=FactCache()
+    )
+
+    def resolve_os() -> None:
+        try:
+            context.os_info.resolve()
+        except Exception as exc:
+            # Rules reading a missing field report the error themselves
+            logger.error(f"Unable to detect OS information: {exc}")
+
+        timings.os_info = elapsed()
+
+    def load() -> Policy:
+        policy = load_policy(policy_path)
+        timings.policy = elapsed()
+        return policy
+
+    def first_result(result: ControlResult) -> None:
+        if not timings.first_result:
+            timings.first_result = elapsed()
+
+    with tracing(trace) if trace is not None else nullcontext(), ThreadPoolExecutor(max_workers=4) as pool:
+        pool.submit(resolve_os)
+        policy = pool.submit(load).result()
+
+        for control in dict.fromkeys(rule.control for rule in policy.rules):
+            if registry.has(control) and registry.spec(control).prefetch is not None:
+                pool.submit(_prefetch, registry.spec(control).prefetch, context)
+
+        results = run_policy(
+            policy,
+            executor=context.executor,
+            os_info=context.os_info,
+            workers=workers,
+            processes=processes,
+            root=context.root,
+            facts=context.facts,
+            on_result=first_result,
+            journal=journal,
+            resume=resume
+        )
+
+    timings.total = elapsed()
+
+    logger.info(
+        "Startup: "
+        f"os_info={timings.os_info:.3f}s, "
+        f"policy={timings.policy:.3f}s, "
+        f"first_result={timings.first_result:.3f}s, "
+        f"total={timings.total:.3f}s"
+    )
+
+    if metrics is not None:
+        write_metrics(metrics, collect_metrics(
+            policy=policy.category,
+            results=results,
+            duration=timings.total,
+            executor=context.executor,
+            caches={"facts": context.facts},
+            baseline=baseline
+        ))
+
+    return Audit(policy=policy, os_info=context.os_info, results=results, timings=timings)
+
+
+def _prefetch(prefetch: Callable[[EngineContext], Any], context: EngineContext) -> None:
+    try:
+        prefetch(context)
+    except Exception as exc:
+        # Not cached, the rules collect the fact again and report the error
+        logger.warning(f"Fact prefetch failed: {exc}")
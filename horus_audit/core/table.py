@@ -0,0 +1,151 @@
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+import sys
+
+from horus_audit.core.result import STATUSES, ControlResult, Status
+
+
+@dataclass(frozen=True, slots=True)
+class CompactResult:
+    rule_id: str
+    control: str
+    status: Status
+    message: str
+    duration: float = 0.0
+
+    @classmethod
+    def from_result(cls, result: ControlResult) -> "CompactResult":
+        return cls(
+            rule_id=sys.intern(result.rule_id),
+            control=sys.intern(result.control),
+            status=Status[result.status],
+            message=result.message,
+            duration=result.duration
+        )
+
+    def to_result(self) -> ControlResult:
+        return ControlResult(
+            rule_id=self.rule_id,
+            control=self.control,
+            status=self.status.name,
+            message=self.message,
+            duration=self.duration
+        )
+
+
+class ResultTable:
+    def __init__(self) -> None:
+        # Dictionaries of distinct values, indexed by the columns
+        self.hosts = []
+        self.rules = []
+        self.messages = []
+        self._hosts = {}
+        self._rules = {}
+        self._messages = {}
+
+        self.host_index = array("I")
+        self.rule_index = array("I")
+        self.status_code = array("B")
+        self.message_index = array("I")
+        self.duration = array("d")
+
+    @classmethod
+    def from_results(cls, audits: Iterable[tuple[str, Iterable[ControlResult]]]) -> "ResultTable":
+        """
+        Build a table from per-host results.
+
+        Args:
+            audits (Iterable[tuple[str, Iterable[ControlResult]]]): Results per host.
+
+        Returns:
+            ResultTable: Columnar results.
+        """
+
+        table = cls()
+
+        for host, results in audits:
+            table.extend(host, results)
+
+        return table
+
+    def append(self, host: str, result: ControlResult) -> None:
+        self.host_index.append(self._intern(host, self.hosts, self._hosts))
+        self.rule_index.append(self._intern((result.rule_id, result.control), self.rules, self._rules))
+        self.status_code.append(Status[result.status])
+        self.message_index.append(self._intern(result.message, self.messages, self._messages))
+        self.duration.append(result.duration)
+
+    def extend(self, host: str, results: Iterable[ControlResult]) -> None:
+        for result in results:
+            self.append(host, result)
+
+    @staticmethod
+    def _intern(value, values: list, index: dict) -> int:
+        i = index.get(value)
+
+        if i is None:
+            i = index[value] = len(values)
+            values.append(value)
+
+        return i
+
+    def __len__(self) -> int:
+        return len(self.status_code)
+
+    def rows(self) -> Iterator[tuple[str, CompactResult]]:
+        for host, rule, status, message, duration in zip(
+            self.host_index,
+            self.rule_index,
+            self.status_code,
+            self.message_index,
+            self.duration
+        ):
+            rule_id, control = self.rules[rule]
+
+            yield self.hosts[host], CompactResult(
+                rule_id=rule_id,
+                control=control,
+                status=Status(status),
+                message=self.messages[message],
+                duration=duration
+            )
+
+    def to_results(self) -> dict[str, list[ControlResult]]:
+        """
+        Convert the table back to per-host results.
+
+        Returns:
+            dict[str, list[ControlResult]]: Results per host, in insertion order.
+        """
+
+        audits = {host: [] for host in self.hosts}
+
+        for host, result in self.rows():
+            audits[host].append(result.to_result())
+
+        return audits
+
+    def summary(self) -> dict[str, int]:
+        codes = self.status_code.tobytes()
+
+        return {status: codes.count(bytes([code])) for code, status in enumerate(STATUSES)}
+
+    def summary_by_rule(self) -> dict[str, dict[str, int]]:
+        return self._group(self.rule_index, [rule_id for rule_id, _ in self.rules])
+
+    def summary_by_host(self) -> dict[str, dict[str, int]]:
+        return self._group(self.host_index, self.hosts)
+
+    def _group(self, column: array, labels: list[str]) -> dict[str, dict[str, int]]:
+        counts = Counter(zip(column, self.status_code))
+        summaries = {}
+
+        for i, label in enumerate(labels):
+            summary = summaries.setdefault(label, dict.fromkeys(STATUSES, 0))
+
+            for code, status in enumerate(STATUSES):
+                summary[status] += counts[i, code]
+
+        return summaries
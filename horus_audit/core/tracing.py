@@ -0,0 +1,147 @@
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+import json
+import os
+from pathlib import Path
+import tempfile
+import threading
+import time
+from typing import Any, ContextManager
+
+
+_tracer = None
+
+# Returned by span when tracing is off, no allocation per call
+_DISABLED = nullcontext()
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.pid = os.getpid()
+        self.events = []
+        self.origin = time.perf_counter_ns()
+
+    @contextmanager
+    def span(self, name: str, category: str, args: dict[str, Any]) -> Iterator[None]:
+        start = time.perf_counter_ns()
+
+        try:
+            yield
+        finally:
+            thread = threading.current_thread()
+            # Appending to a list is atomic, no lock needed between workers
+            self.events.append((name, category, start, time.perf_counter_ns(), thread.ident, thread.name, args))
+
+    def trace_events(self) -> list[dict[str, Any]]:
+        """
+        Convert the recorded spans to Chrome trace events.
+
+        Returns:
+            list[dict[str, Any]]: Complete events, preceded by thread name metadata.
+        """
+
+        threads = {}
+        events = []
+
+        for name, category, start, end, tid, thread_name, args in list(self.events):
+            threads.setdefault(tid, thread_name)
+            events.append({
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self.origin) / 1000,
+                "dur": (end - start) / 1000,
+                "pid": self.pid,
+                "tid": tid,
+                "args": args
+            })
+
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": thread_name}}
+            for tid, thread_name in threads.items()
+        ]
+
+        return metadata + sorted(events, key=lambda event: event["ts"])
+
+    def export(self, path: Path) -> None:
+        """
+        Write the trace in the Chrome trace-event JSON format.
+
+        Args:
+            path (Path): Trace file, opened with chrome://tracing or Perfetto.
+        """
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile("w", dir=path.parent, delete=False, encoding="utf-8") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, f)
+
+        os.replace(f.name, path)
+
+
+def span(name: str, category: str = "horus", **args: Any) -> ContextManager[None]:
+    """
+    Time a block as a span of the active trace.
+
+    Args:
+        name (str): Span name.
+        category (str, optional): Span category. Defaults to "horus".
+        **args (Any): Values shown with the span.
+
+    Returns:
+        ContextManager[None]: Span, a shared no-op when tracing is off.
+    """
+
+    if _tracer is None:
+        return _DISABLED
+
+    return _tracer.span(name, category, args)
+
+
+def start_tracing() -> Tracer:
+    """
+    Record spans of every thread until tracing is stopped.
+
+    Returns:
+        Tracer: Active tracer.
+    """
+
+    global _tracer
+    _tracer = Tracer()
+
+    return _tracer
+
+
+def stop_tracing() -> Tracer | None:
+    """
+    Stop recording spans.
+
+    Returns:
+        Tracer | None: Stopped tracer, None when tracing was off.
+    """
+
+    global _tracer
+    tracer, _tracer = _tracer, None
+
+    return tracer
+
+
+@contextmanager
+def tracing(path: Path) -> Iterator[Tracer]:
+    """
+    Trace a block and export it to a file.
+
+    Args:
+        path (Path): Trace file.
+
+    Yields:
+        Tracer: Active tracer.
+    """
+
+    tracer = start_tracing()
+
+    try:
+        yield tracer
+    finally:
+        stop_tracing()
+        tracer.export(path)
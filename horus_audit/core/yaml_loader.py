@@ -1,10 +1,12 @@
 from pathlib import Path
+import sys
 from typing import Any
 
 import yaml
 
 from horus_audit.core.exceptions import PolicyError
-from horus_audit.core.rule import Policy, Rule
+from horus_audit.core.rule import SEVERITIES, Policy, Rule
+from horus_audit.core.tracing import span
 
 
 def load_policy(path: Path) -> Policy:
@@ -21,6 +23,11 @@ def load_policy(path: Path) -> Policy:
         PolicyError: Policy issues.
     """
 
+    with span("load_policy", "policy", path=str(path)):
+        return _load_policy(path)
+
+
+def _load_policy(path: Path) -> Policy:
     if not path.exists():
         raise PolicyError(f"Policy file not found: {path}")
 
@@ -56,6 +63,8 @@ def _parse_rule(i: int, rule: dict[str, Any]) -> Rule:
     rule_id = rule.get("rule_id")
     control = rule.get("control")
     params = rule.get("params", {})
+    severity = rule.get("severity", "medium")
+    priority = rule.get("priority", 0)
 
     if not isinstance(rule_id, str) or not rule_id:
         raise PolicyError(f"No rules[{i}].rule_id")
@@ -66,8 +75,17 @@ def _parse_rule(i: int, rule: dict[str, Any]) -> Rule:
     if not isinstance(params, dict):
         raise PolicyError(f"rules[{i}].params has to be a mapping")
 
+    if not isinstance(severity, str) or severity.lower() not in SEVERITIES:
+        raise PolicyError(f"rules[{i}].severity has to be one of {', '.join(SEVERITIES)}")
+
+    if not isinstance(priority, int) or isinstance(priority, bool):
+        raise PolicyError(f"rules[{i}].priority has to be an integer")
+
+    # Identifiers are repeated in every result of the rule
     return Rule(
-        rule_id=rule_id,
-        control=control,
-        params=params
+        rule_id=sys.intern(rule_id),
+        control=sys.intern(control),
+        params=params,
+        severity=sys.intern(severity.lower()),
+        priority=priority
     )
@@ -0,0 +1,85 @@
+import json
+import logging
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+
+from horus_audit.config import RateLimitFilter, config, setup_logging, shutdown_logging
+
+
+@pytest.fixture
+def root_logger(monkeypatch: MonkeyPatch, tmp_path: Path) -> logging.Logger:
+    logger = logging.getLogger()
+
+    monkeypatch.setattr(config, "LOG_FILE", tmp_path / "horus.log")
+    monkeypatch.setattr(logger, "level", logger.level)
+    monkeypatch.setattr(logger, "propagate", logger.propagate)
+
+    yield logger
+
+    shutdown_logging()
+
+
+def isolate(monkeypatch: MonkeyPatch, logger: logging.Logger) -> None:
+    # Pytest attaches its capture handlers once the test is running
+    monkeypatch.setattr(logger, "handlers", [])
+
+
+@pytest.mark.logging
+def test_setup_logging_json(root_logger: logging.Logger, tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    isolate(monkeypatch, root_logger)
+    setup_logging(level=logging.DEBUG, json_format=True)
+
+    logger = logging.getLogger("test.logging")
+    logger.debug("Rule %s: %s", "R1", "PASSED", extra={"rule_id": "R1", "control": "x", "duration": 0.5})
+    logger.info("Done")
+
+    shutdown_logging()
+
+    entries = [json.loads(line) for line in (tmp_path / "horus.log").read_text().splitlines()]
+
+    assert entries[0]["message"] == "Rule R1: PASSED"
+    assert entries[0]["level"] == "DEBUG"
+    assert entries[0]["rule_id"] == "R1"
+    assert entries[0]["control"] == "x"
+    assert entries[0]["duration"] == 0.5
+    assert entries[1]["message"] == "Done"
+    assert "rule_id" not in entries[1]
+    assert not root_logger.handlers
+
+
+@pytest.mark.logging
+def test_setup_logging_rate_limits_debug(root_logger: logging.Logger, tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    isolate(monkeypatch, root_logger)
+    setup_logging(level=logging.DEBUG, debug_rate=0.001, debug_burst=3)
+
+    logger = logging.getLogger("test.logging")
+
+    for i in range(10):
+        logger.debug("Running %s", i)
+        logger.warning("Warning %s", i)
+
+    shutdown_logging()
+
+    lines = (tmp_path / "horus.log").read_text().splitlines()
+
+    assert sum("Running" in line for line in lines) == 3
+    assert sum("Warning" in line for line in lines) == 10
+
+
+@pytest.mark.logging
+def test_rate_limit_filter_per_call_site() -> None:
+    limiter = RateLimitFilter(rate=0.001, burst=1)
+
+    def record(msg: str, lineno: int = 1) -> logging.LogRecord:
+        return logging.LogRecord("test", logging.DEBUG, __file__, lineno, msg, (), None)
+
+    assert limiter.filter(record("a %s"))
+    assert not limiter.filter(record("a %s"))
+    assert limiter.filter(record("b %s", lineno=2))
+    assert limiter.suppressed == 1
+
+    # f-string messages of the same call site share its bucket
+    assert not limiter.filter(record("Parsed /etc/b"))
+    assert limiter.suppressed == 2
@@ -0,0 +1,256 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from horus_audit.controls import check_config_value, filesystem
+from horus_audit.controls.config_files import (
+    ConfigCache,
+    ConfigReader,
+    config_cache,
+    lookup,
+    parse_fstab,
+    parse_keyvalue,
+    parse_pam,
+    parse_sshd
+)
+from horus_audit.core.engine import EngineContext
+from horus_audit.core.executor import Executor
+from horus_audit.core.rootfs import RootFS
+
+
+def write(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def make_root(tmp_path: Path) -> Path:
+    write(
+        tmp_path / "etc" / "ssh" / "sshd_config",
+        "Include sshd_config.d/*.conf\n"
+        "PermitRootLogin yes\n"
+        "MaxAuthTries=6\n"
+        "Match User backup\n"
+        "    PasswordAuthentication yes\n"
+    )
+    write(
+        tmp_path / "etc" / "ssh" / "sshd_config.d" / "50-hardening.conf",
+        "# first value wins\nPermitRootLogin no\nX11Forwarding no\n"
+    )
+    write(
+        tmp_path / "etc" / "login.defs",
+        "# comment\nPASS_MAX_DAYS\t365\nPASS_MIN_DAYS 1\nUMASK 022\nPASS_MAX_DAYS 90\n"
+    )
+    write(
+        tmp_path / "etc" / "pam.d" / "common-auth",
+        "auth [success=1 default=ignore] pam_unix.so nullok\n"
+        "auth requisite pam_deny.so\n"
+    )
+    write(
+        tmp_path / "etc" / "pam.d" / "system-auth",
+        "auth required pam_faillock.so preauth deny=5\n"
+        "password required pam_pwquality.so retry=3\n"
+    )
+    write(
+        tmp_path / "etc" / "pam.d" / "login",
+        "@include common-auth\n"
+        "auth substack system-auth\n"
+        "-session optional pam_systemd.so\n"
+    )
+    write(
+        tmp_path / "etc" / "fstab",
+        "# <file system> <mount point> <type> <options>\n"
+        "UUID=1234 / ext4 defaults 0 1\n"
+        "tmpfs /tmp tmpfs rw,nosuid,nodev,noexec 0 0\n"
+    )
+
+    return tmp_path
+
+
+def check(context: EngineContext, **params):
+    return check_config_value(
+        rule_id="config.value",
+        control="Ensure configuration value",
+        params=params,
+        executor=context.executor,
+        context=context
+    )
+
+
+@pytest.mark.config
+def test_parse_sshd_include_and_match(tmp_path: Path) -> None:
+    config = parse_sshd(ConfigReader(RootFS(make_root(tmp_path))), "/etc/ssh/sshd_config")
+
+    assert config.options["permitrootlogin"] == "no"
+    assert config.options["maxauthtries"] == "6"
+    assert config.options["x11forwarding"] == "no"
+    assert config.matches == [("User backup", {"passwordauthentication": "yes"})]
+
+
+@pytest.mark.config
+def test_parse_sshd_invalid_line(tmp_path: Path) -> None:
+    write(tmp_path / "etc" / "ssh" / "sshd_config", "= yes\nPermitRootLogin no\n")
+
+    config = parse_sshd(ConfigReader(RootFS(tmp_path)), "/etc/ssh/sshd_config")
+
+    assert config.options == {"permitrootlogin": "no"}
+
+
+@pytest.mark.config
+def test_parse_keyvalue(tmp_path: Path) -> None:
+    values = parse_keyvalue(ConfigReader(RootFS(make_root(tmp_path))), "/etc/login.defs")
+
+    assert values == {"PASS_MAX_DAYS": "90", "PASS_MIN_DAYS": "1", "UMASK": "022"}
+
+
+@pytest.mark.config
+def test_parse_keyvalue_spaced_equals(tmp_path: Path) -> None:
+    write(
+        tmp_path / "etc" / "security" / "pwquality.conf",
+        "# minlen = 9\n"
+        "minlen = 14\n"
+        "dcredit=-1\n"
+        "ENV_PATH PATH=/usr/bin\n"
+    )
+
+    values = parse_keyvalue(ConfigReader(RootFS(tmp_path)), "/etc/security/pwquality.conf")
+
+    assert values == {"minlen": "14", "dcredit": "-1", "ENV_PATH": "PATH=/usr/bin"}
+
+    context = EngineContext(executor=Executor(), root=RootFS(tmp_path))
+    result = check(context, path="/etc/security/pwquality.conf", key="minlen", min=14)
+
+    assert result.status == "PASSED"
+
+
+@pytest.mark.config
+def test_parse_pam_includes(tmp_path: Path) -> None:
+    entries = parse_pam(ConfigReader(RootFS(make_root(tmp_path))), "/etc/pam.d/login")
+
+    assert [(entry.type, entry.control, entry.module) for entry in entries] == [
+        ("auth", "[success=1 default=ignore]", "pam_unix.so"),
+        ("auth", "requisite", "pam_deny.so"),
+        ("auth", "required", "pam_faillock.so"),
+        ("session", "optional", "pam_systemd.so")
+    ]
+    assert entries[-1].optional
+    assert lookup(entries, "pam", "auth:pam_faillock.so") == "preauth deny=5"
+    assert lookup(entries, "pam", "pam_pwquality.so") is None
+
+
+@pytest.mark.config
+def test_parse_fstab(tmp_path: Path) -> None:
+    entries = parse_fstab(ConfigReader(RootFS(make_root(tmp_path))), "/etc/fstab")
+
+    assert [entry.file for entry in entries] == ["/", "/tmp"]
+    assert entries[0].passno == 1
+    assert lookup(entries, "fstab", "/tmp/") == "rw,nosuid,nodev,noexec"
+
+
+@pytest.mark.config
+def test_cache_reuses_parsed_file(tmp_path: Path) -> None:
+    root = RootFS(make_root(tmp_path))
+    cache = ConfigCache()
+
+    first = cache.get(root, "/etc/ssh/sshd_config", "sshd")
+    second = cache.get(root, "/etc/ssh/sshd_config", "sshd")
+
+    assert first is second
+    assert cache.misses == 1
+    assert cache.hits == 1
+
+
+@pytest.mark.config
+def test_cache_cleared_in_place(tmp_path: Path) -> None:
+    root = RootFS(make_root(tmp_path))
+    misses = config_cache.misses
+
+    config_cache.get(root, "/etc/fstab", "fstab")
+    config_cache.clear()
+
+    # The instance imported by the filesystem controls is cold again
+    filesystem.config_cache.get(root, "/etc/fstab", "fstab")
+
+    assert filesystem.config_cache is config_cache
+    assert config_cache.misses == misses + 2
+
+
+@pytest.mark.config
+def test_cache_invalidated_by_included_file(tmp_path: Path) -> None:
+    root = RootFS(make_root(tmp_path))
+    cache = ConfigCache()
+    included = tmp_path / "etc" / "ssh" / "sshd_config.d" / "50-hardening.conf"
+
+    cache.get(root, "/etc/ssh/sshd_config", "sshd")
+
+    included.write_text("PermitRootLogin prohibit-password\n", encoding="utf-8")
+    st = included.stat()
+    os.utime(included, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    config = cache.get(root, "/etc/ssh/sshd_config", "sshd")
+
+    assert config.options["permitrootlogin"] == "prohibit-password"
+    assert cache.misses == 2
+
+
+@pytest.mark.config
+def test_cache_invalidated_by_new_include(tmp_path: Path) -> None:
+    root = RootFS(make_root(tmp_path))
+    cache = ConfigCache()
+
+    cache.get(root, "/etc/ssh/sshd_config", "sshd")
+    write(tmp_path / "etc" / "ssh" / "sshd_config.d" / "10-first.conf", "MaxAuthTries 3\n")
+
+    directory = tmp_path / "etc" / "ssh" / "sshd_config.d"
+    st = directory.stat()
+    os.utime(directory, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert cache.get(root, "/etc/ssh/sshd_config", "sshd").options["maxauthtries"] == "3"
+
+
+@pytest.mark.config
+@pytest.mark.parametrize(
+    ("params", "status"),
+    [
+        ({"path": "/etc/ssh/sshd_config", "dialect": "sshd", "key": "PermitRootLogin", "value": "No"}, "PASSED"),
+        ({"path": "/etc/ssh/sshd_config", "dialect": "sshd", "key": "MaxAuthTries", "max": 4}, "FAILED"),
+        ({"path": "/etc/login.defs", "key": "PASS_MAX_DAYS", "max": 365}, "PASSED"),
+        ({"path": "/etc/login.defs", "key": "PASS_MIN_DAYS", "min": 7}, "FAILED"),
+        ({"path": "/etc/login.defs", "key": "ENCRYPT_METHOD", "value": "SHA512"}, "FAILED"),
+        ({"path": "/etc/fstab", "dialect": "fstab", "key": "/tmp", "contains": ["nodev", "noexec"]}, "PASSED"),
+        ({"path": "/etc/fstab", "dialect": "fstab", "key": "/", "contains": ["nodev"]}, "FAILED"),
+        ({"path": "/etc/pam.d/login", "dialect": "pam", "key": "pam_faillock.so", "contains": ["deny=5"]}, "PASSED"),
+        ({"path": "/etc/pam.d/login", "dialect": "pam", "key": "pam_rhosts.so", "absent": True}, "PASSED"),
+        ({"path": "/etc/pam.d/login", "dialect": "pam", "key": "pam_deny.so", "absent": True}, "FAILED")
+    ]
+)
+def test_config_value(tmp_path: Path, params: dict, status: str) -> None:
+    config_cache.clear()
+    context = EngineContext(executor=Executor(), root=RootFS(make_root(tmp_path)))
+
+    assert check(context, **params).status == status
+
+
+@pytest.mark.config
+def test_config_value_message(tmp_path: Path) -> None:
+    context = EngineContext(executor=Executor(), root=RootFS(make_root(tmp_path)))
+
+    result = check(context, path="/etc/login.defs", key="PASS_MIN_DAYS", min=7)
+
+    assert result.message == "PASS_MIN_DAYS in /etc/login.defs is 1, expected at least 7"
+
+
+@pytest.mark.config
+def test_config_value_no_expectation() -> None:
+    result = check(EngineContext(executor=Executor()), path="/etc/login.defs", key="UMASK")
+
+    assert result.status == "ERROR"
+    assert result.message == "params has no expectation"
+
+
+@pytest.mark.config
+def test_config_value_unknown_dialect() -> None:
+    result = check(EngineContext(executor=Executor()), path="/etc/hosts", dialect="hosts", key="a", value="b")
+
+    assert result.status == "ERROR"
+    assert result.message == "Unknown dialect: hosts"
@@ -0,0 +1,162 @@
+from pathlib import Path
+
+import pytest
+
+from horus_audit.controls import check_file_contains, check_file_not_contains
+from horus_audit.controls import content
+from horus_audit.controls.content import search_file
+from horus_audit.core.engine import EngineContext, run_policy
+from horus_audit.core.executor import Executor
+from horus_audit.core.rootfs import RootFS
+from horus_audit.core.rule import Policy, Rule
+
+
+def make_root(tmp_path: Path) -> Path:
+    (tmp_path / "etc").mkdir()
+    (tmp_path / "etc" / "issue").write_text("Authorized uses only\n", encoding="utf-8")
+    (tmp_path / "etc" / "bashrc").write_text(
+        "# System wide functions and aliases\n"
+        "umask 027\n"
+        "TMOUT=900\n"
+        "readonly TMOUT\n",
+        encoding="utf-8"
+    )
+
+    return tmp_path
+
+
+def check(f, context: EngineContext, **params):
+    return f(
+        rule_id=f.__name__,
+        control="Ensure file content",
+        params=params,
+        executor=context.executor,
+        context=context
+    )
+
+
+@pytest.mark.content
+def test_search_file(tmp_path: Path) -> None:
+    path = make_root(tmp_path) / "etc" / "bashrc"
+
+    found = search_file(path, [r"^umask\s+0?27$", r"^TMOUT=\d+", r"^\s*alias", "readonly TMOUT"])
+
+    assert found == {
+        r"^umask\s+0?27$": "umask 027",
+        r"^TMOUT=\d+": "TMOUT=900",
+        r"^\s*alias": None,
+        "readonly TMOUT": "readonly TMOUT"
+    }
+
+
+@pytest.mark.content
+def test_search_file_mmap(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "large.log"
+    path.write_bytes(b"noise\n" * 10000 + b"needle here\n" + b"noise\n" * 10)
+    monkeypatch.setattr(content, "MMAP_THRESHOLD", 1024)
+
+    assert search_file(path, ["needle", "^absent$"]) == {"needle": "needle here", "^absent$": None}
+
+
+@pytest.mark.content
+def test_search_file_clashing_groups(tmp_path: Path) -> None:
+    path = make_root(tmp_path) / "etc" / "bashrc"
+
+    found = search_file(path, [r"(?P<v>umask) 027", r"(?P<v>TMOUT)=900"])
+
+    assert found == {r"(?P<v>umask) 027": "umask 027", r"(?P<v>TMOUT)=900": "TMOUT=900"}
+
+
+@pytest.mark.content
+def test_file_contains(tmp_path: Path) -> None:
+    context = EngineContext(executor=Executor(), root=RootFS(make_root(tmp_path)))
+
+    result = check(check_file_contains, context, path="/etc/bashrc", patterns=[r"^umask\s+027", "^TMOUT="])
+
+    assert result.status == "PASSED"
+    assert result.message == "/etc/bashrc matches every pattern"
+
+
+@pytest.mark.content
+def test_file_contains_missing_pattern(tmp_path: Path) -> None:
+    context = EngineContext(executor=Executor(), root=RootFS(make_root(tmp_path)))
+
+    result = check(check_file_contains, context, path="/etc/bashrc", patterns=["^umask", "^readonly PATH"])
+
+    assert result.status == "FAILED"
+    assert result.message == "/etc/bashrc does not match ^readonly PATH"
+
+
+@pytest.mark.content
+def test_file_contains_ignore_case(tmp_path: Path) -> None:
+    context = EngineContext(executor=Executor(), root=RootFS(make_root(tmp_path)))
+
+    result = check(check_file_contains, context, path="/etc/issue", patterns=["authorized"], ignore_case=True)
+
+    assert result.status == "PASSED"
+
+
+@pytest.mark.content
+def test_file_contains_missing_file(tmp_path: Path) -> None:
+    context = EngineContext(executor=Executor(), root=RootFS(tmp_path))
+
+    result = check(check_file_contains, context, path="/etc/issue", patterns=["Authorized"])
+
+    assert result.status == "FAILED"
+    assert result.message == "Unable to read /etc/issue"
+
+
+@pytest.mark.content
+def test_file_not_contains(tmp_path: Path) -> None:
+    context = EngineContext(executor=Executor(), root=RootFS(make_root(tmp_path)))
+
+    passed = check(check_file_not_contains, context, path="/etc/bashrc", patterns=["^umask 0?22"])
+    failed = check(check_file_not_contains, context, path="/etc/issue", patterns=["uses"])
+    missing = check(check_file_not_contains, context, path="/etc/motd", patterns=["uses"])
+
+    assert passed.status == "PASSED"
+    assert failed.status == "FAILED"
+    assert failed.message == "/etc/issue matches uses: Authorized uses only"
+    assert missing.status == "PASSED"
+    assert missing.message == "/etc/motd does not exist"
+
+
+@pytest.mark.content
+def test_file_contains_grouped_rules(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    searches = []
+    search = content.search_file
+
+    def counting_search(path, patterns):
+        searches.append(sorted(patterns))
+        return search(path, patterns)
+
+    monkeypatch.setattr(content, "search_file", counting_search)
+
+    policy = Policy(
+        category="Unit tests",
+        rules=[
+            Rule(rule_id="R1", control="file.contains", params={"path": "/etc/bashrc", "patterns": ["^umask 027"]}),
+            Rule(rule_id="R2", control="file.contains", params={"path": "/etc/bashrc", "patterns": ["^TMOUT="]}),
+            Rule(rule_id="R3", control="file.not_contains", params={"path": "/etc/bashrc", "patterns": ["^umask 022"]}),
+            Rule(rule_id="R4", control="file.not_contains", params={"path": "/etc/bashrc", "patterns": ["[unclosed"]})
+        ]
+    )
+
+    results = run_policy(policy, executor=Executor(), root=make_root(tmp_path), workers=4)
+
+    assert [result.status for result in results] == ["PASSED", "PASSED", "PASSED", "ERROR"]
+    assert results[3].message.startswith("Invalid pattern [unclosed")
+    assert searches == [["^TMOUT=", "^umask 022", "^umask 027"]]
+
+
+@pytest.mark.content
+def test_file_contains_empty_params() -> None:
+    context = EngineContext(executor=Executor())
+
+    no_path = check(check_file_contains, context, patterns=["x"])
+    no_patterns = check(check_file_not_contains, context, path="/etc/issue", patterns=[])
+
+    assert no_path.status == "ERROR"
+    assert no_path.message == "params.path is empty"
+    assert no_patterns.status == "ERROR"
+    assert no_patterns.message == "params.patterns is empty"
@@ -1,10 +1,15 @@
+from pathlib import Path
+
 import pytest
 
 from horus_audit.controls import (
     check_filesystem_module_disabled,
     check_filesystem_partition
 )
+from horus_audit.core.engine import EngineContext, run_policy
 from horus_audit.core.executor import ExecutionResult, Executor
+from horus_audit.core.rootfs import RootFS
+from horus_audit.core.rule import Policy, Rule
 
 
 class MockExecutor(Executor):
@@ -15,23 +20,38 @@ class MockExecutor(Executor):
         return self._mock_function(argv, timeout=timeout)
 
 
-@pytest.mark.filesystem
-def test_module_disabled() -> None:
-    def mock_run(argv, **kwargs):
-        return ExecutionResult(
-            stdout="""/etc/modprobe.d/disable.conf:install cramfs /bin/true
-/etc/modprobe.d/blacklist.conf:blacklist cramfs""",
-            stderr="",
-            code=0
-        )
+def modprobe_context(tmp_path: Path, files: dict[str, str]) -> EngineContext:
+    for name, content in files.items():
+        path = tmp_path / "etc" / "modprobe.d" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
 
-    result = check_filesystem_module_disabled(
+    executor = MockExecutor(
+        lambda argv, **kwargs: ExecutionResult(stdout=f"{tmp_path}/lib/modules/cramfs.ko", stderr="", code=0)
+    )
+
+    return EngineContext(executor=executor, root=RootFS(tmp_path))
+
+
+def check_module(context: EngineContext, module: str = "cramfs"):
+    return check_filesystem_module_disabled(
         rule_id="filesystem.module_disabled",
-        control="Ensure cramfs is properly disabled",
-        params={"module": "cramfs"},
-        executor=MockExecutor(mock_run)
+        control=f"Ensure {module} is properly disabled",
+        params={"module": module},
+        executor=context.executor,
+        context=context
     )
 
+
+@pytest.mark.filesystem
+def test_module_disabled(tmp_path: Path) -> None:
+    context = modprobe_context(
+        tmp_path,
+        {"disable.conf": "install cramfs /bin/true\n", "blacklist.conf": "blacklist cramfs\n"}
+    )
+
+    result = check_module(context)
+
     assert result.status == "PASSED"
     assert result.message == "Kernel module cramfs is disabled"
 
@@ -56,59 +76,62 @@ def test_module_disabled_not_exists() -> None:
 
 
 @pytest.mark.filesystem
-def test_module_disabled_loaded() -> None:
-    def mock_run(argv, **kwargs):
-        return ExecutionResult(stdout="/lib/modules/cramfs.ko", stderr="", code=0)
-
-    result = check_filesystem_module_disabled(
-        rule_id="filesystem.module_disabled",
-        control="Ensure cramfs is properly disabled",
-        params={"module": "cramfs"},
-        executor=MockExecutor(mock_run)
-    )
+def test_module_disabled_no_configuration(tmp_path: Path) -> None:
+    result = check_module(modprobe_context(tmp_path, {}))
 
     assert result.status == "FAILED"
     assert result.message == "Kernel module cramfs is not disabled"
 
 
 @pytest.mark.filesystem
-def test_module_disabled_only_blacklist() -> None:
-    def mock_run(argv, **kwargs):
-        return ExecutionResult(
-            stdout="/etc/modprobe.d/blacklist.conf:blacklist cramfs",
-            stderr="",
-            code=0
-        )
+def test_module_disabled_only_blacklist(tmp_path: Path) -> None:
+    result = check_module(modprobe_context(tmp_path, {"blacklist.conf": "blacklist cramfs\n"}))
 
-    result = check_filesystem_module_disabled(
-        rule_id="filesystem.module_disabled",
-        control="Ensure cramfs is properly disabled",
-        params={"module": "cramfs"},
-        executor=MockExecutor(mock_run)
-    )
+    assert result.status == "FAILED"
+    assert result.message == "Kernel module cramfs is not disabled"
+
+
+@pytest.mark.filesystem
+def test_module_disabled_only_install(tmp_path: Path) -> None:
+    result = check_module(modprobe_context(tmp_path, {"disable.conf": "install cramfs /bin/true\n"}))
 
     assert result.status == "FAILED"
     assert result.message == "Kernel module cramfs is not disabled"
 
 
 @pytest.mark.filesystem
-def test_module_disabled_only_install() -> None:
-    def mock_run(argv, **kwargs):
-        return ExecutionResult(
-            stdout="/etc/modprobe.d/disable.conf:install cramfs /bin/true",
-            stderr="",
-            code=0
-        )
+def test_module_disabled_commented_out(tmp_path: Path) -> None:
+    context = modprobe_context(
+        tmp_path,
+        {"cramfs.conf": "# install cramfs /bin/true\n# blacklist cramfs\nblacklist cramfsx\n"}
+    )
 
-    result = check_filesystem_module_disabled(
-        rule_id="filesystem.module_disabled",
-        control="Ensure cramfs is properly disabled",
-        params={"module": "cramfs"},
-        executor=MockExecutor(mock_run)
+    assert check_module(context).status == "FAILED"
+
+
+@pytest.mark.filesystem
+def test_module_disabled_single_pass(tmp_path: Path) -> None:
+    modules = ["cramfs", "freevxfs", "hfs", "hfsplus", "jffs2", "squashfs", "udf"]
+    context = modprobe_context(
+        tmp_path,
+        {
+            "cis.conf": "".join(f"install {m} /bin/false\nblacklist {m}\n" for m in modules),
+            "local.conf": "options snd slots=1\n"
+        }
+    )
+    policy = Policy(
+        category="Unit tests",
+        rules=[
+            Rule(rule_id=module, control="filesystem.module_disabled", params={"module": module})
+            for module in modules
+        ]
     )
 
-    assert result.status == "FAILED"
-    assert result.message == "Kernel module cramfs is not disabled"
+    results = run_policy(policy, executor=context.executor, root=context.root, facts=context.facts)
+
+    assert [result.status for result in results] == ["PASSED"] * len(modules)
+    # One scan per file for every rule, the listing and the plan are shared
+    assert context.facts.misses == 4
 
 
 @pytest.mark.filesystem
@@ -283,3 +306,60 @@ def test_partition_no_information() -> None:
 
     assert result.status == "SKIPPED"
     assert result.message == "Unable to determine mount information for /tmp"
+
+
+@pytest.mark.filesystem
+def test_module_disabled_offline_root(tmp_path: Path) -> None:
+    calls = []
+
+    def mock_run(argv, **kwargs):
+        calls.append(argv)
+        return ExecutionResult(stdout=f"{tmp_path}/lib/modules/cramfs.ko", stderr="", code=0)
+
+    (tmp_path / "etc" / "modprobe.d").mkdir(parents=True)
+    (tmp_path / "etc" / "modprobe.d" / "cramfs.conf").write_text(
+        "install cramfs /bin/false\nblacklist cramfs\n",
+        encoding="utf-8"
+    )
+    executor = MockExecutor(mock_run)
+
+    result = check_filesystem_module_disabled(
+        rule_id="filesystem.module_disabled",
+        control="Ensure cramfs is properly disabled",
+        params={"module": "cramfs"},
+        executor=executor,
+        context=EngineContext(executor=executor, root=RootFS(tmp_path))
+    )
+
+    assert result.status == "PASSED"
+    assert calls == [["find", f"{tmp_path}/lib/modules/", "-type", "f", "-name", "cramfs*.ko*"]]
+
+
+@pytest.mark.filesystem
+def test_partition_offline_root(tmp_path: Path) -> None:
+    (tmp_path / "etc").mkdir()
+    (tmp_path / "etc" / "fstab").write_text(
+        "UUID=1234 / ext4 defaults 0 1\n"
+        "tmpfs /tmp tmpfs rw,nodev,nosuid 0 0\n",
+        encoding="utf-8"
+    )
+
+    def mock_run(argv, **kwargs):
+        raise AssertionError("No command expected for offline roots")
+
+    executor = MockExecutor(mock_run)
+
+    result = check_filesystem_partition(
+        rule_id="filesystem.partition",
+        control="Ensure /tmp is a separate partition",
+        params={
+            "partition": "/tmp",
+            "fstype": ["tmpfs"],
+            "options": ["nodev", "nosuid", "noexec"]
+        },
+        executor=executor,
+        context=EngineContext(executor=executor, root=RootFS(tmp_path))
+    )
+
+    assert result.status == "FAILED"
+    assert result.message == "/tmp is mounted with unexpected options"
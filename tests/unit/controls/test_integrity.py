@@ -0,0 +1,217 @@
+import hashlib
+import os
+from pathlib import Path
+import sqlite3
+
+import pytest
+
+from horus_audit.controls import check_file_integrity, integrity
+from horus_audit.controls.integrity import (
+    MMAP_THRESHOLD,
+    Baseline,
+    DigestCache,
+    hash_file,
+    hash_files,
+    update_baseline
+)
+from horus_audit.core.engine import EngineContext
+from horus_audit.core.executor import Executor
+from horus_audit.core.rootfs import RootFS
+
+
+def make_root(tmp_path: Path) -> Path:
+    root = tmp_path / "root"
+    (root / "etc").mkdir(parents=True)
+    (root / "etc" / "passwd").write_text("root:x:0:0::/root:/bin/sh\n")
+    (root / "etc" / "shadow").write_text("root:*:19000:0:99999:7:::\n")
+
+    return root
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(integrity, "CACHE_DIR", tmp_path)
+    return tmp_path
+
+
+def check(root: Path, tmp_path: Path, paths: list[str], algorithm: str = "sha256"):
+    return check_file_integrity(
+        rule_id="file.integrity",
+        control="Ensure critical files are unchanged",
+        params={
+            "paths": paths,
+            "baseline": str(tmp_path / "baseline.db"),
+            "cache": str(tmp_path / "digests.db"),
+            "algorithm": algorithm
+        },
+        executor=Executor(),
+        context=EngineContext(executor=Executor(), root=RootFS(root))
+    )
+
+
+@pytest.mark.integrity
+def test_hash_file_mmap(tmp_path: Path) -> None:
+    data = os.urandom(MMAP_THRESHOLD + 17)
+    (tmp_path / "large").write_bytes(data)
+    (tmp_path / "small").write_bytes(data[:100])
+
+    assert hash_file(tmp_path / "large") == hashlib.sha256(data).hexdigest()
+    assert hash_file(tmp_path / "small") == hashlib.sha256(data[:100]).hexdigest()
+
+
+@pytest.mark.integrity
+def test_hash_files_cache(tmp_path: Path) -> None:
+    root = RootFS(make_root(tmp_path))
+    paths = ["/etc/passwd", "/etc/shadow", "/etc/missing"]
+
+    with DigestCache(tmp_path / "digests.db") as cache:
+        first = hash_files(root, paths, cache=cache)
+
+        assert first["/etc/missing"] is None
+        assert cache.misses == 2
+
+        second = hash_files(root, paths, cache=cache)
+
+        assert second == first
+        assert cache.hits == 2
+
+        (root.root / "etc" / "passwd").write_text("root:x:0:0::/root:/bin/bash\n")
+        third = hash_files(root, paths, cache=cache)
+
+        assert third["/etc/passwd"] != first["/etc/passwd"]
+        assert cache.misses == 3
+
+
+@pytest.mark.integrity
+def test_baseline_lookup_update(tmp_path: Path) -> None:
+    with Baseline(tmp_path / "baseline.db") as baseline:
+        baseline.update({f"/file/{i}": f"{i:064x}" for i in range(2000)}, "sha256")
+        baseline.update({"/file/1": "changed"}, "md5")
+
+        found = baseline.lookup(["/file/1", "/file/1999", "/unknown"])
+
+        assert len(baseline) == 2000
+        assert found == {"/file/1": ("md5", "changed"), "/file/1999": ("sha256", f"{1999:064x}")}
+
+
+@pytest.mark.integrity
+def test_file_integrity_passed(tmp_path: Path) -> None:
+    root = make_root(tmp_path)
+    paths = ["/etc/passwd", "/etc/shadow"]
+
+    update_baseline(
+        tmp_path / "baseline.db",
+        paths,
+        root=RootFS(root),
+        cache_path=tmp_path / "digests.db"
+    )
+
+    result = check(root, tmp_path, paths)
+
+    assert result.status == "PASSED"
+    assert result.message == "2 files match their baseline"
+
+
+@pytest.mark.integrity
+def test_file_integrity_modified(tmp_path: Path) -> None:
+    root = make_root(tmp_path)
+    paths = ["/etc/passwd", "/etc/shadow"]
+
+    update_baseline(tmp_path / "baseline.db", paths, root=RootFS(root), cache_path=None)
+    (root / "etc" / "shadow").write_text("root:$6$hash:19000:0:99999:7:::\n")
+    (root / "etc" / "passwd").unlink()
+
+    result = check(root, tmp_path, paths)
+
+    assert result.status == "FAILED"
+    assert result.message == "Files differ from baseline (modified: /etc/shadow; missing: /etc/passwd)"
+
+
+@pytest.mark.integrity
+def test_file_integrity_not_in_baseline(tmp_path: Path) -> None:
+    root = make_root(tmp_path)
+
+    update_baseline(tmp_path / "baseline.db", ["/etc/passwd"], root=RootFS(root), cache_path=None)
+
+    result = check(root, tmp_path, ["/etc/passwd", "/etc/shadow"])
+
+    assert result.status == "WARNING"
+    assert result.message == "Files not in baseline: /etc/shadow"
+
+
+@pytest.mark.integrity
+def test_file_integrity_other_algorithm(tmp_path: Path) -> None:
+    root = make_root(tmp_path)
+    paths = ["/etc/passwd", "/etc/shadow"]
+
+    update_baseline(tmp_path / "baseline.db", paths, root=RootFS(root), algorithm="md5", cache_path=None)
+    recorded = (tmp_path / "baseline.db").read_bytes()
+    (root / "etc" / "shadow").write_text("root:$6$hash:19000:0:99999:7:::\n")
+
+    # Verified with md5, not all reported as modified
+    result = check(root, tmp_path, paths)
+
+    assert result.status == "FAILED"
+    assert result.message == "Files differ from baseline (modified: /etc/shadow)"
+
+    result = check(root, tmp_path, ["/etc/passwd"])
+
+    assert result.status == "WARNING"
+    assert result.message == "Files baselined with another algorithm than sha256: /etc/passwd"
+
+    # The check never writes the baseline
+    assert (tmp_path / "baseline.db").read_bytes() == recorded
+    assert not (tmp_path / "baseline.db-wal").exists()
+
+    update_baseline(tmp_path / "baseline.db", ["/etc/passwd"], root=RootFS(root), cache_path=None)
+
+    with Baseline(tmp_path / "baseline.db") as baseline:
+        assert baseline.lookup(["/etc/passwd"]) == {"/etc/passwd": ("sha256", hash_file(root / "etc" / "passwd"))}
+
+    assert check(root, tmp_path, ["/etc/passwd"]).status == "PASSED"
+
+
+@pytest.mark.integrity
+def test_file_integrity_legacy_baseline(tmp_path: Path) -> None:
+    root = make_root(tmp_path)
+    connection = sqlite3.connect(tmp_path / "baseline.db")
+
+    with connection:
+        connection.execute("CREATE TABLE baseline (path TEXT PRIMARY KEY, digest TEXT NOT NULL) WITHOUT ROWID")
+        connection.execute("INSERT INTO baseline VALUES (?, ?)", ("/etc/passwd", hash_file(root / "etc" / "passwd")))
+
+    connection.close()
+
+    result = check(root, tmp_path, ["/etc/passwd"])
+
+    # The algorithm of the digest is unknown, the file needs a new baseline
+    assert result.status == "WARNING"
+    assert result.message == "Files not in baseline: /etc/passwd"
+
+    with sqlite3.connect(tmp_path / "baseline.db") as connection:
+        assert [row[1] for row in connection.execute("PRAGMA table_info(baseline)")] == ["path", "digest"]
+
+
+@pytest.mark.integrity
+@pytest.mark.parametrize("cache", ["/tmp/digests.db", "../digests.db", ""])
+def test_file_integrity_cache_outside(tmp_path: Path, cache: str) -> None:
+    root = make_root(tmp_path)
+    update_baseline(tmp_path / "baseline.db", ["/etc/passwd"], root=RootFS(root), cache_path=None)
+
+    result = check_file_integrity(
+        rule_id="file.integrity",
+        control="Ensure critical files are unchanged",
+        params={"paths": ["/etc/passwd"], "baseline": str(tmp_path / "baseline.db"), "cache": cache},
+        executor=Executor(),
+        context=EngineContext(executor=Executor(), root=RootFS(root))
+    )
+
+    assert result.status == "ERROR"
+    assert result.message == f"params.cache is outside {tmp_path}"
+
+
+@pytest.mark.integrity
+def test_file_integrity_no_baseline(tmp_path: Path) -> None:
+    result = check(make_root(tmp_path), tmp_path, ["/etc/passwd"])
+
+    assert result.status == "SKIPPED"
@@ -0,0 +1,224 @@
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+
+from horus_audit.controls import (
+    check_package_absent,
+    check_package_installed,
+    check_package_min_version
+)
+from horus_audit.controls import packages
+from horus_audit.controls.packages import (
+    collect_packages,
+    compare_dpkg_versions,
+    compare_rpm_versions,
+    parse_dpkg_status
+)
+from horus_audit.core.engine import EngineContext
+from horus_audit.core.executor import ExecutionResult, Executor
+from horus_audit.core.rootfs import RootFS
+
+
+DPKG_STATUS = """Package: openssh-server
+Status: install ok installed
+Priority: optional
+Architecture: amd64
+Version: 1:9.6p1-3ubuntu13.5
+Description: secure shell (SSH) server
+ multi-line description
+
+Package: telnet
+Status: deinstall ok config-files
+Architecture: amd64
+Version: 0.17+2.5-3ubuntu4
+
+Package: libc6
+Status: install ok installed
+Architecture: i386
+Version: 2.39-0ubuntu8.3
+"""
+
+
+class MockExecutor(Executor):
+    def __init__(self, mock_function):
+        self._mock_function = mock_function
+
+    def run(self, argv, *, timeout=10):
+        return self._mock_function(argv, timeout=timeout)
+
+
+def make_dpkg_root(tmp_path: Path) -> Path:
+    status = tmp_path / "var" / "lib" / "dpkg" / "status"
+    status.parent.mkdir(parents=True)
+    status.write_text(DPKG_STATUS, encoding="utf-8")
+
+    return tmp_path
+
+
+def context_for(root: Path, executor: Executor | None = None) -> EngineContext:
+    return EngineContext(executor=executor or Executor(), root=RootFS(root))
+
+
+@pytest.fixture(autouse=True)
+def package_cache(tmp_path: Path, monkeypatch: MonkeyPatch) -> Path:
+    cache = tmp_path / "cache" / "packages.json"
+    monkeypatch.setattr(packages, "PACKAGE_CACHE", cache)
+
+    return cache
+
+
+@pytest.mark.packages
+def test_parse_dpkg_status() -> None:
+    parsed = parse_dpkg_status(DPKG_STATUS)
+
+    assert parsed["openssh-server"].version == "1:9.6p1-3ubuntu13.5"
+    assert parsed["openssh-server"].state == "installed"
+    assert parsed["telnet"].state == "config-files"
+    assert parsed["libc6"].arch == "i386"
+
+
+@pytest.mark.packages
+@pytest.mark.parametrize("a, b, expected", [
+    ("1.0", "1.0", 0),
+    ("1.0~rc1", "1.0", -1),
+    ("1:1.0", "2.0", 1),
+    ("1.10", "1.9", 1),
+    ("2.7.4-1ubuntu1", "2.7.4-1", 1),
+    ("1.0+b1", "1.0", 1)
+])
+def test_compare_dpkg_versions(a: str, b: str, expected: int) -> None:
+    result = compare_dpkg_versions(a, b)
+    assert (result > 0) - (result < 0) == expected
+
+
+@pytest.mark.packages
+@pytest.mark.parametrize("a, b, expected", [
+    ("1.0", "1.0", 0),
+    ("1.0~rc1", "1.0", -1),
+    ("1.10", "1.9", 1),
+    ("1.0^git1", "1.0", 1),
+    ("0:3.2-1.el9", "3.2-2.el9", -1),
+    ("8.7p1-38.el9", "8.7p1", 0)
+])
+def test_compare_rpm_versions(a: str, b: str, expected: int) -> None:
+    result = compare_rpm_versions(a, b)
+    assert (result > 0) - (result < 0) == expected
+
+
+@pytest.mark.packages
+def test_collect_packages_cache(
+    tmp_path: Path,
+    package_cache: Path,
+    monkeypatch: MonkeyPatch
+) -> None:
+    root = RootFS(make_dpkg_root(tmp_path))
+
+    first = collect_packages(root, Executor(), cache_path=package_cache)
+
+    assert package_cache.exists()
+
+    def parse(text):
+        raise AssertionError("The database should not be parsed again")
+
+    monkeypatch.setattr(packages, "parse_dpkg_status", parse)
+
+    second = collect_packages(root, Executor(), cache_path=package_cache)
+
+    assert second == first
+
+
+@pytest.mark.packages
+def test_collect_packages_rpm(tmp_path: Path) -> None:
+    (tmp_path / "var" / "lib" / "rpm").mkdir(parents=True)
+    (tmp_path / "var" / "lib" / "rpm" / "rpmdb.sqlite").write_text("")
+    calls = []
+
+    def mock_run(argv, **kwargs):
+        calls.append(argv)
+        return ExecutionResult(
+            stdout="openssh-server\t0:8.7p1-38.el9\tx86_64\ngpg-pubkey\t0:1-1\t(none)",
+            stderr="",
+            code=0
+        )
+
+    inventory = collect_packages(RootFS(tmp_path), MockExecutor(mock_run))
+
+    assert inventory.manager == "rpm"
+    assert list(inventory.packages) == ["openssh-server"]
+    assert calls[0][:3] == ["rpm", "--root", str(tmp_path)]
+
+
+@pytest.mark.packages
+def test_package_installed(tmp_path: Path) -> None:
+    context = context_for(make_dpkg_root(tmp_path))
+
+    for name, status in (("openssh-server", "PASSED"), ("telnet", "FAILED"), ("nginx", "FAILED")):
+        result = check_package_installed(
+            rule_id="package.installed",
+            control=f"Ensure {name} is installed",
+            params={"name": name},
+            executor=context.executor,
+            context=context
+        )
+
+        assert result.status == status
+
+    assert context.facts.misses == 1
+
+
+@pytest.mark.packages
+def test_package_absent(tmp_path: Path) -> None:
+    result = check_package_absent(
+        rule_id="package.absent",
+        control="Ensure telnet is not installed",
+        params={"name": "telnet"},
+        executor=Executor(),
+        context=context_for(make_dpkg_root(tmp_path))
+    )
+
+    assert result.status == "PASSED"
+    assert result.message == "Package telnet is not installed"
+
+
+@pytest.mark.packages
+def test_package_min_version(tmp_path: Path) -> None:
+    context = context_for(make_dpkg_root(tmp_path))
+
+    def check(version: str):
+        return check_package_min_version(
+            rule_id="package.min_version",
+            control="Ensure openssh-server is patched",
+            params={"name": "openssh-server", "version": version},
+            executor=context.executor,
+            context=context
+        )
+
+    assert check("1:9.6p1-3ubuntu13").status == "PASSED"
+    assert check("1:9.6p1-3ubuntu13.10").status == "FAILED"
+
+
+@pytest.mark.packages
+def test_package_no_database(tmp_path: Path) -> None:
+    result = check_package_installed(
+        rule_id="package.installed",
+        control="Ensure sudo is installed",
+        params={"name": "sudo"},
+        executor=Executor(),
+        context=context_for(tmp_path)
+    )
+
+    assert result.status == "SKIPPED"
+
+
+@pytest.mark.packages
+def test_package_empty_param() -> None:
+    result = check_package_installed(
+        rule_id="package.installed",
+        control="Ensure sudo is installed",
+        params={"name": ""},
+        executor=Executor()
+    )
+
+    assert result.status == "ERROR"
+    assert result.message == "params.name is empty"
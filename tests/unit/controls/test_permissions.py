@@ -0,0 +1,142 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from horus_audit.controls import (
+    check_permissions_sticky_bit,
+    check_permissions_suid,
+    check_permissions_unowned,
+    check_permissions_world_writable
+)
+from horus_audit.controls.permissions import scan_permissions
+from horus_audit.core.engine import EngineContext
+from horus_audit.core.executor import Executor
+from horus_audit.core.rootfs import RootFS
+
+
+def make_root(tmp_path: Path) -> Path:
+    (tmp_path / "etc").mkdir()
+    (tmp_path / "etc" / "passwd").write_text(
+        f"root:x:0:0::/root:/bin/sh\nme:x:{os.getuid()}:{os.getgid()}::/:/bin/sh\n"
+    )
+    (tmp_path / "etc" / "group").write_text(f"root:x:0:\nme:x:{os.getgid()}:\n")
+
+    (tmp_path / "usr" / "bin").mkdir(parents=True)
+    (tmp_path / "usr" / "bin" / "passwd").write_text("")
+    os.chmod(tmp_path / "usr" / "bin" / "passwd", 0o4755)
+    (tmp_path / "usr" / "bin" / "ls").write_text("")
+
+    (tmp_path / "srv" / "data").mkdir(parents=True)
+    (tmp_path / "srv" / "data" / "shared.txt").write_text("")
+    os.chmod(tmp_path / "srv" / "data" / "shared.txt", 0o666)
+
+    (tmp_path / "tmp").mkdir()
+    os.chmod(tmp_path / "tmp", 0o1777)
+    (tmp_path / "srv" / "drop").mkdir()
+    os.chmod(tmp_path / "srv" / "drop", 0o777)
+
+    os.symlink("/srv/data/shared.txt", tmp_path / "srv" / "link")
+
+    return tmp_path
+
+
+def context_for(root: Path) -> EngineContext:
+    return EngineContext(executor=Executor(), root=RootFS(root))
+
+
+@pytest.mark.permissions
+def test_scan_permissions(tmp_path: Path) -> None:
+    scan = scan_permissions(RootFS(make_root(tmp_path)), workers=4)
+
+    assert scan.world_writable == ["/srv/data/shared.txt"]
+    assert scan.sticky_bit == ["/srv/drop"]
+    assert scan.suid == ["/usr/bin/passwd"]
+    assert scan.sgid == []
+    assert scan.unowned == []
+    assert scan.owners_known
+    assert scan.scanned == 12
+
+
+@pytest.mark.permissions
+def test_scan_permissions_exclude(tmp_path: Path) -> None:
+    scan = scan_permissions(RootFS(make_root(tmp_path)), exclude=["/srv"])
+
+    assert scan.world_writable == []
+    assert scan.sticky_bit == []
+    assert scan.suid == ["/usr/bin/passwd"]
+
+
+@pytest.mark.permissions
+def test_world_writable_failed(tmp_path: Path) -> None:
+    root = make_root(tmp_path)
+
+    result = check_permissions_world_writable(
+        rule_id="permissions.world_writable",
+        control="Ensure no world writable files exist",
+        params={},
+        executor=Executor(),
+        context=context_for(root)
+    )
+
+    assert result.status == "FAILED"
+    assert result.message == "1 world-writable files found: /srv/data/shared.txt"
+
+
+@pytest.mark.permissions
+def test_suid_allowed(tmp_path: Path) -> None:
+    root = make_root(tmp_path)
+
+    result = check_permissions_suid(
+        rule_id="permissions.suid",
+        control="Ensure SUID executables are reviewed",
+        params={"allowed": ["/usr/bin/passwd"]},
+        executor=Executor(),
+        context=context_for(root)
+    )
+
+    assert result.status == "PASSED"
+    assert result.message == "No unexpected SUID files found"
+
+
+@pytest.mark.permissions
+def test_single_scan_shared_by_rules(tmp_path: Path) -> None:
+    context = context_for(make_root(tmp_path))
+
+    for f in (check_permissions_world_writable, check_permissions_sticky_bit, check_permissions_suid):
+        f(
+            rule_id="permissions",
+            control="Permissions",
+            params={},
+            executor=context.executor,
+            context=context
+        )
+
+    assert context.facts.misses == 1
+    assert context.facts.hits == 2
+
+
+@pytest.mark.permissions
+def test_unowned_without_passwd(tmp_path: Path) -> None:
+    result = check_permissions_unowned(
+        rule_id="permissions.unowned",
+        control="Ensure no unowned files exist",
+        params={},
+        executor=Executor(),
+        context=context_for(tmp_path)
+    )
+
+    assert result.status == "SKIPPED"
+
+
+@pytest.mark.permissions
+def test_invalid_paths_param() -> None:
+    result = check_permissions_world_writable(
+        rule_id="permissions.world_writable",
+        control="Ensure no world writable files exist",
+        params={"paths": "/"},
+        executor=Executor()
+    )
+
+    assert result.status == "ERROR"
+    assert result.message == "params.paths has to be a list of paths"
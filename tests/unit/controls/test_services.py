@@ -0,0 +1,133 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from horus_audit.controls import (
+    check_service_disabled,
+    check_service_enabled,
+    check_service_masked
+)
+from horus_audit.controls.services import read_units
+from horus_audit.core.engine import EngineContext, run_policy
+from horus_audit.core.executor import Executor
+from horus_audit.core.rootfs import RootFS
+from horus_audit.core.rule import Policy, Rule
+
+
+INSTALLED = "[Unit]\nDescription=Test\n\n[Service]\nExecStart=/bin/true\n\n[Install]\nWantedBy=multi-user.target\n"
+STATIC = "[Unit]\nDescription=Test\n\n[Service]\nExecStart=/bin/true\n"
+
+
+def make_root(tmp_path: Path) -> Path:
+    vendor = tmp_path / "usr" / "lib" / "systemd" / "system"
+    admin = tmp_path / "etc" / "systemd" / "system"
+    vendor.mkdir(parents=True)
+    (admin / "multi-user.target.wants").mkdir(parents=True)
+    (admin / "getty.target.wants").mkdir()
+
+    for name in ("ssh.service", "cups.service", "rpcbind.service", "getty@.service", "avahi-daemon.socket"):
+        (vendor / name).write_text(INSTALLED, encoding="utf-8")
+
+    (vendor / "systemd-journald.service").write_text(STATIC, encoding="utf-8")
+    (vendor / "multi-user.target").write_text("[Unit]\nDescription=Multi-User\n", encoding="utf-8")
+
+    os.symlink("/usr/lib/systemd/system/ssh.service", admin / "multi-user.target.wants" / "ssh.service")
+    os.symlink("/usr/lib/systemd/system/ssh.service", admin / "sshd.service")
+    os.symlink("/usr/lib/systemd/system/getty@.service", admin / "getty.target.wants" / "getty@tty1.service")
+    os.symlink("/dev/null", admin / "rpcbind.service")
+
+    return tmp_path
+
+
+def check(f, context: EngineContext, service: str):
+    return f(
+        rule_id=f.__name__,
+        control=f"Ensure {service} state",
+        params={"service": service},
+        executor=context.executor,
+        context=context
+    )
+
+
+@pytest.mark.services
+def test_read_units(tmp_path: Path) -> None:
+    units = read_units(RootFS(make_root(tmp_path)))
+
+    assert {name: unit.state for name, unit in units.items()} == {
+        "avahi-daemon.socket": "disabled",
+        "cups.service": "disabled",
+        "getty@.service": "disabled",
+        "getty@tty1.service": "enabled",
+        "multi-user.target": "static",
+        "rpcbind.service": "masked",
+        "ssh.service": "enabled",
+        "sshd.service": "enabled",
+        "systemd-journald.service": "static"
+    }
+    assert units["sshd.service"] is units["ssh.service"]
+    assert units["ssh.service"].path == "/usr/lib/systemd/system/ssh.service"
+
+
+@pytest.mark.services
+@pytest.mark.parametrize(
+    ("service", "enabled", "disabled", "masked"),
+    [
+        ("ssh", "PASSED", "FAILED", "FAILED"),
+        ("sshd.service", "PASSED", "FAILED", "FAILED"),
+        ("cups", "FAILED", "PASSED", "FAILED"),
+        ("rpcbind", "FAILED", "PASSED", "PASSED"),
+        ("avahi-daemon.socket", "FAILED", "PASSED", "FAILED"),
+        ("telnet", "FAILED", "PASSED", "PASSED")
+    ]
+)
+def test_service_controls(tmp_path: Path, service: str, enabled: str, disabled: str, masked: str) -> None:
+    context = EngineContext(executor=Executor(), root=RootFS(make_root(tmp_path)))
+
+    assert check(check_service_enabled, context, service).status == enabled
+    assert check(check_service_disabled, context, service).status == disabled
+    assert check(check_service_masked, context, service).status == masked
+
+
+@pytest.mark.services
+def test_service_messages(tmp_path: Path) -> None:
+    context = EngineContext(executor=Executor(), root=RootFS(make_root(tmp_path)))
+
+    assert check(check_service_enabled, context, "cups").message == "Service cups.service is disabled"
+    assert check(check_service_disabled, context, "ssh").message == "Service ssh.service is enabled"
+    assert check(check_service_masked, context, "telnet").message == "Service telnet.service is not installed"
+
+
+@pytest.mark.services
+def test_services_single_collection(tmp_path: Path) -> None:
+    policy = Policy(
+        category="Unit tests",
+        rules=[
+            Rule(rule_id=f"R{i}", control=control, params={"service": service})
+            for i, (control, service) in enumerate(
+                [
+                    ("service.enabled", "ssh"),
+                    ("service.disabled", "cups"),
+                    ("service.masked", "rpcbind"),
+                    ("service.disabled", "avahi-daemon.socket")
+                ]
+            )
+        ]
+    )
+    context = EngineContext(executor=Executor(), root=RootFS(make_root(tmp_path)))
+
+    results = run_policy(policy, executor=context.executor, root=context.root, facts=context.facts)
+
+    assert [result.status for result in results] == ["PASSED"] * 4
+    assert context.facts.misses == 1
+    assert context.facts.hits == 3
+
+
+@pytest.mark.services
+def test_service_empty_param() -> None:
+    context = EngineContext(executor=Executor())
+
+    result = check(check_service_enabled, context, " ")
+
+    assert result.status == "ERROR"
+    assert result.message == "params.service is empty"
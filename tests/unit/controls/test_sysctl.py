@@ -0,0 +1,136 @@
+from pathlib import Path
+
+import pytest
+
+from horus_audit.controls import check_sysctl_value
+from horus_audit.controls.sysctl import read_sysctl, read_sysctl_config
+from horus_audit.core.engine import EngineContext, run_policy
+from horus_audit.core.executor import Executor
+from horus_audit.core.rootfs import RootFS
+from horus_audit.core.rule import Policy, Rule
+
+
+def write(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def make_root(tmp_path: Path) -> Path:
+    write(tmp_path / "proc" / "sys" / "net" / "ipv4" / "ip_forward", "0\n")
+    write(tmp_path / "proc" / "sys" / "kernel" / "randomize_va_space", "2\n")
+    write(tmp_path / "proc" / "sys" / "net" / "ipv4" / "ip_local_port_range", "32768\t60999\n")
+
+    write(tmp_path / "usr" / "lib" / "sysctl.d" / "50-default.conf", "kernel.randomize_va_space = 1\n")
+    write(tmp_path / "usr" / "lib" / "sysctl.d" / "60-net.conf", "net.ipv4.ip_forward = 1\n")
+    write(tmp_path / "etc" / "sysctl.d" / "60-net.conf", "# masks /usr/lib\nnet/ipv4/ip_forward = 0\n")
+    write(tmp_path / "etc" / "sysctl.d" / "99-hardening.conf", "kernel.randomize_va_space = 2\n")
+    write(tmp_path / "etc" / "sysctl.conf", "; legacy\n-net.ipv4.ip_local_port_range = 32768 60999\n")
+
+    return tmp_path
+
+
+def check(context: EngineContext, key: str, value, **params):
+    return check_sysctl_value(
+        rule_id="sysctl.value",
+        control=f"Ensure {key} is {value}",
+        params={"key": key, "value": value, **params},
+        executor=context.executor,
+        context=context
+    )
+
+
+@pytest.mark.sysctl
+def test_read_sysctl(tmp_path: Path) -> None:
+    snapshot = read_sysctl(RootFS(make_root(tmp_path)))
+
+    assert snapshot == {
+        "net.ipv4.ip_forward": "0",
+        "net.ipv4.ip_local_port_range": "32768 60999",
+        "kernel.randomize_va_space": "2"
+    }
+
+
+@pytest.mark.sysctl
+def test_read_sysctl_config_precedence(tmp_path: Path) -> None:
+    config = read_sysctl_config(RootFS(make_root(tmp_path)))
+
+    assert config["net.ipv4.ip_forward"] == "0"
+    assert config["kernel.randomize_va_space"] == "2"
+    assert config["net.ipv4.ip_local_port_range"] == "32768 60999"
+
+
+@pytest.mark.sysctl
+def test_sysctl_value_passed(tmp_path: Path) -> None:
+    context = EngineContext(executor=Executor(), root=RootFS(make_root(tmp_path)))
+
+    result = check(context, "net.ipv4.ip_forward", 0)
+
+    assert result.status == "PASSED"
+    assert result.message == "Kernel parameter net.ipv4.ip_forward is set to 0"
+
+
+@pytest.mark.sysctl
+def test_sysctl_value_runtime_mismatch(tmp_path: Path) -> None:
+    context = EngineContext(executor=Executor(), root=RootFS(make_root(tmp_path)))
+
+    result = check(context, "kernel.randomize_va_space", "1", persistent=False)
+
+    assert result.status == "FAILED"
+    assert result.message == "Kernel parameter kernel.randomize_va_space is 2, expected 1"
+
+
+@pytest.mark.sysctl
+def test_sysctl_value_not_persistent(tmp_path: Path) -> None:
+    root = make_root(tmp_path)
+    write(root / "proc" / "sys" / "kernel" / "kptr_restrict", "1\n")
+    context = EngineContext(executor=Executor(), root=RootFS(root))
+
+    result = check(context, "kernel.kptr_restrict", 1)
+
+    assert result.status == "FAILED"
+    assert result.message == "Kernel parameter kernel.kptr_restrict is not persistently set to 1"
+
+
+@pytest.mark.sysctl
+def test_sysctl_value_offline_runtime(tmp_path: Path) -> None:
+    context = EngineContext(executor=Executor(), root=RootFS(make_root(tmp_path)))
+
+    result = check(context, "kernel.kptr_restrict", 1, persistent=False)
+
+    assert result.status == "SKIPPED"
+    assert result.message == "Kernel parameter kernel.kptr_restrict runtime value not available on offline root"
+
+
+@pytest.mark.sysctl
+def test_sysctl_single_snapshot(tmp_path: Path) -> None:
+    root = make_root(tmp_path)
+
+    for i in range(60):
+        write(root / "proc" / "sys" / "net" / "ipv4" / "conf" / f"eth{i}" / "rp_filter", "1\n")
+
+    policy = Policy(
+        category="Unit tests",
+        rules=[
+            Rule(
+                rule_id=f"R{i}",
+                control="sysctl.value",
+                params={"key": f"net.ipv4.conf.eth{i}.rp_filter", "value": 1, "persistent": False}
+            )
+            for i in range(60)
+        ]
+    )
+    context = EngineContext(executor=Executor(), root=RootFS(root))
+
+    results = run_policy(policy, executor=context.executor, root=context.root, facts=context.facts)
+
+    assert all(result.status == "PASSED" for result in results)
+    assert context.facts.misses == 1
+    assert context.facts.hits == 59
+
+
+@pytest.mark.sysctl
+def test_sysctl_empty_param() -> None:
+    result = check(EngineContext(executor=Executor()), "", 1)
+
+    assert result.status == "ERROR"
+    assert result.message == "params.key is empty"
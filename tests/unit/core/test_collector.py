@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import pytest
+
+from horus_audit.core.collector import Collector, CollectorClient
+from horus_audit.core.result import ControlResult
+
+
+def results(**statuses: str) -> list[ControlResult]:
+    return [
+        ControlResult(rule_id=rule_id, control="test", status=status, message=status.lower(), duration=0.1)
+        for rule_id, status in statuses.items()
+    ]
+
+
+@pytest.mark.collector
+def test_collector_deltas(tmp_path: Path) -> None:
+    batches = []
+    address = str(tmp_path / "collector.sock")
+
+    with Collector(address, sink=batches.append, batch_size=2) as collector:
+        with CollectorClient(address) as client:
+            assert client.push(host="web1", policy="CIS", results=results(R1="PASSED", R2="FAILED")) == 2
+            assert client.push(host="web2", policy="CIS", results=results(R1="FAILED", R2="FAILED")) == 2
+
+            # Unchanged results are not sent again
+            assert client.push(host="web1", policy="CIS", results=results(R1="PASSED", R2="PASSED")) == 1
+            assert client.push(host="web1", policy="CIS", results=results(R1="PASSED")) == 0
+
+        summary = collector.rule_summary()
+        worst = collector.worst_hosts()
+
+    assert summary["R1"]["PASSED"] == 1
+    assert summary["R1"]["FAILED"] == 1
+    assert summary["R2"]["FAILED"] == 1
+    assert summary["R2"]["PASSED"] == 0
+    assert worst == [("web2", 2)]
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[2][0][2].status == "PASSED"
+
+
+@pytest.mark.collector
+def test_collector_resync(tmp_path: Path) -> None:
+    address = str(tmp_path / "collector.sock")
+
+    with CollectorClient(address) as client:
+        with Collector(address):
+            client.push(host="web1", policy="CIS", results=results(R1="PASSED", R2="FAILED"))
+
+        client.close()
+
+        # A restarted collector asks for a snapshot
+        with Collector(address) as collector:
+            assert client.push(host="web1", policy="CIS", results=results(R1="PASSED", R2="FAILED")) == 2
+            assert collector.worst_hosts() == [("web1", 1)]
+
+
+@pytest.mark.collector
+def test_collector_deduplicates_snapshots(tmp_path: Path) -> None:
+    address = str(tmp_path / "collector.sock")
+
+    with Collector(address) as collector:
+        for _ in range(2):
+            # A restarted agent resends its snapshot
+            with CollectorClient(address) as client:
+                client.push(host="web1", policy="CIS", results=results(R1="PASSED", R2="FAILED"))
+
+    assert collector.received == 4
+    assert collector.duplicates == 2
+    assert collector.rule_summary()["R2"]["FAILED"] == 1
+
+
+@pytest.mark.collector
+def test_collector_localhost() -> None:
+    with Collector(("127.0.0.1", 0)) as collector:
+        with CollectorClient(collector.address) as client:
+            client.push(host="web1", policy="CIS", results=results(R1="ERROR"))
+
+        assert collector.rule_summary() == {
+            "R1": {"PASSED": 0, "FAILED": 0, "WARNING": 0, "SKIPPED": 0, "ERROR": 1}
+        }
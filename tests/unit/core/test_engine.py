@@ -1,6 +1,13 @@
+import hashlib
+import os
+import time
+
 import pytest
 
-from horus_audit.core.engine import run_policy
+from horus_audit.core.engine import Gate, run_policies, run_policy
+from horus_audit.core.executor import LocalExecutor
+from horus_audit.core.registry import register_control
+from horus_audit.core.result import ControlResult
 from horus_audit.core.rule import Policy, Rule
 
 
@@ -29,3 +36,280 @@ def test_engine_unknown_control_error() -> None:
 
     results = run_policy(policy, executor=Executor())
     assert results[0].status == "ERROR"
+
+
+@register_control("test.engine.none")
+def check_none(*, rule_id, control, params, executor, os_info=None, context=None) -> None:
+    return None
+
+
+@pytest.mark.engine
+def test_engine_invalid_result() -> None:
+    policy = Policy(
+        category="Unit tests",
+        rules=[
+            Rule(rule_id="R1", control="test.engine.none"),
+            Rule(rule_id="R2", control="Test control")
+        ]
+    )
+
+    results = run_policy(policy, executor=Executor())
+
+    assert [result.status for result in results] == ["ERROR", "ERROR"]
+    assert results[0].message == "Control returned NoneType instead of a result"
+
+
+@register_control("test.engine.cpu", cpu_bound=True)
+def check_cpu(*, rule_id, control, params, executor, os_info=None, context=None) -> ControlResult:
+    digest = hashlib.sha256(params["data"].encode("utf-8")).hexdigest()
+
+    return ControlResult.passed_(
+        rule_id=rule_id,
+        control=control,
+        message=f"{os.getpid()} {digest} {os_info}"
+    )
+
+
+@register_control("test.engine.io")
+def check_io(*, rule_id, control, params, executor, os_info=None, context=None) -> ControlResult:
+    return ControlResult.passed_(
+        rule_id=rule_id,
+        control=control,
+        message=f"{os.getpid()} {executor.run(['true']).code}"
+    )
+
+
+@pytest.mark.engine
+def test_engine_threads_keep_order() -> None:
+    policy = Policy(
+        category="Unit tests",
+        rules=[Rule(rule_id=f"R{i}", control="test.engine.io") for i in range(20)]
+    )
+
+    results = run_policy(policy, executor=Executor(), workers=4)
+
+    assert [result.rule_id for result in results] == [f"R{i}" for i in range(20)]
+    assert all(result.status == "PASSED" for result in results)
+
+
+@pytest.mark.engine
+def test_engine_cpu_bound_process_pool() -> None:
+    policy = Policy(
+        category="Unit tests",
+        rules=[
+            Rule(rule_id="R1", control="test.engine.cpu", params={"data": "horus"}),
+            Rule(rule_id="R2", control="test.engine.io"),
+            Rule(rule_id="R3", control="Test control")
+        ]
+    )
+
+    results = run_policy(
+        policy,
+        executor=LocalExecutor(),
+        os_info="ubuntu",
+        workers=2,
+        processes=1
+    )
+
+    pid, digest, os_info = results[0].message.split()
+
+    assert results[0].status == "PASSED"
+    assert int(pid) != os.getpid()
+    assert digest == hashlib.sha256(b"horus").hexdigest()
+    assert os_info == "ubuntu"
+    assert int(results[1].message.split()[0]) == os.getpid()
+    assert results[2].status == "ERROR"
+
+
+prepared = []
+
+
+def prepare_batch(rules, context) -> None:
+    prepared.append([rule.rule_id for rule in rules])
+    context.facts.get("test.engine.batch", lambda: len(rules))
+
+
+@register_control("test.engine.batch", prepare=prepare_batch)
+def check_batch(*, rule_id, control, params, executor, os_info=None, context=None) -> ControlResult:
+    return ControlResult.passed_(
+        rule_id=rule_id,
+        control=control,
+        message=str(context.facts.get("test.engine.batch", lambda: 0))
+    )
+
+
+@pytest.mark.engine
+def test_engine_prepare_hook() -> None:
+    policy = Policy(
+        category="Unit tests",
+        rules=[
+            Rule(rule_id="R1", control="test.engine.batch", params={}),
+            Rule(rule_id="R2", control="test.engine.io", params={}),
+            Rule(rule_id="R3", control="test.engine.batch", params={})
+        ]
+    )
+
+    results = run_policy(policy, executor=Executor(), workers=2)
+
+    assert prepared == [["R1", "R3"]]
+    assert results[0].message == results[2].message == "2"
+
+
+def prepare_failing(rules, context) -> None:
+    raise ValueError("Invalid parameters")
+
+
+@register_control("test.engine.unprepared", prepare=prepare_failing)
+def check_unprepared(*, rule_id, control, params, executor, os_info=None, context=None) -> ControlResult:
+    if "path" not in params:
+        raise ValueError("Missing path")
+
+    return ControlResult.passed_(rule_id=rule_id, control=control, message="Passed")
+
+
+@pytest.mark.engine
+def test_engine_prepare_hook_error() -> None:
+    policy = Policy(
+        category="Unit tests",
+        rules=[
+            Rule(rule_id="R1", control="test.engine.unprepared", params={"path": "/etc"}),
+            Rule(rule_id="R2", control="test.engine.unprepared", params={}),
+            Rule(rule_id="R3", control="test.engine.io", params={})
+        ]
+    )
+
+    results = run_policy(policy, executor=Executor())
+
+    assert [result.status for result in results] == ["PASSED", "ERROR", "PASSED"]
+    assert results[1].message == "Missing path"
+
+
+@register_control("test.engine.gate")
+def check_gate(*, rule_id, control, params, executor, os_info=None, context=None) -> ControlResult:
+    executed.append(rule_id)
+    time.sleep(params.get("sleep", 0))
+
+    if params.get("fail"):
+        return ControlResult.failed_(rule_id=rule_id, control=control, message="Failed")
+
+    return ControlResult.passed_(rule_id=rule_id, control=control, message="Passed")
+
+
+executed = []
+
+
+def gate_policy() -> Policy:
+    return Policy(
+        category="Gate",
+        rules=[
+            Rule(rule_id="low", control="test.engine.gate", params={"fail": True}, severity="low"),
+            Rule(rule_id="medium", control="test.engine.gate", params={}),
+            Rule(rule_id="critical", control="test.engine.gate", params={}, severity="critical"),
+            Rule(rule_id="urgent", control="test.engine.gate", params={"fail": True}, severity="critical", priority=5),
+            Rule(rule_id="high", control="test.engine.gate", params={"fail": True}, severity="high")
+        ]
+    )
+
+
+@pytest.mark.engine
+def test_engine_gate_sequential() -> None:
+    executed.clear()
+    notified = []
+    gate = Gate(threshold=1, severity="critical")
+
+    results = run_policy(gate_policy(), executor=Executor(), gate=gate, on_result=notified.append)
+
+    assert executed == ["urgent"]
+    assert [result.rule_id for result in results] == ["low", "medium", "critical", "urgent", "high"]
+    assert [result.status for result in results] == ["SKIPPED", "SKIPPED", "SKIPPED", "FAILED", "SKIPPED"]
+    assert results[0].message == "Not executed, gate tripped after 1 critical or more severe failures"
+    assert len(notified) == 5
+
+    # Counted per run, the same gate executes the next run again
+    executed.clear()
+    again = run_policy(gate_policy(), executor=Executor(), gate=gate)
+
+    assert [(result.status, result.message) for result in again] == [(result.status, result.message) for result in results]
+    assert executed == ["urgent"]
+
+
+@pytest.mark.engine
+def test_engine_gate_threshold() -> None:
+    executed.clear()
+    gate = Gate(threshold=2, severity="high")
+
+    results = run_policy(gate_policy(), executor=Executor(), gate=gate)
+
+    assert executed == ["urgent", "critical", "high"]
+    assert [result.status for result in results] == ["SKIPPED", "SKIPPED", "PASSED", "FAILED", "FAILED"]
+
+    executed.clear()
+    results = run_policy(gate_policy(), executor=Executor(), gate=Gate(threshold=3, severity="info"))
+
+    assert not any(result.status == "SKIPPED" for result in results)
+
+
+@pytest.mark.engine
+def test_engine_gate_cancels_pending_rules() -> None:
+    executed.clear()
+    rules = [Rule(rule_id="fail", control="test.engine.gate", params={"fail": True}, severity="critical")]
+    rules += [Rule(rule_id=f"R{i}", control="test.engine.gate", params={"sleep": 0.001}) for i in range(500)]
+    notified = []
+    gate = Gate()
+
+    results = run_policy(
+        Policy(category="Gate", rules=rules),
+        executor=Executor(),
+        workers=2,
+        gate=gate,
+        on_result=notified.append
+    )
+
+    skipped = [result for result in results if result.status == "SKIPPED"]
+
+    assert results[0].status == "FAILED"
+    assert skipped and len(executed) + len(skipped) == 501
+    assert all(result.message == "Not executed, gate tripped after 1 critical or more severe failures" for result in skipped)
+    assert sorted(result.rule_id for result in notified) == sorted(rule.rule_id for rule in rules)
+
+
+@pytest.mark.engine
+def test_engine_gate_validation() -> None:
+    with pytest.raises(ValueError):
+        Gate(threshold=0)
+
+    with pytest.raises(ValueError):
+        Gate(severity="urgent")
+
+
+@pytest.mark.engine
+def test_engine_run_policies_deduplicates_rules() -> None:
+    executed.clear()
+    level1 = Policy(
+        category="L1",
+        rules=[
+            Rule(rule_id="L1-1", control="test.engine.gate", params={"fail": True, "sleep": 0}),
+            Rule(rule_id="L1-2", control="test.engine.gate", params={})
+        ]
+    )
+    level2 = Policy(
+        category="L2",
+        rules=[
+            Rule(rule_id="L2-1", control="test.engine.gate", params={"sleep": 0, "fail": True}, severity="critical"),
+            Rule(rule_id="L2-2", control="test.engine.gate", params={"sleep": 0})
+        ]
+    )
+
+    results = run_policies([level1, level2], executor=Executor(), workers=2)
+
+    assert sorted(executed) == ["L1-1", "L1-2", "L2-2"]
+    assert [[result.rule_id for result in policy] for policy in results] == [["L1-1", "L1-2"], ["L2-1", "L2-2"]]
+    assert [[result.status for result in policy] for policy in results] == [["FAILED", "PASSED"], ["FAILED", "PASSED"]]
+    assert results[0][0] is not results[1][0]
+
+    # The shared rule runs first with the critical severity of its L2 copy
+    executed.clear()
+    results = run_policies([level1, level2], executor=Executor(), gate=Gate())
+
+    assert executed == ["L1-1"]
+    assert [result.status for result in results[1]] == ["FAILED", "SKIPPED"]
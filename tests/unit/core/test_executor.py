@@ -1,9 +1,10 @@
 import pytest
 from pytest import MonkeyPatch
+import pickle
 import shutil
 
 from horus_audit.core.exceptions import ExecutorError
-from horus_audit.core.executor import LocalExecutor
+from horus_audit.core.executor import LocalExecutor, PersistentExecutor
 
 
 @pytest.mark.executor
@@ -40,3 +41,62 @@ def test_local_executor_command_not_found(monkeypatch: MonkeyPatch) -> None:
 
     with pytest.raises(ExecutorError):
         executor.run(argv=["echo", "hello"])
+
+
+@pytest.mark.executor
+def test_persistent_executor_run_argv() -> None:
+    with PersistentExecutor() as executor:
+        result = executor.run(argv=["echo", "hello"])
+
+    assert result.code == 0
+    assert result.stdout == "hello"
+
+
+@pytest.mark.executor
+def test_persistent_executor_reuses_helper() -> None:
+    with PersistentExecutor() as executor:
+        first = executor.run(argv=["sh", "-c", "echo $PPID"])
+        second = executor.run(argv=["sh", "-c", "echo $PPID"])
+
+    assert first.code == 0
+    assert first.stdout == second.stdout
+
+
+@pytest.mark.executor
+def test_persistent_executor_exit_code() -> None:
+    with PersistentExecutor(pool_size=2) as executor:
+        result = executor.run(argv=["sh", "-c", "echo oops >&2; exit 3"])
+
+    assert result.code == 3
+    assert result.stderr == "oops"
+
+
+@pytest.mark.executor
+def test_persistent_executor_timeout() -> None:
+    with PersistentExecutor() as executor:
+        result = executor.run(argv=["sleep", "5"], timeout=1)
+        after = executor.run(argv=["echo", "hello"])
+
+    assert result.code == 124
+    assert after.stdout == "hello"
+
+
+@pytest.mark.executor
+def test_persistent_executor_command_not_allowed() -> None:
+    with PersistentExecutor(allowed_commands={"echo"}) as executor:
+        with pytest.raises(ExecutorError):
+            executor.run(argv=["printf", "hello"])
+
+
+@pytest.mark.executor
+def test_persistent_executor_pickle() -> None:
+    with PersistentExecutor(allowed_commands={"echo"}) as executor:
+        executor.run(argv=["echo", "hello"])
+
+        with pickle.loads(pickle.dumps(executor)) as clone:
+            result = clone.run(argv=["echo", "hello"])
+
+            with pytest.raises(ExecutorError):
+                clone.run(argv=["printf", "hello"])
+
+    assert result.stdout == "hello"
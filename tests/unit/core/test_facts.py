@@ -0,0 +1,85 @@
+from concurrent.futures import ThreadPoolExecutor
+import pickle
+import threading
+import time
+
+import pytest
+
+from horus_audit.core.facts import FactCache
+
+
+@pytest.mark.facts
+def test_fact_cache_collects_once() -> None:
+    cache = FactCache()
+    calls = []
+
+    def collect():
+        calls.append(1)
+        return {"key": "value"}
+
+    assert cache.get("fact", collect) == {"key": "value"}
+    assert cache.get("fact", collect) == {"key": "value"}
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.facts
+def test_fact_cache_concurrent_collection() -> None:
+    cache = FactCache()
+    calls = []
+    lock = threading.Lock()
+
+    def collect():
+        with lock:
+            calls.append(1)
+        time.sleep(0.05)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        values = list(pool.map(lambda _: cache.get("fact", collect), range(8)))
+
+    assert values == [42] * 8
+    assert len(calls) == 1
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: cache.get("fact", collect), range(1000)))
+
+    assert (cache.hits, cache.misses) == (1007, 1)
+
+
+@pytest.mark.facts
+def test_fact_cache_failure_not_cached() -> None:
+    cache = FactCache()
+
+    def fail():
+        raise OSError("unavailable")
+
+    with pytest.raises(OSError):
+        cache.get("fact", fail)
+
+    assert cache.get("fact", lambda: 1) == 1
+
+
+@pytest.mark.facts
+def test_fact_cache_pickle_snapshot() -> None:
+    cache = FactCache()
+    cache.get("fact", lambda: [1, 2, 3])
+
+    clone = pickle.loads(pickle.dumps(cache))
+
+    assert clone.has("fact")
+    assert clone.get("fact", lambda: None) == [1, 2, 3]
+
+
+@pytest.mark.facts
+def test_fact_cache_clear() -> None:
+    cache = FactCache()
+
+    for i in range(10):
+        cache.get(f"fact{i}", lambda: i)
+
+    cache.clear()
+
+    # Per fact locks do not pile up across runs
+    assert not cache.has("fact0")
+    assert cache._locks == {}
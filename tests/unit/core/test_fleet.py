@@ -0,0 +1,121 @@
+import pytest
+
+import horus_audit.controls  # noqa: F401
+from horus_audit.core.executor import ExecutionResult, Executor
+from horus_audit.core.fleet import audit_roots, run_fleet
+from horus_audit.core.registry import register_control
+from horus_audit.core.remote import LocalTransport
+from horus_audit.core.result import ControlResult
+from horus_audit.core.rule import Policy, Rule
+
+
+@register_control("test.fleet.echo")
+def check_echo(*, rule_id, control, params, executor, **kwargs) -> ControlResult:
+    result = executor.run(["echo", params["value"]])
+
+    if result.stdout == params["value"]:
+        return ControlResult.passed_(rule_id=rule_id, control=control, message=result.stdout)
+
+    return ControlResult.failed_(rule_id=rule_id, control=control, message=result.stdout)
+
+
+@pytest.mark.fleet
+def test_run_fleet() -> None:
+    policy = Policy(
+        category="Unit tests",
+        rules=[
+            Rule(rule_id="R1", control="test.fleet.echo", params={"value": "one"}),
+            Rule(rule_id="R2", control="test.fleet.echo", params={"value": "two"})
+        ]
+    )
+
+    hosts = [LocalTransport(f"host-{i}") for i in range(5)]
+
+    audits = list(run_fleet(policy, hosts, max_connections=2))
+
+    assert sorted(audit.host for audit in audits) == [f"host-{i}" for i in range(5)]
+
+    for audit in audits:
+        assert audit.error is None
+        assert [result.status for result in audit.results] == ["PASSED", "PASSED"]
+
+
+@pytest.mark.fleet
+def test_run_fleet_unreachable_host() -> None:
+    policy = Policy(
+        category="Unit tests",
+        rules=[Rule(rule_id="R1", control="test.fleet.echo", params={"value": "one"})]
+    )
+
+    audits = list(run_fleet(policy, [LocalTransport("broken", shell="/nonexistent")]))
+
+    assert audits[0].host == "broken"
+    assert audits[0].results == []
+    assert "Unable to start process" in audits[0].error
+
+
+@pytest.mark.fleet
+def test_run_fleet_host_not_answering() -> None:
+    policy = Policy(
+        category="Unit tests",
+        rules=[Rule(rule_id=f"R{i}", control="test.fleet.echo", params={"value": "one"}) for i in range(3)]
+    )
+
+    audits = list(run_fleet(policy, [LocalTransport("down", shell="/bin/false")]))
+
+    assert audits[0].results == []
+    assert audits[0].error.startswith("Unable to connect to down")
+
+
+class EchoExecutor(Executor):
+    def run(self, argv, *, timeout=10):
+        return ExecutionResult(stdout=argv[1], stderr="", code=0)
+
+
+@pytest.mark.fleet
+def test_run_fleet_plain_executor() -> None:
+    policy = Policy(
+        category="Unit tests",
+        rules=[Rule(rule_id="R1", control="test.fleet.echo", params={"value": "one"})]
+    )
+
+    # Neither connected nor closed
+    audits = list(run_fleet(policy, [LocalTransport("host")], executor_factory=lambda transport: EchoExecutor()))
+
+    assert audits[0].error is None
+    assert [result.status for result in audits[0].results] == ["PASSED"]
+
+
+@pytest.mark.fleet
+def test_audit_roots(tmp_path) -> None:
+    roots = []
+
+    for i, fstype in enumerate(["ext4", "tmpfs"]):
+        root = tmp_path / f"root-{i}"
+        (root / "etc").mkdir(parents=True)
+        (root / "etc" / "fstab").write_text(
+            f"# static\ntmpfs /tmp {fstype} rw,nodev,nosuid,noexec 0 0\n"
+        )
+        roots.append(root)
+
+    policy = Policy(
+        category="Unit tests",
+        rules=[
+            Rule(
+                rule_id="R1",
+                control="filesystem.partition",
+                params={
+                    "partition": "/tmp",
+                    "fstype": ["tmpfs"],
+                    "options": ["nodev", "nosuid", "noexec"]
+                }
+            )
+        ]
+    )
+    facts = {}
+
+    audits = {audit.root.root: audit for audit in audit_roots(policy, roots, facts=facts)}
+
+    assert audits[roots[0]].results[0].status == "FAILED"
+    assert audits[roots[1]].results[0].status == "PASSED"
+    assert len(facts) == 2
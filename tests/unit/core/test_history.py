@@ -0,0 +1,143 @@
+import atexit
+from pathlib import Path
+import sqlite3
+import time
+
+import pytest
+
+from horus_audit.core.engine import run_policy
+from horus_audit.core.history import Change, Flapping, ResultStore
+from horus_audit.core.registry import register_control
+from horus_audit.core.result import ControlResult
+from horus_audit.core.rule import Policy, Rule
+
+
+DAY = 86400
+
+
+def results(**statuses: str) -> list[ControlResult]:
+    return [
+        ControlResult(rule_id=rule_id, control=rule_id, status=status, message=status.lower(), duration=0.1)
+        for rule_id, status in statuses.items()
+    ]
+
+
+@register_control("test.history.sleep")
+def check_sleep(*, rule_id, control, params, executor, os_info=None, context=None) -> ControlResult:
+    time.sleep(0.01)
+
+    return ControlResult.passed_(rule_id=rule_id, control=control, message="")
+
+
+@pytest.mark.history
+def test_history_record(tmp_path: Path) -> None:
+    with ResultStore(tmp_path / "history.db") as store:
+        store.record(host="web1", policy="CIS", results=results(R1="PASSED", R2="FAILED"))
+        store.flush()
+
+    with sqlite3.connect(tmp_path / "history.db") as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        rows = connection.execute(
+            "SELECT host, policy, rule_id, status, message, duration FROM results JOIN runs USING (run_id)"
+        ).fetchall()
+
+    assert sorted(rows) == [
+        ("web1", "CIS", "R1", "PASSED", "passed", 0.1),
+        ("web1", "CIS", "R2", "FAILED", "failed", 0.1)
+    ]
+
+
+@pytest.mark.history
+def test_history_changes(tmp_path: Path) -> None:
+    with ResultStore(tmp_path / "history.db") as store:
+        store.record(host="web1", policy="CIS", results=results(R1="PASSED", R2="FAILED", R3="PASSED"))
+        store.record(host="web2", policy="CIS", results=results(R1="FAILED"))
+        store.record(host="web1", policy="CIS", results=results(R1="PASSED", R2="PASSED", R4="ERROR"))
+
+        changes = store.changes(host="web1", policy="CIS")
+
+    assert changes == [
+        Change(rule_id="R2", previous="FAILED", current="PASSED", message="passed"),
+        Change(rule_id="R3", previous="PASSED", current=None, message=""),
+        Change(rule_id="R4", previous=None, current="ERROR", message="error")
+    ]
+
+
+@pytest.mark.history
+def test_history_flapping_and_pass_rate(tmp_path: Path) -> None:
+    now = time.time()
+    runs = [
+        (40, "PASSED", "PASSED"),
+        (4, "PASSED", "FAILED"),
+        (3, "FAILED", "FAILED"),
+        (2, "PASSED", "FAILED"),
+        (1, "FAILED", "FAILED")
+    ]
+
+    with ResultStore(tmp_path / "history.db") as store:
+        for age, r1, r2 in runs:
+            store.record(host="web1", policy="CIS", results=results(R1=r1, R2=r2), started_at=now - age * DAY)
+
+        store.record(host="web2", policy="CIS", results=results(R1="PASSED"), started_at=now)
+
+        assert store.flapping(min_changes=3) == [Flapping(host="web1", rule_id="R1", changes=3)]
+        assert store.flapping(min_changes=3, host="web2") == []
+        assert store.pass_rate() == {"R1": 0.6, "R2": 0.0}
+        assert store.pass_rate(host="web1", days=60) == {"R1": 0.6, "R2": 0.2}
+
+
+@pytest.mark.history
+def test_history_batched_writes(tmp_path: Path) -> None:
+    with ResultStore(tmp_path / "history.db", batch_size=16) as store:
+        for i in range(100):
+            store.record(host=f"host{i}", policy="CIS", results=results(R1="PASSED"))
+
+        assert store.pass_rate() == {"R1": 1.0}
+
+
+@pytest.mark.history
+def test_engine_rule_duration(tmp_path: Path) -> None:
+    policy = Policy(
+        category="Unit tests",
+        rules=[Rule(rule_id="R1", control="test.history.sleep"), Rule(rule_id="R2", control="unknown")]
+    )
+
+    timed = run_policy(policy)
+
+    assert timed[0].duration >= 0.01
+    assert timed[1].duration == 0.0
+
+
+@pytest.mark.history
+def test_history_closed_at_exit(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    handlers = []
+    monkeypatch.setattr(atexit, "register", handlers.append)
+
+    store = ResultStore(tmp_path / "history.db")
+    store.record(host="web1", policy="CIS", results=results(R1="PASSED"))
+
+    # Interpreter exit without close
+    for handler in handlers:
+        handler()
+
+    with sqlite3.connect(tmp_path / "history.db") as connection:
+        assert connection.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 1
+
+
+@pytest.mark.history
+def test_history_closed(tmp_path: Path) -> None:
+    with ResultStore(tmp_path / "history.db") as store:
+        store.record(host="web1", policy="CIS", results=results(R1="PASSED"))
+
+    store.close()
+
+    # The writer is gone, nothing waits on it
+    with pytest.raises(ValueError):
+        store.record(host="web1", policy="CIS", results=results(R1="FAILED"))
+
+    with pytest.raises(ValueError):
+        store.flush()
+
+    assert store.changes(host="web1", policy="CIS") == [
+        Change(rule_id="R1", previous=None, current="PASSED", message="passed")
+    ]
@@ -0,0 +1,151 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from horus_audit.core.engine import Gate, run_policy
+from horus_audit.core.journal import Journal
+from horus_audit.core.registry import register_control
+from horus_audit.core.result import ControlResult
+from horus_audit.core.rule import Policy, Rule
+
+
+executed = []
+interrupted = set()
+
+
+@register_control("test.journal.check")
+def check(*, rule_id, control, params, executor, os_info=None, context=None) -> ControlResult:
+    if params.get("interrupt") and rule_id not in interrupted:
+        interrupted.add(rule_id)
+        raise KeyboardInterrupt
+
+    executed.append(rule_id)
+
+    if params.get("fail"):
+        return ControlResult.failed_(rule_id=rule_id, control=control, message="Failed")
+
+    return ControlResult.passed_(rule_id=rule_id, control=control, message="Passed")
+
+
+def journal_policy(**params: dict) -> Policy:
+    return Policy(
+        category="Unit tests",
+        rules=[Rule(rule_id=f"R{i}", control="test.journal.check", params=params.get(f"R{i}", {})) for i in range(5)]
+    )
+
+
+def journal_lines(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.mark.journal
+@pytest.mark.parametrize("workers", [1, 3])
+def test_journal_resume(tmp_path: Path, workers: int) -> None:
+    executed.clear()
+    interrupted.clear()
+    policy = journal_policy(R3={"interrupt": True})
+
+    with pytest.raises(KeyboardInterrupt):
+        run_policy(policy, journal=tmp_path / "run.journal")
+
+    # Interrupted run, R0 to R2 completed and synced when the journal closed
+    assert [line["rule_id"] for line in journal_lines(tmp_path / "run.journal")[1:]] == ["R0", "R1", "R2"]
+
+    executed.clear()
+    results = run_policy(policy, workers=workers, journal=tmp_path / "run.journal", resume=True)
+
+    assert sorted(executed) == ["R3", "R4"]
+    assert [result.rule_id for result in results] == ["R0", "R1", "R2", "R3", "R4"]
+    assert all(result.status == "PASSED" for result in results)
+    assert journal_lines(tmp_path / "run.journal")[-1] == {"complete": True}
+
+    # A completed journal is never resumed
+    executed.clear()
+    run_policy(policy, journal=tmp_path / "run.journal", resume=True)
+
+    assert executed == ["R0", "R1", "R2", "R3", "R4"]
+
+
+@pytest.mark.journal
+def test_journal_not_resumed(tmp_path: Path) -> None:
+    executed.clear()
+    interrupted.clear()
+    policy = journal_policy(R3={"interrupt": True})
+    (tmp_path / "a").mkdir()
+
+    with pytest.raises(KeyboardInterrupt):
+        run_policy(policy, root=tmp_path / "a", journal=tmp_path / "run.journal")
+
+    # Another root
+    executed.clear()
+    interrupted.clear()
+
+    with pytest.raises(KeyboardInterrupt):
+        run_policy(policy, root=tmp_path, journal=tmp_path / "run.journal", resume=True)
+
+    assert executed == ["R0", "R1", "R2"]
+
+    # Resume not requested
+    executed.clear()
+    run_policy(policy, root=tmp_path, journal=tmp_path / "run.journal")
+
+    assert executed == ["R0", "R1", "R2", "R3", "R4"]
+
+
+@pytest.mark.journal
+def test_journal_other_policy(tmp_path: Path) -> None:
+    executed.clear()
+    run_policy(journal_policy(), journal=tmp_path / "run.journal")
+
+    executed.clear()
+    run_policy(journal_policy(R1={"fail": True}), journal=tmp_path / "run.journal", resume=True)
+
+    assert executed == ["R0", "R1", "R2", "R3", "R4"]
+    assert len(journal_lines(tmp_path / "run.journal")) == 7
+
+
+@pytest.mark.journal
+def test_journal_torn_line(tmp_path: Path) -> None:
+    policy = journal_policy()
+    path = tmp_path / "run.journal"
+
+    with Journal(path, policy) as journal:
+        journal.record(ControlResult.passed_(rule_id="R0", control="test.journal.check", message="Passed"))
+        journal.record(ControlResult.passed_(rule_id="R1", control="test.journal.check", message="Passed"))
+
+    with path.open("ab") as f:
+        f.write(b'{"rule_id": "R2", "control": "test.jou')
+
+    with Journal(path, policy, resume=True) as journal:
+        assert sorted(journal.completed) == ["R0", "R1"]
+
+    assert path.read_bytes().endswith(b"}\n")
+    assert len(journal_lines(path)) == 3
+
+
+@pytest.mark.journal
+def test_journal_gate(tmp_path: Path) -> None:
+    executed.clear()
+    policy = journal_policy(R1={"fail": True})
+
+    results = run_policy(policy, gate=Gate(severity="medium"), journal=tmp_path / "run.journal")
+
+    # Skipped rules were not executed and are not journaled
+    assert [result.status for result in results] == ["PASSED", "FAILED", "SKIPPED", "SKIPPED", "SKIPPED"]
+    assert [line.get("rule_id") for line in journal_lines(tmp_path / "run.journal")[1:]] == ["R0", "R1", None]
+
+
+@pytest.mark.journal
+def test_journal_batched_sync(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    syncs = []
+    monkeypatch.setattr(os, "fdatasync", syncs.append)
+
+    with Journal(tmp_path / "run.journal", journal_policy(), batch_size=4, interval=3600) as journal:
+        for i in range(10):
+            journal.record(ControlResult.passed_(rule_id=f"R{i}", control="test.journal.check", message="Passed"))
+
+        assert len(syncs) == 2
+
+    assert len(syncs) == 3
@@ -0,0 +1,167 @@
+import os
+from pathlib import Path
+import pickle
+import subprocess
+
+import pytest
+
+from horus_audit.controls.content import scan_counter
+from horus_audit.controls.packages import inventory_counter
+from horus_audit.core.engine import run_policy
+from horus_audit.core.executor import ExecutionResult, Executor, LocalExecutor
+from horus_audit.core.facts import FactCache
+from horus_audit.core.metrics import (
+    CacheCounter,
+    MeteredExecutor,
+    cache_counts,
+    collect_metrics,
+    register_cache,
+    render_metrics,
+    write_metrics
+)
+from horus_audit.core.registry import register_control
+from horus_audit.core.result import ControlResult
+from horus_audit.core.rule import Policy, Rule
+
+
+class StubExecutor(Executor):
+    def run(self, argv, *, timeout=10):
+        return ExecutionResult(stdout="", stderr="", code=124 if argv[0] == "sleep" else 0)
+
+
+def results() -> list[ControlResult]:
+    return [
+        ControlResult(rule_id="R1", control="sysctl.value", status="PASSED", message="", duration=0.0004),
+        ControlResult(rule_id="R2", control="sysctl.value", status="FAILED", message="", duration=0.02),
+        ControlResult(rule_id="R3", control='file."x"', status="ERROR", message="", duration=3.0)
+    ]
+
+
+def samples(text: str) -> dict[str, float]:
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if not line.startswith("#")
+    }
+
+
+@pytest.mark.metrics
+def test_metered_executor_counts_commands_and_timeouts() -> None:
+    executor = MeteredExecutor(StubExecutor())
+
+    executor.run(["/usr/bin/lsmod"])
+    executor.run(["lsmod"])
+    executor.run(["sleep", "60"])
+    executor.run_text("/usr/bin/rpm", "-qa")
+
+    assert executor.commands == {"lsmod": 2, "sleep": 1, "rpm": 1}
+    assert executor.timeouts == 1
+
+    # Shipped to worker processes
+    assert pickle.loads(pickle.dumps(executor)).commands == {}
+
+
+@register_control("test.metrics.cpu", cpu_bound=True)
+def check_cpu(*, rule_id, control, params, executor, os_info=None, context=None) -> ControlResult:
+    executor.run(["true"])
+
+    return ControlResult.passed_(rule_id=rule_id, control=control, message="Passed")
+
+
+@pytest.mark.metrics
+def test_metered_executor_worker_counts() -> None:
+    executor = MeteredExecutor(LocalExecutor())
+    policy = Policy(
+        category="Unit tests",
+        rules=[Rule(rule_id=f"R{i}", control="test.metrics.cpu") for i in range(3)]
+    )
+
+    results = run_policy(policy, executor=executor, workers=2, processes=1)
+
+    assert all(result.status == "PASSED" for result in results)
+    assert executor.commands == {"true": 3}
+
+
+@pytest.mark.metrics
+def test_registered_cache_counts_the_run() -> None:
+    counter = CacheCounter()
+    register_cache("test.metrics", counter)
+    counter.hit()
+    counter.miss()
+
+    baseline = cache_counts()
+    counter.hit()
+    counter.hit()
+    scan_counter.hit()
+    inventory_counter.miss()
+
+    metrics = collect_metrics(policy="CIS", results=results(), duration=1.0, baseline=baseline)
+
+    assert metrics.caches["test.metrics"] == (2, 0)
+    assert metrics.caches["content"] == (1, 0)
+    assert metrics.caches["packages"] == (0, 1)
+    assert metrics.caches["config"] == (0, 0)
+
+
+@pytest.mark.metrics
+def test_render_metrics() -> None:
+    facts = FactCache()
+    facts.get("a", lambda: 1)
+    facts.get("a", lambda: 1)
+    facts.get("a", lambda: 1)
+
+    executor = MeteredExecutor(StubExecutor())
+    executor.run(["find"])
+    executor.run(["sleep", "60"])
+
+    text = render_metrics(collect_metrics(
+        policy="CIS",
+        results=results(),
+        duration=1.5,
+        executor=executor,
+        caches={"facts": facts}
+    ))
+    values = samples(text)
+
+    assert text.endswith("# EOF\n")
+    assert "# TYPE horus_audit_control_duration_seconds histogram" in text
+    assert values['horus_audit_run_duration_seconds{policy="CIS"}'] == 1.5
+    assert values['horus_audit_results{policy="CIS",control="sysctl.value",status="FAILED"}'] == 1
+    assert values['horus_audit_results{policy="CIS",control="file.\\"x\\"",status="ERROR"}'] == 1
+    assert values['horus_audit_status_results{policy="CIS",status="SKIPPED"}'] == 0
+    assert values['horus_audit_control_duration_seconds_bucket{policy="CIS",control="sysctl.value",le="0.001"}'] == 1
+    assert values['horus_audit_control_duration_seconds_bucket{policy="CIS",control="sysctl.value",le="0.025"}'] == 2
+    assert values['horus_audit_control_duration_seconds_bucket{policy="CIS",control="sysctl.value",le="+Inf"}'] == 2
+    assert values['horus_audit_control_duration_seconds_count{policy="CIS",control="file.\\"x\\""}'] == 1
+    assert values['horus_audit_commands{policy="CIS",command="find"}'] == 1
+    assert values['horus_audit_command_timeouts{policy="CIS"}'] == 1
+    assert values['horus_audit_cache_hits{policy="CIS",cache="facts"}'] == 2
+    assert values['horus_audit_cache_hit_ratio{policy="CIS",cache="facts"}'] == pytest.approx(2 / 3)
+    assert values['horus_audit_max_rss_bytes{policy="CIS",process="self"}'] > 0
+
+
+@pytest.mark.metrics
+def test_write_metrics_counts_children(tmp_path: Path) -> None:
+    subprocess.run(["true"], check=True)
+
+    path = tmp_path / "textfile" / "horus.prom"
+    write_metrics(path, collect_metrics(policy="CIS", results=results(), duration=1.0))
+
+    values = samples(path.read_text(encoding="utf-8"))
+
+    assert os.stat(path).st_mode & 0o777 == 0o644
+    assert os.listdir(path.parent) == ["horus.prom"]
+    assert values['horus_audit_max_rss_bytes{policy="CIS",process="children"}'] > 0
+
+
+@pytest.mark.metrics
+def test_write_metrics_failure(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(*args) -> None:
+        raise PermissionError("Read-only file system")
+
+    monkeypatch.setattr(os, "replace", fail)
+
+    with pytest.raises(PermissionError):
+        write_metrics(tmp_path / "horus.prom", collect_metrics(policy="CIS", results=results(), duration=1.0))
+
+    assert os.listdir(tmp_path) == []
@@ -122,3 +122,82 @@ def test_detect_os_fallback(monkeypatch: MonkeyPatch) -> None:
     assert os_info.kernel_version == "5.15.0-generic"
     assert os_info.architecture == "aarch64"
     assert os_info.hostname == "test-hostname"
+
+
+@pytest.mark.os_info
+def test_detect_os_lazy(monkeypatch: MonkeyPatch) -> None:
+    calls = []
+
+    class Distro:
+        @staticmethod
+        def id():
+            calls.append("id")
+            return "debian"
+
+        name = staticmethod(lambda: "Debian GNU/Linux")
+        version = staticmethod(lambda pretty=True, best=True: "12")
+        major_version = staticmethod(lambda: "12")
+        like = staticmethod(lambda: "")
+
+    monkeypatch.setattr("horus_audit.core.os_info.logger", Logger())
+    monkeypatch.setattr("horus_audit.core.os_info.distro", Distro)
+
+    os_info = detect_os()
+
+    assert os_info.architecture
+    assert calls == []
+    assert os_info.family == "debian"
+    assert os_info.name == "Debian GNU/Linux"
+    assert calls == ["id"]
+
+
+@pytest.mark.os_info
+def test_detect_os_cache(monkeypatch: MonkeyPatch, tmp_path) -> None:
+    calls = []
+
+    class Distro:
+        @staticmethod
+        def id():
+            calls.append("id")
+            return "rocky"
+
+        name = staticmethod(lambda: "Rocky Linux")
+        version = staticmethod(lambda pretty=True, best=True: "9.4 (Blue Onyx)")
+        major_version = staticmethod(lambda: "9")
+        like = staticmethod(lambda: "rhel centos fedora")
+
+    os_release = tmp_path / "os-release"
+    os_release.write_text('ID="rocky"\n', encoding="utf-8")
+    boot_id = tmp_path / "boot_id"
+    boot_id.write_text("b1\n", encoding="utf-8")
+    cache = tmp_path / "cache" / "os_info.json"
+
+    monkeypatch.setattr("horus_audit.core.os_info.logger", Logger())
+    monkeypatch.setattr("horus_audit.core.os_info.distro", Distro)
+    monkeypatch.setattr("horus_audit.core.os_info.OS_RELEASE", str(os_release))
+    monkeypatch.setattr("horus_audit.core.os_info.BOOT_ID", str(boot_id))
+
+    first = detect_os(cache_path=cache).resolve()
+    second = detect_os(cache_path=cache).resolve()
+
+    assert first == second
+    assert second.family == "rhel"
+    assert calls == ["id"]
+
+    # A reboot invalidates the cache
+    boot_id.write_text("b2\n", encoding="utf-8")
+
+    assert detect_os(cache_path=cache).version == "9.4 (Blue Onyx)"
+    assert calls == ["id", "id"]
+
+
+@pytest.mark.os_info
+def test_os_info_fields() -> None:
+    os_info = OSInfo(hostname="web1", name="Ubuntu", kernel_version="6.8.0-45-generic")
+
+    assert os_info.hostname == "web1"
+    assert os_info.kernel_version == "6.8.0-45-generic"
+    assert "architecture" not in repr(os_info)
+
+    with pytest.raises(TypeError):
+        OSInfo(kernel="6.1")
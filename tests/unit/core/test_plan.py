@@ -0,0 +1,102 @@
+from pathlib import Path
+
+import pytest
+
+import horus_audit.controls  # noqa: F401
+from horus_audit.core.engine import run_policy
+from horus_audit.core.exceptions import PolicyError
+from horus_audit.core.executor import ExecutionResult, Executor
+from horus_audit.core.plan import COMMAND_COST, DEFAULT_COST, ExecutionPlan, compile_plan, control_costs, explain
+from horus_audit.core.result import ControlResult
+from horus_audit.core.rootfs import RootFS
+from horus_audit.core.rule import Policy, Rule
+
+
+class CountingExecutor(Executor):
+    def __init__(self):
+        self.commands = []
+
+    def run(self, argv, *, timeout=10):
+        self.commands.append(argv)
+        return ExecutionResult(stdout="", stderr="", code=0)
+
+
+def policy() -> Policy:
+    return Policy(
+        category="Plan",
+        rules=[
+            Rule(rule_id="P1", control="sysctl.value", params={"key": "net.ipv4.ip_forward", "value": 0}),
+            Rule(rule_id="P2", control="filesystem.module_disabled", params={"module": "cramfs"}),
+            Rule(rule_id="P3", control="filesystem.module_disabled", params={"module": "cramfs"}, severity="critical"),
+            Rule(rule_id="P4", control="service.enabled", params={"service": "sshd"}),
+            Rule(rule_id="P5", control="filesystem.module_disabled", params={}),
+            Rule(rule_id="P6", control="test.plan.unknown", params={})
+        ]
+    )
+
+
+@pytest.mark.plan
+def test_compile_plan(tmp_path: Path) -> None:
+    root = RootFS(tmp_path)
+    plan = compile_plan(policy(), root=root)
+    find = ["find", f"{tmp_path}/lib/modules/", "-type", "f", "-name", "cramfs*.ko*"]
+
+    assert plan.order == [2, 0, 1, 3, 4, 5]
+    assert [(batch.control, batch.prepare, batch.rules) for batch in plan.batches] == [
+        ("sysctl.value", False, [0]),
+        ("filesystem.module_disabled", True, [1, 2, 4]),
+        ("service.enabled", False, [3]),
+        ("test.plan.unknown", False, [5])
+    ]
+    assert plan.facts == {
+        "sysctl": None,
+        "sysctl.config": None,
+        "modprobe.d": None,
+        "content.plan": None,
+        "services": None
+    }
+    assert plan.commands == [find]
+    assert plan.predicted_commands() == 2
+    assert plan.steps[0].function == "horus_audit.controls.sysctl.check_sysctl_value"
+    assert plan.steps[1].cost == DEFAULT_COST + COMMAND_COST
+    assert plan.steps[4].commands == [] and plan.steps[4].declared
+    assert plan.steps[5].function is None and not plan.steps[5].declared
+    assert plan.predicted_duration(workers=4) < plan.predicted_duration()
+
+
+@pytest.mark.plan
+def test_plan_round_trip_and_reuse(tmp_path: Path) -> None:
+    plan = compile_plan(policy(), root=RootFS(tmp_path))
+    plan.save(tmp_path / "plans" / "plan.json")
+    loaded = ExecutionPlan.load(tmp_path / "plans" / "plan.json")
+
+    assert loaded == plan
+
+    executor = CountingExecutor()
+    results = run_policy(policy(), executor=executor, root=tmp_path, plan=loaded)
+
+    assert [result.rule_id for result in results] == ["P1", "P2", "P3", "P4", "P5", "P6"]
+    assert len(executor.commands) == loaded.predicted_commands()
+
+    other = Policy(category="Plan", rules=policy().rules[:2])
+
+    with pytest.raises(PolicyError):
+        run_policy(other, executor=executor, root=tmp_path, plan=loaded)
+
+
+@pytest.mark.plan
+def test_explain_with_measured_costs(tmp_path: Path) -> None:
+    costs = control_costs([
+        ControlResult(rule_id="P1", control="sysctl.value", status="PASSED", message="", duration=0.5),
+        ControlResult(rule_id="P1", control="sysctl.value", status="PASSED", message="", duration=1.5)
+    ])
+    plan = compile_plan(policy(), root=RootFS(tmp_path), costs=costs)
+    text = explain(plan, workers=2)
+
+    assert costs == {"sysctl.value": 1.0}
+    assert plan.steps[0].cost == 1.0
+    assert "filesystem.module_disabled" in text and "prepared" in text
+    assert "unknown control" in text
+    assert "Commands (2 predicted, 1 distinct)" in text
+    assert f"2 x find {tmp_path}/lib/modules/ -type f -name 'cramfs*.ko*'" in text
+    assert "with 2 workers" in text
@@ -26,3 +26,20 @@ def test_registry_duplicate() -> None:
         @registry.register("control")
         def f_2(**kwargs):
             return "PASSED"
+
+
+@pytest.mark.registry
+def test_registry_cpu_bound() -> None:
+    registry = ControlRegistry()
+
+    @registry.register("io")
+    def f_1(**kwargs):
+        return "PASSED"
+
+    @registry.register("cpu", cpu_bound=True)
+    def f_2(**kwargs):
+        return "PASSED"
+
+    assert registry.spec("io").cpu_bound is False
+    assert registry.spec("cpu").cpu_bound is True
+    assert registry.spec("cpu").function is f_2
@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import pytest
+
+from horus_audit.core.exceptions import ExecutorError
+from horus_audit.core.remote import LocalTransport, RemoteExecutor, SSHTransport
+
+
+class CountingTransport(LocalTransport):
+    def __init__(self) -> None:
+        super().__init__("host-1")
+        self.connections = 0
+
+    def command(self) -> list[str]:
+        self.connections += 1
+        return super().command()
+
+
+@pytest.mark.remote
+def test_remote_executor_run() -> None:
+    with RemoteExecutor(LocalTransport()) as executor:
+        result = executor.run(["echo", "hello world"])
+
+    assert result.code == 0
+    assert result.stdout == "hello world"
+    assert result.stderr == ""
+
+
+@pytest.mark.remote
+def test_remote_executor_exit_code() -> None:
+    with RemoteExecutor(LocalTransport()) as executor:
+        result = executor.run(["sh", "-c", "printf 'a\\nb\\n'; echo oops >&2; exit 3"])
+
+    assert result.code == 3
+    assert result.stdout == "a\nb"
+    assert result.stderr == "oops"
+
+
+@pytest.mark.remote
+def test_remote_executor_reuses_channel() -> None:
+    transport = CountingTransport()
+
+    with RemoteExecutor(transport) as executor:
+        for _ in range(5):
+            assert executor.run(["true"]).code == 0
+
+    assert transport.connections == 1
+
+
+@pytest.mark.remote
+def test_remote_executor_timeout() -> None:
+    with RemoteExecutor(LocalTransport()) as executor:
+        result = executor.run(["sleep", "5"], timeout=1)
+        after = executor.run(["echo", "hello"])
+
+    assert result.code == 124
+    assert after.stdout == "hello"
+
+
+@pytest.mark.remote
+def test_remote_executor_command_not_allowed() -> None:
+    with RemoteExecutor(LocalTransport(), allowed_commands={"echo"}) as executor:
+        with pytest.raises(ExecutorError):
+            executor.run(["printf", "hello"])
+
+
+@pytest.mark.remote
+def test_ssh_transport_command(tmp_path: Path) -> None:
+    transport = SSHTransport("db-1", user="audit", port=2222, control_dir=tmp_path)
+
+    argv = transport.command()
+
+    assert argv[0] == "ssh"
+    assert "ControlMaster=auto" in argv
+    assert f"ControlPath={tmp_path / '%C'}" in argv
+    assert argv[-2:] == ["db-1", "/bin/sh"]
+    assert ["-l", "audit"] == argv[argv.index("-l"):argv.index("-l") + 2]
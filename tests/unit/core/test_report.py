@@ -1,10 +1,13 @@
+import json
 from pathlib import Path
 
 import pytest
 
-from horus_audit.core.report import build_report, render_report
+from horus_audit.core.os_info import OSInfo
+from horus_audit.core.report import build_report, render_report, write_html_report
 from horus_audit.core.result import ControlResult
 from horus_audit.core.rule import Policy
+from horus_audit.core.table import ResultTable
 
 
 @pytest.mark.report
@@ -34,3 +37,85 @@ def test_report_render(tmp_path: Path) -> None:
         template_dir=str(template_dir)
     )
     assert "PASSED=1" in output
+
+
+def html_results(count: int) -> list[ControlResult]:
+    results = []
+
+    for i in range(count):
+        control = ["sysctl.value", "file.contains", "service.enabled"][i % 3]
+        factory = ControlResult.failed_ if i % 5 == 0 else ControlResult.passed_
+        results.append(factory(rule_id=f"R{i}", control=control, message=f"Result <{i}>"))
+
+    return results
+
+
+@pytest.mark.report
+def test_report_indexes() -> None:
+    context = build_report(policy=Policy(category="Unit tests", rules=[]), results=html_results(10))
+
+    assert list(context.indexes["status"]["FAILED"]) == [0, 5]
+    assert list(context.indexes["control"]["file.contains"]) == [1, 4, 7]
+    assert list(context.indexes["category"]["sysctl"]) == [0, 3, 6, 9]
+    assert context.summary["PASSED"] == 8 and context.summary["ERROR"] == 0
+
+
+@pytest.mark.report
+@pytest.mark.parametrize("workers", [1, 2])
+def test_write_html_report(tmp_path: Path, workers: int) -> None:
+    # A generator, consumed once
+    results = (result for result in html_results(25))
+
+    index_page = write_html_report(results, tmp_path / "html", category="Unit <tests>", page_size=10, workers=workers)
+    index = json.loads((tmp_path / "html" / "index.json").read_text(encoding="utf-8"))
+
+    assert index_page == tmp_path / "html" / "index.html"
+    assert [page["count"] for page in index["pages"]] == [10, 10, 5]
+    assert index["summary"]["FAILED"] == 5
+    assert index["groups"]["status"]["FAILED"] == {"count": 5, "pages": [[1, 3]]}
+    assert index["groups"]["category"]["file"]["count"] == 8
+    assert sorted(path.name for path in (tmp_path / "html").iterdir()) == [
+        "index.html", "index.json", "page-00001.html", "page-00002.html", "page-00003.html"
+    ]
+    assert (tmp_path / "html" / "page-00001.html").stat().st_mode & 0o777 == 0o644
+
+    page = (tmp_path / "html" / "page-00003.html").read_text(encoding="utf-8")
+
+    assert page.count("<tr data-status") == 5
+    assert "Result &lt;24&gt;" in page
+    assert 'data-category="sysctl"' in page
+    assert "page-00004.html" not in page
+    assert "Unit &lt;tests&gt;" in index_page.read_text(encoding="utf-8")
+
+
+@pytest.mark.report
+def test_write_html_report_table(tmp_path: Path) -> None:
+    table = ResultTable.from_results([("web1", html_results(3)), ("web2", html_results(2))])
+
+    os_info = OSInfo(hostname="web1", name="Ubuntu", version="24.04", kernel_version="6.8.0-45-generic")
+
+    write_html_report(table, tmp_path, category="Fleet", os_info=os_info, page_size=4)
+    index = json.loads((tmp_path / "index.json").read_text(encoding="utf-8"))
+
+    assert "Kernel: 6.8.0-45-generic" in (tmp_path / "index.html").read_text(encoding="utf-8")
+
+    assert index["groups"]["host"] == {"web1": {"count": 3, "pages": [[1, 1]]}, "web2": {"count": 2, "pages": [[1, 2]]}}
+    assert 'data-host="web2"' in (tmp_path / "page-00002.html").read_text(encoding="utf-8")
+
+
+@pytest.mark.report
+def test_write_html_report_page_size(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        write_html_report([], tmp_path, category="Unit tests", page_size=0)
+
+
+@pytest.mark.report
+def test_write_html_report_failed_write(tmp_path: Path) -> None:
+    # Not encodable, the page fails while being written
+    results = [ControlResult.failed_(rule_id="R1", control="sysctl.value", message="\ud800")]
+
+    with pytest.raises(UnicodeEncodeError):
+        write_html_report(results, tmp_path, category="Unit tests")
+
+    # No temporary file left behind
+    assert list(tmp_path.iterdir()) == []
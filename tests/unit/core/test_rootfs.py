@@ -0,0 +1,47 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from horus_audit.core.rootfs import RootFS
+
+
+@pytest.mark.rootfs
+def test_rootfs_host() -> None:
+    root = RootFS()
+
+    assert root.is_host
+    assert root.path("/etc/fstab") == Path("/etc/fstab")
+    assert root.resolve("/etc/fstab") == Path("/etc/fstab")
+
+
+@pytest.mark.rootfs
+def test_rootfs_path_stays_under_root(tmp_path: Path) -> None:
+    root = RootFS(tmp_path)
+
+    assert not root.is_host
+    assert root.path("/etc/fstab") == tmp_path / "etc" / "fstab"
+    assert root.path("/../../etc/./fstab") == tmp_path / "etc" / "fstab"
+
+
+@pytest.mark.rootfs
+def test_rootfs_resolve_absolute_symlink(tmp_path: Path) -> None:
+    (tmp_path / "usr" / "lib").mkdir(parents=True)
+    (tmp_path / "usr" / "lib" / "os-release").write_text("ID=test\n")
+    (tmp_path / "etc").mkdir()
+    os.symlink("/usr/lib/os-release", tmp_path / "etc" / "os-release")
+    os.symlink("/usr/lib", tmp_path / "lib")
+
+    root = RootFS(tmp_path)
+
+    assert root.resolve("/etc/os-release") == tmp_path / "usr" / "lib" / "os-release"
+    assert root.resolve("/lib/os-release").read_text() == "ID=test\n"
+
+
+@pytest.mark.rootfs
+def test_rootfs_resolve_loop(tmp_path: Path) -> None:
+    os.symlink("/b", tmp_path / "a")
+    os.symlink("/a", tmp_path / "b")
+
+    with pytest.raises(OSError):
+        RootFS(tmp_path).resolve("/a")
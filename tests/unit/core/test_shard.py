@@ -0,0 +1,167 @@
+from pathlib import Path
+
+import pytest
+
+from horus_audit.core.engine import run_policy
+from horus_audit.core.exceptions import ShardError
+from horus_audit.core.result import ControlResult
+from horus_audit.core.rule import Policy, Rule
+from horus_audit.core.shard import Shard, ShardMerge, merge_shards, shard_of, shard_policy, write_shard
+
+
+def make_policy(size: int) -> Policy:
+    return Policy(
+        category="Unit tests",
+        rules=[Rule(rule_id=f"R{i}", control="Test control") for i in range(size)]
+    )
+
+
+@pytest.mark.shard
+def test_shard_of_stable() -> None:
+    assert shard_of("R1", 4) == shard_of("R1", 4)
+    assert {shard_of(f"R{i}", 4) for i in range(100)} == {0, 1, 2, 3}
+
+
+@pytest.mark.shard
+def test_shard_policy_partition() -> None:
+    policy = make_policy(50)
+
+    shards = [shard_policy(policy, Shard(index=i, count=3)) for i in range(3)]
+    rule_ids = [rule.rule_id for shard in shards for rule in shard.rules]
+
+    assert sorted(rule_ids) == sorted(rule.rule_id for rule in policy.rules)
+    assert len(set(rule_ids)) == 50
+
+
+@pytest.mark.shard
+def test_shard_policy_cost_balanced() -> None:
+    policy = make_policy(6)
+    costs = {"R0": 10.0, "R1": 5.0, "R2": 5.0}
+
+    shards = [shard_policy(policy, Shard(index=i, count=2, costs=costs)) for i in range(2)]
+    loads = [
+        sum(costs.get(rule.rule_id, 1.0) for rule in shard.rules)
+        for shard in shards
+    ]
+
+    assert sorted(loads) == [11.0, 12.0]
+
+
+@pytest.mark.shard
+def test_shard_invalid_index() -> None:
+    with pytest.raises(ShardError):
+        Shard(index=2, count=2)
+
+
+@pytest.mark.shard
+def test_run_policy_shard() -> None:
+    policy = make_policy(20)
+
+    results = run_policy(policy, executor=object(), shard=Shard(index=0, count=2))
+
+    assert [result.rule_id for result in results] == [
+        rule.rule_id for rule in shard_policy(policy, Shard(index=0, count=2)).rules
+    ]
+
+
+@pytest.mark.shard
+def test_merge_shards(tmp_path: Path) -> None:
+    policy = make_policy(10)
+    paths = []
+
+    for i in range(3):
+        shard = Shard(index=i, count=3)
+        results = [
+            ControlResult.passed_(rule_id=rule.rule_id, control=rule.control, message="Passed")
+            if int(rule.rule_id[1:]) % 2
+            else ControlResult.failed_(rule_id=rule.rule_id, control=rule.control, message="Failed")
+            for rule in shard_policy(policy, shard).rules
+        ]
+
+        path = tmp_path / f"shard-{i}.jsonl"
+        write_shard(path, policy=policy, shard=shard, results=results)
+        paths.append(path)
+
+    context = merge_shards(paths)
+
+    assert context.category == "Unit tests"
+    assert [result.rule_id for result in context.results] == [rule.rule_id for rule in policy.rules]
+    assert context.summary["PASSED"] == 5
+    assert context.summary["FAILED"] == 5
+
+
+@pytest.mark.shard
+def test_merge_shards_missing(tmp_path: Path) -> None:
+    policy = make_policy(4)
+    path = tmp_path / "shard-0.jsonl"
+    write_shard(path, policy=policy, shard=Shard(index=0, count=2), results=[])
+
+    with pytest.raises(ShardError):
+        merge_shards([path])
+
+
+@pytest.mark.shard
+def test_merge_shards_mismatch(tmp_path: Path) -> None:
+    policy = make_policy(4)
+    costs = {"R0": 2.0}
+
+    write_shard(tmp_path / "a.jsonl", policy=policy, shard=Shard(index=0, count=2), results=[])
+    write_shard(tmp_path / "b.jsonl", policy=make_policy(5), shard=Shard(index=1, count=2), results=[])
+    write_shard(tmp_path / "c.jsonl", policy=policy, shard=Shard(index=1, count=2, costs=costs), results=[])
+
+    # Another policy version, another partitioning
+    for other in ("b.jsonl", "c.jsonl"):
+        with pytest.raises(ShardError, match="does not belong"):
+            merge_shards([tmp_path / "a.jsonl", tmp_path / other])
+
+
+@pytest.mark.shard
+def test_merge_shards_duplicated_rule(tmp_path: Path) -> None:
+    policy = make_policy(2)
+    result = ControlResult.passed_(rule_id="R1", control="Test control", message="Passed")
+
+    for i in range(2):
+        write_shard(tmp_path / f"shard-{i}.jsonl", policy=policy, shard=Shard(index=i, count=2), results=[result])
+
+    with pytest.raises(ShardError, match="several shards"):
+        merge_shards([tmp_path / "shard-0.jsonl", tmp_path / "shard-1.jsonl"])
+
+
+@pytest.mark.shard
+def test_shard_merge_streams(tmp_path: Path) -> None:
+    policy = make_policy(6)
+    paths = []
+
+    for i in range(2):
+        shard = Shard(index=i, count=2)
+        results = [
+            ControlResult.passed_(rule_id=rule.rule_id, control=rule.control, message="Passed")
+            for rule in shard_policy(policy, shard).rules
+        ]
+        paths.append(tmp_path / f"shard-{i}.jsonl")
+        write_shard(paths[-1], policy=policy, shard=shard, results=results)
+
+    with ShardMerge(paths) as merge:
+        results = iter(merge)
+
+        # Counted as results are read
+        assert next(results).rule_id == "R0"
+        assert merge.summary["PASSED"] == 1
+        assert [result.rule_id for result in results] == ["R1", "R2", "R3", "R4", "R5"]
+        assert merge.summary["PASSED"] == 6
+
+
+@pytest.mark.shard
+def test_write_shard_duplicates(tmp_path: Path) -> None:
+    result = ControlResult.passed_(rule_id="R1", control="Test control", message="Passed")
+
+    with pytest.raises(ShardError, match="policy"):
+        write_shard(
+            tmp_path / "shard.jsonl",
+            policy=Policy(category="Unit tests", rules=[Rule(rule_id="R1", control="a"), Rule(rule_id="R1", control="b")]),
+            shard=Shard(index=0, count=1),
+            results=[result]
+        )
+
+    with pytest.raises(ShardError, match="Several results"):
+        write_shard(tmp_path / "shard.jsonl", policy=make_policy(2), shard=Shard(index=0, count=1), results=[result, result])
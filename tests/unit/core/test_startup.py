@@ -0,0 +1,114 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import horus_audit.controls  # noqa: F401
+from horus_audit.core.executor import Executor
+from horus_audit.core.startup import run_audit
+
+
+POLICY = """
+category: Startup
+rules:
+  - rule_id: S1
+    control: sysctl.value
+    params:
+      key: net.ipv4.ip_forward
+      value: 0
+      persistent: false
+  - rule_id: S2
+    control: sysctl.value
+    params:
+      key: kernel.randomize_va_space
+      value: 2
+      persistent: false
+"""
+
+
+@pytest.mark.startup
+def test_run_audit(tmp_path: Path) -> None:
+    for key, value in (("net/ipv4/ip_forward", "0"), ("kernel/randomize_va_space", "2")):
+        path = tmp_path / "root" / "proc" / "sys" / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"{value}\n", encoding="utf-8")
+
+    policy_path = tmp_path / "policy.yml"
+    policy_path.write_text(POLICY, encoding="utf-8")
+
+    audit = run_audit(
+        policy_path,
+        executor=Executor(),
+        root=tmp_path / "root",
+        os_cache=tmp_path / "os_info.json"
+    )
+
+    assert audit.policy.category == "Startup"
+    assert [result.status for result in audit.results] == ["PASSED", "PASSED"]
+    assert audit.os_info.architecture
+    assert (tmp_path / "os_info.json").exists()
+    assert 0 < audit.timings.policy <= audit.timings.first_result <= audit.timings.total
+    assert 0 < audit.timings.os_info <= audit.timings.total
+
+
+@pytest.mark.startup
+def test_run_audit_trace(tmp_path: Path) -> None:
+    policy_path = tmp_path / "policy.yml"
+    policy_path.write_text(POLICY, encoding="utf-8")
+
+    run_audit(
+        policy_path,
+        executor=Executor(),
+        root=tmp_path,
+        os_cache=tmp_path / "os_info.json",
+        trace=tmp_path / "trace.json"
+    )
+
+    events = json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))["traceEvents"]
+    names = {event["name"] for event in events if event["ph"] == "X"}
+
+    assert {"load_policy", "S1", "S2", "sysctl"} <= names
+
+
+@pytest.mark.startup
+def test_run_audit_metrics(tmp_path: Path) -> None:
+    policy_path = tmp_path / "policy.yml"
+    policy_path.write_text(POLICY, encoding="utf-8")
+
+    run_audit(
+        policy_path,
+        executor=Executor(),
+        root=tmp_path,
+        os_cache=tmp_path / "os_info.json",
+        metrics=tmp_path / "horus.prom"
+    )
+
+    text = (tmp_path / "horus.prom").read_text(encoding="utf-8")
+
+    # Empty offline root, runtime values are not available
+    assert 'horus_audit_results{policy="Startup",control="sysctl.value",status="SKIPPED"} 2' in text
+    assert 'horus_audit_cache_misses{policy="Startup",cache="facts"}' in text
+
+
+@pytest.mark.startup
+def test_run_audit_os_detection_error(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    errors = []
+
+    class Logger:
+        def info(self, *a, **k): pass
+        def error(self, message, *a, **k): errors.append(message)
+
+    def fail() -> str:
+        raise OSError("No /etc/os-release")
+
+    monkeypatch.setattr("horus_audit.core.startup.logger", Logger())
+    monkeypatch.setattr("horus_audit.core.os_info.distro.id", fail)
+
+    policy_path = tmp_path / "policy.yml"
+    policy_path.write_text(POLICY, encoding="utf-8")
+
+    audit = run_audit(policy_path, executor=Executor(), root=tmp_path, os_cache=None)
+
+    assert [result.status for result in audit.results] == ["SKIPPED", "SKIPPED"]
+    assert errors == ["Unable to detect OS information: No /etc/os-release"]
+    assert 0 < audit.timings.os_info <= audit.timings.total
@@ -0,0 +1,64 @@
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from horus_audit.core.result import STATUSES, ControlResult, Status
+from horus_audit.core.table import CompactResult, ResultTable
+
+
+def audits() -> list[tuple[str, list[ControlResult]]]:
+    return [
+        (
+            f"host{i}",
+            [
+                ControlResult(rule_id="R1", control="sysctl.value", status="PASSED", message="ok", duration=0.000123456789),
+                ControlResult(
+                    rule_id="R2",
+                    control="service.disabled",
+                    status="FAILED" if i % 2 else "PASSED",
+                    message="ok" if i % 2 == 0 else f"Service {i} is enabled"
+                ),
+                ControlResult(rule_id="R3", control="file.contains", status="ERROR", message="params.path is empty")
+            ]
+        )
+        for i in range(4)
+    ]
+
+
+@pytest.mark.table
+def test_status_codes() -> None:
+    assert [status.name for status in Status] == list(STATUSES)
+
+
+@pytest.mark.table
+def test_compact_result() -> None:
+    result = ControlResult(rule_id="".join(["R", "1"]), control="c", status="WARNING", message="m", duration=1.5)
+
+    compact = CompactResult.from_result(result)
+
+    assert compact.status is Status.WARNING
+    assert compact.rule_id is CompactResult.from_result(result).rule_id
+    assert compact.to_result() == result
+
+    with pytest.raises(FrozenInstanceError):
+        compact.status = Status.PASSED
+
+
+@pytest.mark.table
+def test_table_roundtrip() -> None:
+    table = ResultTable.from_results(audits())
+
+    assert len(table) == 12
+    assert table.hosts == ["host0", "host1", "host2", "host3"]
+    assert len(table.rules) == 3
+    assert len(table.messages) == 4
+    assert table.to_results() == dict(audits())
+
+
+@pytest.mark.table
+def test_table_summaries() -> None:
+    table = ResultTable.from_results(audits())
+
+    assert table.summary() == {"PASSED": 6, "FAILED": 2, "WARNING": 0, "SKIPPED": 0, "ERROR": 4}
+    assert table.summary_by_rule()["R2"] == {"PASSED": 2, "FAILED": 2, "WARNING": 0, "SKIPPED": 0, "ERROR": 0}
+    assert table.summary_by_host()["host1"] == {"PASSED": 1, "FAILED": 1, "WARNING": 0, "SKIPPED": 0, "ERROR": 1}
@@ -0,0 +1,100 @@
+import json
+from pathlib import Path
+import threading
+
+import pytest
+
+from horus_audit.core.engine import EngineContext, run_policy
+from horus_audit.core.executor import ExecutionResult, Executor
+from horus_audit.core.registry import register_control
+from horus_audit.core.result import ControlResult
+from horus_audit.core.rule import Policy, Rule
+from horus_audit.core.tracing import span, start_tracing, stop_tracing, tracing
+
+
+class EchoExecutor(Executor):
+    def run(self, argv, *, timeout=10):
+        with span(argv[0], "command"):
+            return ExecutionResult(stdout=argv[-1], stderr="", code=0)
+
+
+@register_control("test.tracing.echo")
+def check_echo(*, rule_id, control, params, executor, os_info=None, context: EngineContext | None = None):
+    context.facts.get("tracing.fact", lambda: 42)
+    stdout = executor.run(["echo", rule_id]).stdout
+
+    return ControlResult.passed_(rule_id=rule_id, control=control, message=stdout)
+
+
+@pytest.mark.tracing
+def test_span_is_shared_noop_when_off() -> None:
+    assert stop_tracing() is None
+    assert span("a") is span("b", "other", key=1)
+
+
+@pytest.mark.tracing
+def test_tracing_exports_chrome_trace(tmp_path: Path) -> None:
+    policy = Policy(
+        category="Tracing",
+        rules=[Rule(rule_id=f"T{i}", control="test.tracing.echo", params={}) for i in range(4)]
+    )
+
+    with tracing(tmp_path / "trace.json"):
+        results = run_policy(policy, executor=EchoExecutor(), workers=2)
+
+    assert [result.message for result in results] == ["T0", "T1", "T2", "T3"]
+    assert span("off") is span("still off")
+
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    spans = [event for event in events if event["ph"] == "X"]
+    threads = {event["tid"]: event["args"]["name"] for event in events if event["ph"] == "M"}
+
+    assert sorted(event["name"] for event in spans if event["cat"] == "rule") == ["T0", "T1", "T2", "T3"]
+    assert sum(event["cat"] == "command" for event in spans) == 4
+    assert [event["name"] for event in spans if event["cat"] == "fact"]
+    assert all(event["args"]["control"] == "test.tracing.echo" for event in spans if event["cat"] == "rule")
+    assert all(event["tid"] in threads for event in spans)
+    assert all(name.startswith("ThreadPoolExecutor") for name in threads.values())
+
+    # Commands are nested in their rule
+    rules = {event["tid"]: [] for event in spans}
+    for event in spans:
+        if event["cat"] == "rule":
+            rules[event["tid"]].append(event)
+
+    for event in spans:
+        if event["cat"] == "command":
+            assert any(
+                rule["ts"] <= event["ts"] and event["ts"] + event["dur"] <= rule["ts"] + rule["dur"]
+                for rule in rules[event["tid"]]
+            )
+
+
+@pytest.mark.tracing
+def test_tracer_records_every_thread() -> None:
+    tracer = start_tracing()
+
+    try:
+        # Live at once, so that thread identifiers are not reused
+        barrier = threading.Barrier(3)
+
+        def work(i: int) -> None:
+            with span("work", index=i):
+                barrier.wait()
+
+        threads = [threading.Thread(target=work, args=(i,), name=f"worker-{i}") for i in range(3)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    finally:
+        assert stop_tracing() is tracer
+
+    events = tracer.trace_events()
+
+    assert sorted(event["args"]["name"] for event in events if event["ph"] == "M") == [
+        "worker-0", "worker-1", "worker-2"
+    ]
+    assert sorted(event["args"]["index"] for event in events if event["ph"] == "X") == [0, 1, 2]
@@ -108,3 +108,31 @@ rules:
 
     with pytest.raises(PolicyError):
         load_policy(Path("policy.yaml"))
+
+
+@pytest.mark.yaml_loader
+def test_load_policy_severity(monkeypatch: MonkeyPatch) -> None:
+    yaml_content = """
+category: Gate
+
+rules:
+  - rule_id: R1
+    control: sysctl.value
+  - rule_id: R2
+    control: sysctl.value
+    severity: Critical
+    priority: 10
+"""
+
+    monkeypatch.setattr(Path, "exists", lambda self: True)
+    monkeypatch.setattr(Path, "read_text", lambda self, encoding=None: yaml_content)
+
+    policy = load_policy(Path("policy.yaml"))
+
+    assert [(rule.severity, rule.priority) for rule in policy.rules] == [("medium", 0), ("critical", 10)]
+
+    for invalid in ("severity: urgent", "priority: high", "priority: true"):
+        monkeypatch.setattr(Path, "read_text", lambda self, encoding=None: f"{yaml_content}    {invalid}\n")
+
+        with pytest.raises(PolicyError):
+            load_policy(Path("policy.yaml"))